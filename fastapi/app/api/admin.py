@@ -0,0 +1,73 @@
+"""
+관리자 API - 운영 작업용 (ADMIN_TOKEN 인증)
+- ADMIN_TOKEN이 설정되지 않으면 모든 엔드포인트 비활성화 (404)
+"""
+
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.database.maintenance import maintenance_scheduler
+from app.utils.backup_export import encode_export, start_export
+from app.utils.payload_codec import CODEC_IDENTITY, available_codecs
+
+router = APIRouter()
+
+# Authorization: Bearer <ADMIN_TOKEN>
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
+
+def _require_admin(authorization: Optional[str]):
+    """관리자 토큰 확인 (비교는 상수 시간)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.strip().encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="invalid admin token", headers={"WWW-Authenticate": "Bearer"})
+
+
+@router.get("/export/backups")
+def export_backups(
+    after: Optional[str] = None,
+    payload: bool = True,
+    compression: str = CODEC_IDENTITY,
+    limit: Optional[int] = None,
+    authorization: Optional[str] = Header(None),
+):
+    """
+    전체 기기/백업 NDJSON 스트리밍 export
+    - 한 줄 = 기기 1대 ({device_uuid, email, ..., backup: {checksum, payload_updated_at, payload} | null})
+    - device_uuid 오름차순, 끊기면 마지막으로 받은 줄의 device_uuid를 after로 다시 요청
+    - payload=false: 메타데이터만
+    - compression: identity / gzip / zstd (Content-Encoding으로 전달)
+    """
+    _require_admin(authorization)
+    compression = compression.strip().lower()
+    if compression not in available_codecs():
+        raise HTTPException(status_code=400, detail=f"unsupported compression (available: {available_codecs()})")
+    if limit is not None and limit <= 0:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+
+    try:
+        lines = start_export(after, payload, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    headers = {"Cache-Control": "no-store"}
+    if compression != CODEC_IDENTITY:
+        headers["Content-Encoding"] = compression
+    return StreamingResponse(encode_export(lines, compression), media_type="application/x-ndjson", headers=headers)
+
+
+@router.post("/maintenance/run")
+async def run_maintenance(authorization: Optional[str] = Header(None)):
+    """
+    정리 작업 즉시 실행 (만료된 인증 코드/업로드 세션, 고아 기기)
+    - 주기 실행과 같은 배치/스로틀 설정, 실행 중이면 끝난 뒤 이어서 실행
+    - 응답: 작업별 삭제 행 수, 배치 수, 소요 시간
+    """
+    _require_admin(authorization)
+    return await maintenance_scheduler.run_once()
@@ -3,14 +3,84 @@
 """
 
 import hashlib
-import json
-from datetime import datetime
-from fastapi import APIRouter, HTTPException
+import os
+import secrets
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 
 from app.database.connection import connect_db
+from app.database.executor import run_db
+from app.database.write_queue import GroupCommitQueue
+from app.utils import canonical_json
+from app.utils.backup_delta import apply_delta
+from app.utils.backup_lookup import get_backup_meta, invalidate_backup, update_email_latest
+from app.utils.backup_schema import SnapshotError, parse_snapshot, validate_rows
+from app.utils.backup_storage import (
+    encode_for_storage,
+    envelope_response,
+    etag_matches,
+    format_payload_updated_at,
+    load_payload_bytes,
+    make_etag,
+    not_modified_response,
+    payload_checksum,
+    raw_payload_response,
+)
+from app.utils.backup_versions import list_versions, load_version, store_version
+from app.utils.habit_stats import compute_habit_stats, stats_cache
+from app.utils.heatmap import fill_heatmap_snapshots
+from app.utils.payload_codec import PayloadTooLargeError, StreamDecoder
 
 router = APIRouter()
 
+# 업로드 본문 최대 크기 (압축 해제 후 기준)
+BACKUP_MAX_BYTES = int(os.getenv('BACKUP_MAX_BYTES', str(32 * 1024 * 1024)))
+
+# 그룹 커밋 쓰기 대기열 (기본 비활성화: 요청마다 개별 트랜잭션)
+BACKUP_WRITE_QUEUE = os.getenv('BACKUP_WRITE_QUEUE', '0') == '1'
+BACKUP_WRITE_WINDOW_MS = int(os.getenv('BACKUP_WRITE_WINDOW_MS', '50'))
+BACKUP_WRITE_MAX_BATCH = int(os.getenv('BACKUP_WRITE_MAX_BATCH', '100'))
+BACKUP_WRITE_MAX_PENDING = int(os.getenv('BACKUP_WRITE_MAX_PENDING', '5000'))
+BACKUP_WRITE_FLUSHERS = int(os.getenv('BACKUP_WRITE_FLUSHERS', '2'))
+# sync: 커밋 후 응답 (200) / async: 대기열 등록 후 바로 응답 (202, 서버 장애 시 유실 가능)
+BACKUP_WRITE_DURABILITY = os.getenv('BACKUP_WRITE_DURABILITY', 'sync')
+
+# 분할 업로드 세션
+BACKUP_UPLOAD_CHUNK_MAX_BYTES = int(os.getenv('BACKUP_UPLOAD_CHUNK_MAX_BYTES', str(4 * 1024 * 1024)))
+BACKUP_UPLOAD_SESSION_TTL_HOURS = int(os.getenv('BACKUP_UPLOAD_SESSION_TTL_HOURS', '24'))
+BACKUP_UPLOAD_MAX_CHUNKS = 10000
+
+
+@dataclass
+class PreparedBackup:
+    """검증/해시까지 끝난 업로드 (DB 쓰기 직전 상태)"""
+    device_uuid: str
+    payload_bytes: bytes  # 저장할 JSON 바이트 (요청 본문 그대로)
+    checksum: str
+    exported_at: str  # MySQL DATETIME 문자열
+    payload: Optional[dict] = None  # 파싱된 스냅샷 (있으면 버전 저장 시 재파싱 생략)
+
+
+class DeltaSection(BaseModel):
+    upserts: List[dict] = Field(default_factory=list)  # 변경/추가된 행 (is_dirty)
+    deletes: List[str] = Field(default_factory=list)  # 삭제된 행의 키
+
+
+class BackupDeltaBody(BaseModel):
+    device_uuid: str
+    base_checksum: str  # 클라이언트가 마지막으로 받은 checksum (낙관적 동시성 제어)
+    exported_at: Optional[str] = None
+    categories: DeltaSection = Field(default_factory=DeltaSection)
+    habits: DeltaSection = Field(default_factory=DeltaSection)
+    logs: DeltaSection = Field(default_factory=DeltaSection)
+    heatmap_snapshots: DeltaSection = Field(default_factory=DeltaSection)
+
 
 def _iso8601_to_mysql_datetime(iso: str) -> str:
     """ISO8601 → MySQL DATETIME (YYYY-MM-DD HH:MM:SS)"""
@@ -23,51 +93,366 @@ def _iso8601_to_mysql_datetime(iso: str) -> str:
         return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
 
 
-@router.post("")
-async def upsert_backup(payload: dict):
+async def _read_backup_body(request: Request) -> bytes:
+    """
+    요청 본문 읽기 (Content-Encoding: gzip/zstd 스트리밍 해제)
+    - 수신한 청크는 바로 해제하고 버림
+    - 해제 결과가 BACKUP_MAX_BYTES를 넘으면 413
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > BACKUP_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="backup payload too large")
+    try:
+        decoder = StreamDecoder(request.headers.get("content-encoding", ""), BACKUP_MAX_BYTES)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    try:
+        async for chunk in request.stream():
+            decoder.feed(chunk)
+        return decoder.finish()
+    except PayloadTooLargeError:
+        raise HTTPException(status_code=413, detail="backup payload too large")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"type": "object"}}},
+        }
+    },
+)
+async def upsert_backup(request: Request):
     """
     백업 업서트 (device_uuid당 최신 1개)
     - payload 내 device_uuid 사용
     - devices 테이블에 device 없으면 INSERT
     - backups 테이블 UPSERT (ON DUPLICATE KEY UPDATE)
+    - payload는 압축(payload_codec 기록)하여 payload_blob에 저장
+    - 요청 본문은 Content-Encoding: gzip / zstd 압축 전송 가능
+    - 저장된 checksum과 같으면(내용 변경 없음) UPDATE 생략, changed=false 반환
+    - 내용이 바뀌면 버전 이력에 추가 (GET /v1/backups/versions)
+    - BACKUP_WRITE_QUEUE=1이면 그룹 커밋 대기열을 거쳐 여러 기기를 한 트랜잭션으로 기록
+    """
+    body = await _read_backup_body(request)
+    # 파싱/해시는 CPU 작업이므로 이벤트 루프 밖에서
+    prepared = await run_in_threadpool(_prepare_backup, body)
+    del body
+    return await _store_backup(prepared)
+
+
+async def _store_backup(prepared: PreparedBackup):
+    """검증된 백업 기록 (그룹 커밋 대기열 사용 여부에 따라)"""
+    if not BACKUP_WRITE_QUEUE:
+        return await run_db(_upsert_backup_db, prepared)
+
+    if BACKUP_WRITE_DURABILITY == "async":
+        await backup_write_queue.submit(prepared.device_uuid, prepared, wait=False)
+        return JSONResponse(
+            status_code=202,
+            content={"status": "accepted", "device_uuid": prepared.device_uuid, "checksum": prepared.checksum},
+        )
+    return await backup_write_queue.submit(prepared.device_uuid, prepared)
+
+
+def _prepare_backup(body: bytes) -> PreparedBackup:
     """
-    device_uuid = payload.get("device_uuid")
-    if not device_uuid:
-        raise HTTPException(status_code=400, detail="device_uuid required in payload")
-    payload_json = json.dumps(payload, ensure_ascii=False)
-    checksum = hashlib.sha256(payload_json.encode("utf-8")).hexdigest()
-    exported_at = _iso8601_to_mysql_datetime(payload.get("exported_at", ""))
+    요청 본문 검증 + checksum 계산
+    - 본문 바이트를 schema_version 1 모델로 바로 검증 (DB 작업 전에 거부)
+    - 저장은 본문 바이트 그대로 (재직렬화 없음)
+    - heatmap_snapshots가 생략되면 habits/logs로 계산해 채운 스냅샷을 저장
+    """
+    try:
+        payload = parse_snapshot(body)
+    except SnapshotError as e:
+        raise _snapshot_http_error(e)
+    if "heatmap_snapshots" not in payload:
+        try:
+            fill_heatmap_snapshots(payload)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"invalid date in habits/logs: {e}")
+        body = canonical_json.dumps(payload)
+    return PreparedBackup(
+        device_uuid=payload["device_uuid"],
+        payload_bytes=body,
+        checksum=payload_checksum(payload),
+        exported_at=_iso8601_to_mysql_datetime(payload["exported_at"]),
+        payload=payload,
+    )
+
+
+def _snapshot_http_error(e: SnapshotError) -> HTTPException:
+    """JSON 형식 오류 → 400, 스키마 불일치 → 422 (필드별 오류 목록)"""
+    if e.invalid_json:
+        return HTTPException(status_code=400, detail="invalid JSON body")
+    return HTTPException(status_code=422, detail={"message": str(e), "errors": e.errors})
+
 
+def _upsert_backup_db(prepared: PreparedBackup) -> dict:
+    """devices/backups UPSERT (DB 스레드에서 실행)"""
+    return _upsert_backups_db([prepared])[0]
+
+
+def _upsert_backups_db(batch: List[PreparedBackup]) -> List[dict]:
+    """
+    여러 기기의 백업을 한 트랜잭션으로 UPSERT (커밋 1회)
+    - 저장된 checksum과 같은 기기는 압축/UPDATE 모두 생략
+    - batch 안의 device_uuid는 서로 달라야 함
+    """
     conn = None
     try:
         conn = connect_db()
         cursor = conn.cursor()
 
-        # devices에 device_uuid 없으면 INSERT (이메일은 NULL)
+        # 저장된 checksum + 캐시 무효화에 필요한 인증 이메일
+        placeholders = ", ".join(["%s"] * len(batch))
         cursor.execute(
-            """
-            INSERT INTO devices (device_uuid) VALUES (%s)
-            ON DUPLICATE KEY UPDATE updated_at = CURRENT_TIMESTAMP
+            f"""
+            SELECT d.device_uuid, b.checksum, IF(d.email_verified_at IS NULL, NULL, d.email)
+            FROM devices d
+            LEFT JOIN backups b ON b.device_uuid = d.device_uuid
+            WHERE d.device_uuid IN ({placeholders})
             """,
-            (device_uuid,),
+            [prepared.device_uuid for prepared in batch],
+        )
+        stored = {device_uuid: (checksum, email) for device_uuid, checksum, email in cursor.fetchall()}
+        verified_emails = {device_uuid: email for device_uuid, (_, email) in stored.items()}
+        changed = [
+            prepared for prepared in batch
+            if stored.get(prepared.device_uuid, (None, None))[0] != prepared.checksum
+        ]
+
+        version_ids = {}
+        if changed:
+            version_ids = dict(zip(
+                (prepared.device_uuid for prepared in changed),
+                _write_backups(cursor, changed, verified_emails),
+            ))
+            conn.commit()
+            for prepared in changed:
+                invalidate_backup(prepared.device_uuid, verified_emails.get(prepared.device_uuid))
+
+        results = []
+        for prepared in batch:
+            result = {"status": "ok", "device_uuid": prepared.device_uuid, "checksum": prepared.checksum}
+            if prepared.device_uuid in version_ids:
+                result.update(changed=True, version_id=version_ids[prepared.device_uuid])
+            else:
+                result["changed"] = False
+            results.append(result)
+        return results
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+
+def _flush_backup_batch_db(batch: List[PreparedBackup]) -> list:
+    """
+    그룹 커밋 배치 처리 (GroupCommitQueue flush_fn)
+    - 배치 트랜잭션이 실패하면 한 기기 때문에 전체가 실패하지 않도록 기기별로 재시도
+    """
+    try:
+        return _upsert_backups_db(batch)
+    except HTTPException as e:
+        if len(batch) == 1:
+            return [e]
+    results = []
+    for prepared in batch:
+        try:
+            results.append(_upsert_backup_db(prepared))
+        except HTTPException as e:
+            results.append(e)
+    return results
+
+
+backup_write_queue = GroupCommitQueue(
+    _flush_backup_batch_db,
+    window_ms=BACKUP_WRITE_WINDOW_MS,
+    max_batch=BACKUP_WRITE_MAX_BATCH,
+    max_pending=BACKUP_WRITE_MAX_PENDING,
+    flushers=BACKUP_WRITE_FLUSHERS,
+)
+
+
+def _write_backup(cursor, prepared: PreparedBackup, verified_email: Optional[str]) -> Optional[int]:
+    """한 기기의 백업 기록 (_write_backups 참고)"""
+    return _write_backups(cursor, [prepared], {prepared.device_uuid: verified_email})[0]
+
+
+def _write_backups(
+    cursor, batch: List[PreparedBackup], verified_emails: Dict[str, Optional[str]]
+) -> List[Optional[int]]:
+    """
+    payload 압축 후 devices, backups 다중 행 UPSERT + 버전 이력 저장 (commit은 호출 측)
+    - verified_emails: device_uuid → 인증된 이메일 (이메일별 최신 백업 포인터 갱신용)
+
+    Returns:
+        batch 순서대로 새 version_id (이력 비활성화 시 None)
+    """
+    rows = []
+    for prepared in batch:
+        payload_codec, payload_blob = encode_for_storage(prepared.payload_bytes)
+        # payload_json(NULL)도 %s로 바인딩해야 pymysql이 VALUES를 다중 행으로 묶음 (리터럴이 있으면 행마다 실행)
+        rows.append((prepared.device_uuid, None, payload_blob, payload_codec, prepared.checksum, prepared.exported_at))
+
+    # devices에 device_uuid 없으면 INSERT (이메일은 NULL)
+    # executemany는 INSERT ... VALUES를 다중 행 INSERT 한 문장으로 묶어 실행
+    cursor.executemany(
+        """
+        INSERT INTO devices (device_uuid) VALUES (%s)
+        ON DUPLICATE KEY UPDATE updated_at = CURRENT_TIMESTAMP
+        """,
+        [(prepared.device_uuid,) for prepared in batch],
+    )
+
+    # backups UPSERT (devices와 같이 다중 행 INSERT 한 문장)
+    cursor.executemany(
+        """
+        INSERT INTO backups
+            (device_uuid, payload_json, payload_blob, payload_codec, checksum, payload_updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            payload_json = NULL,
+            payload_blob = VALUES(payload_blob),
+            payload_codec = VALUES(payload_codec),
+            checksum = VALUES(checksum),
+            payload_updated_at = VALUES(payload_updated_at),
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        rows,
+    )
+    del rows
+
+    version_ids = []
+    for prepared in batch:
+        payload = prepared.payload if prepared.payload is not None else canonical_json.loads(prepared.payload_bytes)
+        version_ids.append(
+            store_version(cursor, prepared.device_uuid, payload, prepared.checksum, prepared.exported_at)
         )
 
-        # backups UPSERT
+    # 이메일 포인터는 이메일 순서로 잠금 (동시 배치 간 교착 방지)
+    pointer_updates = sorted(
+        ((verified_emails[prepared.device_uuid], prepared) for prepared in batch
+         if verified_emails.get(prepared.device_uuid)),
+        key=lambda update: update[0],
+    )
+    for email, prepared in pointer_updates:
+        update_email_latest(cursor, email, prepared.device_uuid, prepared.checksum, prepared.exported_at)
+    return version_ids
+
+
+@router.post("/delta")
+async def apply_backup_delta(body: BackupDeltaBody):
+    """
+    증분 백업 (변경/삭제된 행만 전송)
+    - base_checksum이 서버의 현재 checksum과 같을 때만 병합 (다르면 409 → 전체 백업 필요)
+    - 서버에 저장된 스냅샷에 섹션별로 키 기준 병합 후 새 checksum 반환
+    - 서버에 백업이 없으면 404 (POST /v1/backups로 전체 백업 먼저)
+    """
+    if not body.device_uuid:
+        raise HTTPException(status_code=400, detail="device_uuid required")
+
+    changes = {
+        section: getattr(body, section).model_dump()
+        for section in ("categories", "habits", "logs", "heatmap_snapshots")
+    }
+    try:
+        for section, change in changes.items():
+            validate_rows(section, change["upserts"])
+    except SnapshotError as e:
+        raise _snapshot_http_error(e)
+    exported_at = _iso8601_to_mysql_datetime(body.exported_at or "")
+    # heatmap_snapshots 섹션을 보내지 않은 클라이언트: 습관/로그가 바뀌면 서버가 다시 계산
+    recompute_heatmap = "heatmap_snapshots" not in body.model_fields_set and any(
+        changes[section]["upserts"] or changes[section]["deletes"] for section in ("habits", "logs")
+    )
+    return await run_db(
+        _apply_backup_delta_db,
+        body.device_uuid, body.base_checksum, body.exported_at, changes, exported_at, recompute_heatmap,
+    )
+
+
+def _apply_backup_delta_db(
+    device_uuid: str,
+    base_checksum: str,
+    exported_at_iso: Optional[str],
+    changes: dict,
+    exported_at: str,
+    recompute_heatmap: bool = False,
+) -> dict:
+    """저장된 스냅샷을 잠그고 delta 병합 후 저장 (DB 스레드에서 실행)"""
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+
+        # 동시 업로드와 경합하지 않도록 행 잠금
         cursor.execute(
             """
-            INSERT INTO backups (device_uuid, payload_json, checksum, payload_updated_at)
-            VALUES (%s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-                payload_json = VALUES(payload_json),
-                checksum = VALUES(checksum),
-                payload_updated_at = VALUES(payload_updated_at),
-                updated_at = CURRENT_TIMESTAMP
+            SELECT payload_codec, payload_json, payload_blob, checksum
+            FROM backups
+            WHERE device_uuid = %s
+            FOR UPDATE
             """,
-            (device_uuid, payload_json, checksum, exported_at),
+            (device_uuid,),
         )
+        row = cursor.fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="No backup found")
+
+        payload_codec, payload_json, payload_blob, current_checksum = row
+        if current_checksum != base_checksum:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "base_checksum mismatch", "checksum": current_checksum},
+            )
+
+        payload = canonical_json.loads(load_payload_bytes(payload_codec, payload_json, payload_blob))
+        try:
+            apply_delta(payload, changes)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if exported_at_iso:
+            payload["exported_at"] = exported_at_iso
+        if recompute_heatmap:
+            try:
+                fill_heatmap_snapshots(payload)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=f"invalid date in habits/logs: {e}")
+
+        checksum = payload_checksum(payload)
+        if checksum == current_checksum:
+            return {"status": "ok", "device_uuid": device_uuid, "checksum": checksum, "changed": False}
 
+        cursor.execute(
+            "SELECT email FROM devices WHERE device_uuid = %s AND email_verified_at IS NOT NULL",
+            (device_uuid,),
+        )
+        verified = cursor.fetchone()
+        verified_email = verified[0] if verified else None
+        version_id = _write_backup(
+            cursor,
+            PreparedBackup(device_uuid, canonical_json.dumps(payload), checksum, exported_at, payload),
+            verified_email,
+        )
         conn.commit()
-        return {"status": "ok", "device_uuid": device_uuid}
+        invalidate_backup(device_uuid, verified_email)
+        return {
+            "status": "ok",
+            "device_uuid": device_uuid,
+            "checksum": checksum,
+            "changed": True,
+            "version_id": version_id,
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         if conn:
             conn.rollback()
@@ -78,17 +463,50 @@ async def upsert_backup(payload: dict):
 
 
 @router.get("/latest")
-async def get_latest_backup(device_uuid: str):
+async def get_latest_backup(
+    device_uuid: str,
+    raw: bool = False,
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+):
     """
     최신 백업 조회
+    - 응답 ETag = checksum, If-None-Match가 일치하면 304 (payload 조회 없음, checksum은 lookup_cache 경유)
+    - raw=true: payload JSON만 본문으로 반환 (checksum 등은 헤더)
+      Accept-Encoding이 저장 코덱을 허용하면 압축 바이트를 그대로 전송
+      Range 헤더로 일부만 받기 (206, 끊긴 다운로드 이어받기)
     """
+    return await run_db(
+        _get_latest_backup_db, device_uuid, raw, accept_encoding, if_none_match, range_header, if_range
+    )
+
+
+def _get_latest_backup_db(
+    device_uuid: str,
+    raw: bool,
+    accept_encoding: Optional[str],
+    if_none_match: Optional[str],
+    range_header: Optional[str],
+    if_range: Optional[str],
+):
+    """device_uuid의 백업 조회 (DB 스레드에서 실행)"""
     conn = None
     try:
+        if if_none_match:
+            # 조건부 요청: checksum만 먼저 확인 (LONGBLOB 읽기 생략)
+            meta = get_backup_meta(device_uuid)
+            if meta is None:
+                raise HTTPException(status_code=404, detail="No backup found")
+            if etag_matches(if_none_match, meta["checksum"]):
+                return not_modified_response(meta["checksum"])
+
         conn = connect_db()
         cursor = conn.cursor()
         cursor.execute(
             """
-            SELECT payload_json, checksum, payload_updated_at
+            SELECT payload_codec, payload_json, payload_blob, checksum, payload_updated_at
             FROM backups
             WHERE device_uuid = %s
             """,
@@ -98,12 +516,352 @@ async def get_latest_backup(device_uuid: str):
         if not row:
             raise HTTPException(status_code=404, detail="No backup found")
 
-        payload_json, checksum, payload_updated_at = row
-        payload = json.loads(payload_json)
+        payload_codec, payload_json, payload_blob, checksum, payload_updated_at = row
+        if raw:
+            return raw_payload_response(
+                payload_codec, payload_json, payload_blob, checksum, payload_updated_at, accept_encoding,
+                range_header, if_range,
+            )
+        payload_bytes = load_payload_bytes(payload_codec, payload_json, payload_blob)
+        return envelope_response(payload_bytes, checksum, payload_updated_at)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+
+@router.get("/versions")
+async def get_backup_versions(device_uuid: str):
+    """
+    백업 버전 목록 (최신순, 최근 BACKUP_VERSION_RETENTION개)
+    - 내용이 바뀐 업로드/delta마다 한 버전
+    """
+    return await run_db(_get_backup_versions_db, device_uuid)
+
+
+def _get_backup_versions_db(device_uuid: str) -> dict:
+    """device_uuid의 버전 목록 조회 (DB 스레드에서 실행)"""
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        return {"device_uuid": device_uuid, "versions": list_versions(cursor, device_uuid)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+
+@router.get("/versions/{version_id}")
+async def get_backup_version(device_uuid: str, version_id: int, if_none_match: Optional[str] = Header(None)):
+    """
+    특정 버전 조회 (청크 조립)
+    - 응답 형식은 GET /latest와 같음 ({payload, checksum, payload_updated_at} + ETag)
+    """
+    return await run_db(_get_backup_version_db, device_uuid, version_id, if_none_match)
+
+
+def _get_backup_version_db(device_uuid: str, version_id: int, if_none_match: Optional[str]):
+    """버전 하나 조립 (DB 스레드에서 실행)"""
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        version = load_version(cursor, device_uuid, version_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="No backup version found")
+        if etag_matches(if_none_match, version["checksum"]):
+            return not_modified_response(version["checksum"])
+        return envelope_response(
+            canonical_json.dumps(version["payload"]), version["checksum"], version["payload_updated_at"]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+
+class _BackupChanged(Exception):
+    """통계 계산 도중 새 백업이 기록됨 (캐시하지 않고 다시 조회)"""
+
+
+@router.get("/stats")
+async def get_backup_stats(device_uuid: str, if_none_match: Optional[str] = Header(None)):
+    """
+    저장된 백업 기준 습관 통계 (streak, 달성률, 주간/월간 곡선)
+    - 결과는 checksum을 키로 캐시 → 같은 백업이면 다시 계산하지 않음, 새 백업이 올라오면 새로 계산
+    - ETag = checksum, If-None-Match가 일치하면 304
+    """
+    return await run_db(_get_backup_stats_db, device_uuid, if_none_match)
+
+
+def _get_backup_stats_db(device_uuid: str, if_none_match: Optional[str]):
+    """checksum 확인 후 캐시된 통계 반환, 없으면 payload를 읽어 계산 (DB 스레드에서 실행)"""
+    try:
+        for _ in range(2):
+            meta = get_backup_meta(device_uuid)
+            if meta is None:
+                raise HTTPException(status_code=404, detail="No backup found")
+            checksum = meta["checksum"]
+            if etag_matches(if_none_match, checksum):
+                return not_modified_response(checksum)
+            try:
+                stats = stats_cache.get_or_load(
+                    f"stats:{checksum}", lambda: _compute_backup_stats(device_uuid, checksum)
+                )
+            except _BackupChanged:
+                # 메타 조회 후 새 백업이 커밋됨 → 최신 checksum으로 한 번 더
+                invalidate_backup(device_uuid)
+                continue
+            return JSONResponse(
+                content=dict(stats, device_uuid=device_uuid, checksum=checksum),
+                headers={"ETag": make_etag(checksum)},
+            )
+        raise HTTPException(status_code=409, detail="backup changed during stats computation, retry")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _compute_backup_stats(device_uuid: str, checksum: str) -> dict:
+    """checksum이 일치하는 백업 payload로 통계 계산 (커넥션은 계산 전에 반납)"""
+    conn = connect_db()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT payload_codec, payload_json, payload_blob
+            FROM backups
+            WHERE device_uuid = %s AND checksum = %s
+            """,
+            (device_uuid, checksum),
+        )
+        row = cursor.fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        raise _BackupChanged()
+    payload = canonical_json.loads(load_payload_bytes(*row))
+    return compute_habit_stats(payload)
+
+
+# ============================================
+# 분할 업로드 세션 (느린 네트워크에서 큰 스냅샷 업로드)
+# ============================================
+
+class UploadSessionBody(BaseModel):
+    device_uuid: str
+    content_encoding: str = "identity"  # 청크를 이어 붙인 전체 본문의 인코딩 (identity/gzip/zstd)
+
+
+class UploadCommitBody(BaseModel):
+    sha256: str  # 청크를 순서대로 이어 붙인 전체 바이트의 SHA256 (hex)
+    chunk_count: int
+
+
+def _upload_not_found() -> HTTPException:
+    return HTTPException(status_code=404, detail="upload session not found or expired")
+
+
+@router.post("/uploads")
+async def create_upload_session(body: UploadSessionBody):
+    """
+    분할 업로드 세션 생성
+    - 이후 PUT /uploads/{upload_id}/chunks/{index}로 청크 전송, POST /uploads/{upload_id}/commit으로 완료
+    - 세션은 BACKUP_UPLOAD_SESSION_TTL_HOURS 동안 유지 (연결이 끊겨도 이어서 전송 가능)
+    """
+    if not body.device_uuid:
+        raise HTTPException(status_code=400, detail="device_uuid required")
+    content_encoding = (body.content_encoding or "identity").strip().lower()
+    try:
+        StreamDecoder(content_encoding, BACKUP_MAX_BYTES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    upload_id = secrets.token_hex(16)
+    expires_at = datetime.utcnow() + timedelta(hours=BACKUP_UPLOAD_SESSION_TTL_HOURS)
+    await run_db(_create_upload_session_db, upload_id, body.device_uuid, content_encoding, expires_at)
+    return {
+        "upload_id": upload_id,
+        "device_uuid": body.device_uuid,
+        "content_encoding": content_encoding,
+        "chunk_max_bytes": BACKUP_UPLOAD_CHUNK_MAX_BYTES,
+        "expires_at": expires_at.replace(microsecond=0).isoformat(),
+    }
+
+
+def _create_upload_session_db(upload_id: str, device_uuid: str, content_encoding: str, expires_at: datetime):
+    """upload_sessions INSERT (DB 스레드에서 실행)"""
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO upload_sessions (id, device_uuid, content_encoding, expires_at)
+            VALUES (%s, %s, %s, %s)
+            """,
+            (upload_id, device_uuid, content_encoding, expires_at.strftime("%Y-%m-%d %H:%M:%S")),
+        )
+        conn.commit()
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+
+@router.put(
+    "/uploads/{upload_id}/chunks/{index}",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/octet-stream": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def put_upload_chunk(
+    upload_id: str, index: int, request: Request, x_chunk_sha256: Optional[str] = Header(None)
+):
+    """
+    청크 저장 (같은 index를 다시 보내면 덮어씀 → 끊긴 청크 재전송)
+    - 본문: 청크 바이트 그대로 (최대 BACKUP_UPLOAD_CHUNK_MAX_BYTES)
+    - X-Chunk-SHA256 헤더를 보내면 서버에서 검증 (불일치 시 400)
+    """
+    if index < 0 or index >= BACKUP_UPLOAD_MAX_CHUNKS:
+        raise HTTPException(status_code=400, detail="invalid chunk index")
+    data = await _read_upload_chunk(request)
+    chunk_sha256 = hashlib.sha256(data).hexdigest()
+    if x_chunk_sha256 and x_chunk_sha256.strip().lower() != chunk_sha256:
+        raise HTTPException(status_code=400, detail="chunk sha256 mismatch")
+
+    await run_db(_put_upload_chunk_db, upload_id, index, data, chunk_sha256)
+    return {"upload_id": upload_id, "index": index, "size": len(data), "sha256": chunk_sha256}
+
+
+async def _read_upload_chunk(request: Request) -> bytes:
+    """청크 본문 읽기 (BACKUP_UPLOAD_CHUNK_MAX_BYTES 초과 시 413)"""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > BACKUP_UPLOAD_CHUNK_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="chunk too large")
+    parts = []
+    size = 0
+    async for part in request.stream():
+        size += len(part)
+        if size > BACKUP_UPLOAD_CHUNK_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="chunk too large")
+        parts.append(part)
+    if not size:
+        raise HTTPException(status_code=400, detail="empty chunk")
+    return b"".join(parts)
+
+
+def _put_upload_chunk_db(upload_id: str, index: int, data: bytes, chunk_sha256: str):
+    """세션 확인 후 청크 UPSERT (DB 스레드에서 실행)"""
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id FROM upload_sessions
+            WHERE id = %s AND expires_at > UTC_TIMESTAMP()
+            FOR UPDATE
+            """,
+            (upload_id,),
+        )
+        if cursor.fetchone() is None:
+            raise _upload_not_found()
+
+        # 세션 전체 크기 제한 (압축 본문 기준, 해제 후 크기는 commit에서 확인)
+        cursor.execute(
+            """
+            SELECT COALESCE(SUM(size), 0) FROM upload_session_chunks
+            WHERE session_id = %s AND chunk_index <> %s
+            """,
+            (upload_id, index),
+        )
+        if int(cursor.fetchone()[0]) + len(data) > BACKUP_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="backup payload too large")
+
+        cursor.execute(
+            """
+            INSERT INTO upload_session_chunks (session_id, chunk_index, size, chunk_sha256, data)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                size = VALUES(size),
+                chunk_sha256 = VALUES(chunk_sha256),
+                data = VALUES(data)
+            """,
+            (upload_id, index, len(data), chunk_sha256, data),
+        )
+        conn.commit()
+    except HTTPException:
+        if conn:
+            conn.rollback()
+        raise
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+
+@router.get("/uploads/{upload_id}")
+async def get_upload_session(upload_id: str):
+    """
+    업로드 세션 상태 (이어서 보낼 청크 확인용)
+    - chunks: 서버가 받은 청크의 index, size, sha256
+    """
+    return await run_db(_get_upload_session_db, upload_id)
+
+
+def _get_upload_session_db(upload_id: str) -> dict:
+    """세션 + 받은 청크 목록 조회 (DB 스레드에서 실행)"""
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT device_uuid, content_encoding, expires_at FROM upload_sessions
+            WHERE id = %s AND expires_at > UTC_TIMESTAMP()
+            """,
+            (upload_id,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            raise _upload_not_found()
+        device_uuid, content_encoding, expires_at = row
+
+        cursor.execute(
+            """
+            SELECT chunk_index, size, chunk_sha256 FROM upload_session_chunks
+            WHERE session_id = %s
+            ORDER BY chunk_index
+            """,
+            (upload_id,),
+        )
+        chunks = [{"index": index, "size": size, "sha256": sha256} for index, size, sha256 in cursor.fetchall()]
         return {
-            "payload": payload,
-            "checksum": checksum,
-            "payload_updated_at": payload_updated_at,
+            "upload_id": upload_id,
+            "device_uuid": device_uuid,
+            "content_encoding": content_encoding,
+            "expires_at": format_payload_updated_at(expires_at),
+            "received_bytes": sum(chunk["size"] for chunk in chunks),
+            "chunks": chunks,
         }
     except HTTPException:
         raise
@@ -112,3 +870,108 @@ async def get_latest_backup(device_uuid: str):
     finally:
         if conn:
             conn.close()
+
+
+@router.post("/uploads/{upload_id}/commit")
+async def commit_upload_session(upload_id: str, body: UploadCommitBody):
+    """
+    업로드 완료
+    - 0 ~ chunk_count-1 청크를 순서대로 이어 붙여 sha256 검증 후 POST /v1/backups와 같은 방식으로 저장
+    - payload의 device_uuid는 세션의 device_uuid와 같아야 함
+    - 저장 후 세션 삭제, 응답은 POST /v1/backups와 동일
+    """
+    if body.chunk_count <= 0 or body.chunk_count > BACKUP_UPLOAD_MAX_CHUNKS:
+        raise HTTPException(status_code=400, detail="invalid chunk_count")
+
+    device_uuid, payload_bytes = await run_db(
+        _assemble_upload_db, upload_id, body.chunk_count, body.sha256.strip().lower()
+    )
+    prepared = await run_in_threadpool(_prepare_backup, payload_bytes)
+    del payload_bytes
+    if prepared.device_uuid != device_uuid:
+        raise HTTPException(status_code=400, detail="device_uuid does not match upload session")
+
+    result = await _store_backup(prepared)
+    await run_db(_delete_upload_session_db, upload_id)
+    return result
+
+
+def _assemble_upload_db(upload_id: str, chunk_count: int, expected_sha256: str):
+    """
+    청크를 순서대로 읽어 이어 붙이고 해제 (DB 스레드에서 실행)
+    - 청크는 하나씩 읽어 바로 디코더에 넣음 (압축 본문 전체를 메모리에 모으지 않음)
+
+    Returns:
+        (device_uuid, 해제된 payload 바이트)
+    """
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT device_uuid, content_encoding FROM upload_sessions
+            WHERE id = %s AND expires_at > UTC_TIMESTAMP()
+            """,
+            (upload_id,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            raise _upload_not_found()
+        device_uuid, content_encoding = row
+
+        cursor.execute(
+            "SELECT chunk_index FROM upload_session_chunks WHERE session_id = %s ORDER BY chunk_index",
+            (upload_id,),
+        )
+        received = [r[0] for r in cursor.fetchall()]
+        if received != list(range(chunk_count)):
+            missing = sorted(set(range(chunk_count)) - set(received))
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "chunks missing or unexpected", "missing": missing[:100]},
+            )
+
+        digest = hashlib.sha256()
+        decoder = StreamDecoder(content_encoding, BACKUP_MAX_BYTES)
+        for index in range(chunk_count):
+            cursor.execute(
+                "SELECT data FROM upload_session_chunks WHERE session_id = %s AND chunk_index = %s",
+                (upload_id, index),
+            )
+            data = bytes(cursor.fetchone()[0])
+            digest.update(data)
+            decoder.feed(data)
+            del data
+        if digest.hexdigest() != expected_sha256:
+            raise HTTPException(status_code=400, detail="sha256 mismatch")
+        return device_uuid, decoder.finish()
+    except HTTPException:
+        raise
+    except PayloadTooLargeError:
+        raise HTTPException(status_code=413, detail="backup payload too large")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+
+def _delete_upload_session_db(upload_id: str):
+    """완료된 세션과 청크 삭제 (DB 스레드에서 실행)"""
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM upload_session_chunks WHERE session_id = %s", (upload_id,))
+        cursor.execute("DELETE FROM upload_sessions WHERE id = %s", (upload_id,))
+        conn.commit()
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
@@ -4,15 +4,30 @@
 """
 
 import hashlib
-import json
 import secrets
 from datetime import datetime, timedelta
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
 
 from app.database.connection import connect_db
-from app.utils.email_service import EmailService
+from app.database.executor import run_db
+from app.utils.backup_lookup import (
+    get_backup_meta,
+    get_device,
+    get_email_latest_backup,
+    invalidate_device,
+    refresh_email_latest,
+)
+from app.utils.backup_storage import (
+    envelope_response,
+    etag_matches,
+    load_payload_bytes,
+    not_modified_response,
+    raw_payload_response,
+)
+from app.utils.email_outbox import KIND_VERIFICATION_CODE, email_outbox, enqueue_email
 
 router = APIRouter()
 
@@ -52,69 +67,44 @@ async def get_recovery_status(device_uuid: str):
     if not device_uuid:
         raise HTTPException(status_code=400, detail="device_uuid required")
 
-    conn = None
+    return await run_db(_get_recovery_status_db, device_uuid)
+
+
+def _get_recovery_status_db(device_uuid: str) -> dict:
+    """
+    기기 이메일 인증 상태 + 최신 백업 시각 조회 (DB 스레드에서 실행)
+    - 기기 정보, 백업 메타데이터 모두 lookup_cache 경유 (캐시 hit면 DB 조회 없음)
+    """
     try:
-        conn = connect_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT email, email_verified_at
-            FROM devices
-            WHERE device_uuid = %s
-            """,
-            (device_uuid,),
-        )
-        row = cursor.fetchone()
-        if not row:
+        device = get_device(device_uuid)
+        if device is None:
             return {"email_verified": False, "email": None, "has_backup": False, "last_backup_at": None}
-        email, email_verified_at = row
+        email = device["email"]
+        email_verified = device["email_verified_at"] is not None
 
-        # 이메일 인증된 경우: 동일 이메일로 인증된 모든 기기들의 백업 중 최신 1건 조회
+        # 이메일 인증된 경우: 동일 이메일로 인증된 모든 기기들의 백업 중 최신 1건
         # (복구 API와 동일한 기준 - 다른 기기 백업도 이 기기에서 복구 가능)
-        if email_verified_at is not None:
-            cursor.execute(
-                """
-                SELECT b.payload_updated_at
-                FROM backups b
-                JOIN devices d ON b.device_uuid = d.device_uuid
-                WHERE d.email = %s AND d.email_verified_at IS NOT NULL
-                ORDER BY b.payload_updated_at DESC
-                LIMIT 1
-                """,
-                (email,),
-            )
+        if email_verified:
+            backup = get_email_latest_backup(email)
         else:
-            cursor.execute(
-                """
-                SELECT payload_updated_at FROM backups WHERE device_uuid = %s
-                """,
-                (device_uuid,),
-            )
-        backup_row = cursor.fetchone()
-        has_backup = backup_row is not None
-        last_backup_at = None
-        if backup_row and backup_row[0]:
-            dt = backup_row[0]
-            last_backup_at = dt.isoformat() if hasattr(dt, "isoformat") else str(dt)
+            backup = get_backup_meta(device_uuid)
 
         return {
-            "email_verified": email_verified_at is not None,
+            "email_verified": email_verified,
             "email": email,
-            "has_backup": has_backup,
-            "last_backup_at": last_backup_at,
+            "has_backup": backup is not None,
+            "last_backup_at": backup["payload_updated_at"] if backup else None,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if conn:
-            conn.close()
 
 
 @router.post("/email/request")
 async def request_email_verification(body: EmailRequestBody):
     """
     이메일 인증 코드 요청
-    - 6자리 코드 생성 → SHA256 해시 저장 → 이메일 발송
+    - 6자리 코드 생성 → SHA256 해시 저장 + 발송 요청(email_outbox)을 한 트랜잭션으로 커밋 → 바로 응답
+    - 실제 SMTP 발송은 백그라운드 발송기가 처리 (실패 시 코드 만료 전까지 재시도)
     """
     device_uuid = body.device_uuid
     email = body.email
@@ -128,6 +118,14 @@ async def request_email_verification(body: EmailRequestBody):
     code_hash = _hash_code(code)
     expires_at = datetime.utcnow() + timedelta(minutes=CODE_EXPIRES_MINUTES)
 
+    await run_db(_save_email_verification_db, device_uuid, email, code, code_hash, expires_at)
+    email_outbox.notify()
+
+    return {"status": "ok", "message": "인증 코드가 발송되었습니다."}
+
+
+def _save_email_verification_db(device_uuid: str, email: str, code: str, code_hash: str, expires_at: datetime) -> None:
+    """기존 인증 레코드 삭제 후 새 인증 코드 해시 저장 + 발송 요청 등록 (DB 스레드에서 실행)"""
     conn = None
     try:
         conn = connect_db()
@@ -160,17 +158,17 @@ async def request_email_verification(body: EmailRequestBody):
             (device_uuid, email, code_hash, expires_at.strftime("%Y-%m-%d %H:%M:%S")),
         )
 
-        conn.commit()
-
-        # 이메일 발송
-        ok = EmailService.send_verification_code(to_email=email, code=code, expires_minutes=CODE_EXPIRES_MINUTES)
-        if not ok:
-            # DB는 저장됐지만 이메일 실패 - 클라이언트에선 재시도 유도
-            raise HTTPException(status_code=503, detail="이메일 발송에 실패했습니다. 잠시 후 다시 시도해 주세요.")
+        # 발송 요청 (같은 기기의 아직 보내지 않은 이전 코드 메일은 대체)
+        enqueue_email(
+            cursor,
+            KIND_VERIFICATION_CODE,
+            email,
+            {"code": code, "expires_minutes": CODE_EXPIRES_MINUTES},
+            expires_at,
+            dedupe_key=f"verify:{device_uuid}",
+        )
 
-        return {"status": "ok", "message": "인증 코드가 발송되었습니다."}
-    except HTTPException:
-        raise
+        conn.commit()
     except Exception as e:
         if conn:
             conn.rollback()
@@ -199,6 +197,11 @@ async def verify_email_code(body: EmailVerifyBody):
     email = email.strip().lower()
     code_hash = _hash_code(code.strip())
 
+    return await run_db(_verify_email_code_db, device_uuid, email, code_hash)
+
+
+def _verify_email_code_db(device_uuid: str, email: str, code_hash: str) -> dict:
+    """인증 코드 해시 비교 후 devices 이메일 등록 (DB 스레드에서 실행)"""
     conn = None
     try:
         conn = connect_db()
@@ -241,6 +244,9 @@ async def verify_email_code(body: EmailVerifyBody):
             raise HTTPException(status_code=400, detail="인증 코드가 일치하지 않습니다.")
 
         # 인증 성공: devices 업데이트, 사용한 인증 레코드 삭제
+        cursor.execute("SELECT email FROM devices WHERE device_uuid = %s", (device_uuid,))
+        previous = cursor.fetchone()
+        previous_email = previous[0] if previous else None
         now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
         cursor.execute(
             """
@@ -251,7 +257,11 @@ async def verify_email_code(body: EmailVerifyBody):
             (email, now, now, device_uuid),
         )
         cursor.execute("DELETE FROM email_verifications WHERE id = %s", (ev_id,))
+        # 이메일별 최신 백업 포인터 재계산 (이전 이메일에서 빠지고 새 이메일에 합류)
+        for pointer_email in sorted({previous_email, email} - {None}):
+            refresh_email_latest(cursor, pointer_email)
         conn.commit()
+        invalidate_device(device_uuid, previous_email, email)
 
         return {"status": "ok", "message": "이메일이 등록되었습니다."}
     except HTTPException:
@@ -266,64 +276,175 @@ async def verify_email_code(body: EmailVerifyBody):
 
 
 @router.get("/backup")
-async def get_backup_by_email(device_uuid: str):
+async def get_backup_by_email(
+    device_uuid: str,
+    raw: bool = False,
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+):
     """
     다른 기기 복구용: 이메일로 백업 조회
     - device_uuid의 devices.email이 인증된 경우, 해당 이메일로 등록된 기기들의 백업 중 최신 1개 반환
+    - 응답 ETag = checksum, If-None-Match가 일치하면 304
+    - raw=true: payload JSON만 본문으로 반환 (GET /v1/backups/latest와 동일)
+    - raw=true + Range: 일부만 받기 (206, 끊긴 다운로드 이어받기)
     """
     if not device_uuid:
         raise HTTPException(status_code=400, detail="device_uuid required")
 
+    return await run_db(
+        _get_backup_by_email_db, device_uuid, raw, accept_encoding, if_none_match, range_header, if_range
+    )
+
+
+def _get_backup_by_email_db(
+    device_uuid: str,
+    raw: bool,
+    accept_encoding: Optional[str],
+    if_none_match: Optional[str],
+    range_header: Optional[str],
+    if_range: Optional[str],
+):
+    """
+    인증된 이메일 기준 최신 백업 조회 (DB 스레드에서 실행)
+    - 기기 인증 정보, 이메일별 최신 백업은 lookup_cache 경유 (304면 DB 조회 없음)
+    """
     conn = None
     try:
-        conn = connect_db()
-        cursor = conn.cursor()
-
         # 현재 기기의 이메일 인증 여부 확인
-        cursor.execute(
-            """
-            SELECT email FROM devices
-            WHERE device_uuid = %s AND email_verified_at IS NOT NULL
-            """,
-            (device_uuid,),
-        )
-        row = cursor.fetchone()
-        if not row:
+        device = get_device(device_uuid)
+        if device is None or device["email_verified_at"] is None:
             raise HTTPException(
                 status_code=403,
                 detail="이메일 인증이 필요합니다. 백업 화면에서 이메일을 등록해 주세요.",
             )
 
-        email = row[0]
+        # 동일 이메일로 인증된 기기들의 백업 중 최신 1개 (payload 제외)
+        latest = get_email_latest_backup(device["email"])
+        if latest is None:
+            raise HTTPException(status_code=404, detail="No backup found for this email")
+        if etag_matches(if_none_match, latest["checksum"]):
+            return not_modified_response(latest["checksum"])
 
-        # 동일 이메일로 인증된 기기들의 백업 중 최신 1개 조회
+        # 변경된 경우에만 payload 조회 (PK 조회)
+        conn = connect_db()
+        cursor = conn.cursor()
         cursor.execute(
             """
-            SELECT b.payload_json, b.checksum, b.payload_updated_at
-            FROM backups b
-            JOIN devices d ON b.device_uuid = d.device_uuid
-            WHERE d.email = %s AND d.email_verified_at IS NOT NULL
-            ORDER BY b.payload_updated_at DESC
-            LIMIT 1
+            SELECT payload_codec, payload_json, payload_blob, checksum, payload_updated_at
+            FROM backups
+            WHERE device_uuid = %s
             """,
-            (email,),
+            (latest["device_uuid"],),
         )
-        backup_row = cursor.fetchone()
-        if not backup_row:
+        payload_row = cursor.fetchone()
+        if not payload_row:
             raise HTTPException(status_code=404, detail="No backup found for this email")
 
-        payload_json, checksum, payload_updated_at = backup_row
-        payload = json.loads(payload_json)
-        return {
-            "payload": payload,
-            "checksum": checksum,
-            "payload_updated_at": payload_updated_at,
-        }
+        payload_codec, payload_json, payload_blob, checksum, payload_updated_at = payload_row
+        if raw:
+            return raw_payload_response(
+                payload_codec, payload_json, payload_blob, checksum, payload_updated_at, accept_encoding,
+                range_header, if_range,
+            )
+        payload_bytes = load_payload_bytes(payload_codec, payload_json, payload_blob)
+        return envelope_response(payload_bytes, checksum, payload_updated_at)
     except HTTPException:
         raise
     except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
         if conn:
-            conn.rollback()
+            conn.close()
+
+
+@router.get("/backup/{checksum}")
+async def get_backup_by_checksum(
+    checksum: str,
+    device_uuid: str,
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+):
+    """
+    다른 기기 복구용: checksum으로 payload JSON 조회 (raw 응답 전용)
+    - 같은 이메일로 인증된 기기의 백업 중 checksum이 일치하는 것
+    - checksum이 같으면 저장 바이트도 같으므로 Range로 끊긴 다운로드를 이어받을 수 있음
+    - 그 사이 새 백업이 올라와 checksum이 바뀌면 404 → GET /backup으로 최신 checksum부터 다시
+    """
+    if not device_uuid:
+        raise HTTPException(status_code=400, detail="device_uuid required")
+
+    return await run_db(
+        _get_backup_by_checksum_db, device_uuid, checksum, accept_encoding, if_none_match, range_header, if_range
+    )
+
+
+def _get_backup_by_checksum_db(
+    device_uuid: str,
+    checksum: str,
+    accept_encoding: Optional[str],
+    if_none_match: Optional[str],
+    range_header: Optional[str],
+    if_range: Optional[str],
+):
+    """인증된 이메일의 기기 백업 중 checksum 일치하는 payload 조회 (DB 스레드에서 실행)"""
+    conn = None
+    try:
+        device = get_device(device_uuid)
+        if device is None or device["email_verified_at"] is None:
+            raise HTTPException(
+                status_code=403,
+                detail="이메일 인증이 필요합니다. 백업 화면에서 이메일을 등록해 주세요.",
+            )
+        if etag_matches(if_none_match, checksum):
+            return not_modified_response(checksum)
+
+        # 캐시 miss면 자체적으로 연결을 빌렸다 반납하므로 connect_db() 전에 호출
+        # (연결을 쥔 채 두 번째 연결을 기다리면 풀 크기만큼 동시 요청 시 교착)
+        latest = get_email_latest_backup(device["email"])
+        conn = connect_db()
+        cursor = conn.cursor()
+        if latest is not None and latest["checksum"] == checksum:
+            # 대부분 최신 백업 → PK 조회
+            cursor.execute(
+                """
+                SELECT payload_codec, payload_json, payload_blob, checksum, payload_updated_at
+                FROM backups
+                WHERE device_uuid = %s AND checksum = %s
+                """,
+                (latest["device_uuid"], checksum),
+            )
+        else:
+            cursor.execute(
+                """
+                SELECT b.payload_codec, b.payload_json, b.payload_blob, b.checksum, b.payload_updated_at
+                FROM devices d
+                JOIN backups b ON b.device_uuid = d.device_uuid
+                WHERE d.email = %s AND d.email_verified_at IS NOT NULL AND b.checksum = %s
+                ORDER BY b.device_uuid
+                LIMIT 1
+                """,
+                (device["email"], checksum),
+            )
+        row = cursor.fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="No backup found for this checksum")
+
+        payload_codec, payload_json, payload_blob, checksum, payload_updated_at = row
+        response = raw_payload_response(
+            payload_codec, payload_json, payload_blob, checksum, payload_updated_at, accept_encoding,
+            range_header, if_range,
+        )
+        # URL이 내용을 식별하므로 클라이언트 캐시에 오래 보관 가능
+        response.headers["Cache-Control"] = "private, max-age=31536000, immutable"
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if conn:
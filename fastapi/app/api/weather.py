@@ -5,13 +5,36 @@ Weather API - OpenWeatherMap API 직접 조회 (DB 저장 없음)
 수정일: 2026-01-21 - weather 테이블 제거 마이그레이션
 """
 
+import os
 from fastapi import APIRouter, Query
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from datetime import datetime
-from ..utils.weather_service import WeatherService
+from ..utils.weather_cache import grid_cell
+from ..utils.weather_service import slice_forecast, validate_forecast_date, weather_service
 
 router = APIRouter()
 
+# 배치 조회: 요청당 최대 좌표 수, 요청당 동시 업스트림 호출 수 (전체 상한은 WEATHER_HTTP_MAX_CONCURRENCY)
+WEATHER_BATCH_MAX_LOCATIONS = int(os.getenv('WEATHER_BATCH_MAX_LOCATIONS', '50'))
+WEATHER_BATCH_CONCURRENCY = int(os.getenv('WEATHER_BATCH_CONCURRENCY', '5'))
+
+
+def _format_forecast(forecast: Dict) -> Dict:
+    """예보 1일치 → 응답 항목"""
+    weather_datetime = forecast["weather_datetime"]
+    if isinstance(weather_datetime, datetime):
+        weather_datetime_str = weather_datetime.isoformat()
+    else:
+        weather_datetime_str = str(weather_datetime)
+    return {
+        'weather_datetime': weather_datetime_str,
+        'weather_type': forecast["weather_type"],
+        'weather_low': forecast["weather_low"],
+        'weather_high': forecast["weather_high"],
+        'icon_url': forecast["icon_url"]
+    }
+
 
 # ============================================
 # OpenWeatherMap API에서 직접 날씨 데이터 가져오기 (DB 저장 없이)
@@ -46,30 +69,15 @@ async def fetch_weather_direct(
                     "errorMsg": f"날짜 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 필요): {start_date}"
                 }
         
-        # WeatherService를 사용하여 OpenWeatherMap API에서 직접 데이터 가져오기
-        weather_service = WeatherService()
-        forecast_list = weather_service.fetch_daily_forecast(
+        # 공유 WeatherService로 OpenWeatherMap API에서 직접 데이터 가져오기 (이벤트 루프를 막지 않음)
+        forecast_list = await weather_service.fetch_daily_forecast(
             lat=str(lat),
             lon=str(lon),
             start_date=start_date_obj
         )
         
         # 결과 포맷팅
-        results = []
-        for forecast in forecast_list:
-            weather_datetime = forecast["weather_datetime"]
-            if isinstance(weather_datetime, datetime):
-                weather_datetime_str = weather_datetime.isoformat()
-            else:
-                weather_datetime_str = str(weather_datetime)
-            
-            results.append({
-                'weather_datetime': weather_datetime_str,
-                'weather_type': forecast["weather_type"],
-                'weather_low': forecast["weather_low"],
-                'weather_high': forecast["weather_high"],
-                'icon_url': forecast["icon_url"]
-            })
+        results = [_format_forecast(forecast) for forecast in forecast_list]
         
         return {"results": results}
         
@@ -119,28 +127,15 @@ async def fetch_weather_direct_single(
                     "errorMsg": f"날짜 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 필요): {target_date}"
                 }
         
-        # WeatherService를 사용하여 OpenWeatherMap API에서 특정 날짜의 날씨만 가져오기
-        weather_service = WeatherService()
-        forecast = weather_service.fetch_single_day_weather(
+        # 공유 WeatherService로 OpenWeatherMap API에서 특정 날짜의 날씨만 가져오기
+        forecast = await weather_service.fetch_single_day_weather(
             lat=str(lat),
             lon=str(lon),
             target_date=target_date_obj
         )
         
         # 결과 포맷팅
-        weather_datetime = forecast["weather_datetime"]
-        if isinstance(weather_datetime, datetime):
-            weather_datetime_str = weather_datetime.isoformat()
-        else:
-            weather_datetime_str = str(weather_datetime)
-        
-        result = {
-            'weather_datetime': weather_datetime_str,
-            'weather_type': forecast["weather_type"],
-            'weather_low': forecast["weather_low"],
-            'weather_high': forecast["weather_high"],
-            'icon_url': forecast["icon_url"]
-        }
+        result = _format_forecast(forecast)
         
         return {"result": result}
         
@@ -161,6 +156,73 @@ async def fetch_weather_direct_single(
         }
 
 
+# ============================================
+# 여러 좌표의 날씨를 한 번에 가져오기 (대시보드/위젯용)
+# ============================================
+class WeatherBatchLocation(BaseModel):
+    lat: float = Field(ge=-90, le=90)
+    lon: float = Field(ge=-180, le=180)
+    start_date: Optional[str] = None  # YYYY-MM-DD, 없으면 오늘
+    end_date: Optional[str] = None  # YYYY-MM-DD, 없으면 예보 끝까지 (최대 8일)
+
+
+class WeatherBatchBody(BaseModel):
+    locations: List[WeatherBatchLocation] = Field(min_length=1, max_length=WEATHER_BATCH_MAX_LOCATIONS)
+
+
+@router.post("/direct/batch")
+async def fetch_weather_direct_batch(body: WeatherBatchBody):
+    """
+    여러 좌표의 일별 예보를 한 번에 가져오기 (요청 순서대로 응답)
+    
+    - 좌표를 격자 셀로 맞춰 같은 셀은 한 번만 조회
+    - 캐시 적중 셀은 바로 채우고, miss 셀만 WEATHER_BATCH_CONCURRENCY개씩 동시에 OpenWeatherMap 호출
+    - 날짜 검증/조회 실패는 해당 좌표만 {"result": "Error", "errorMsg": ...} (다른 좌표는 정상 응답)
+    - 날짜 검증: 과거 날짜 불가, 최대 8일까지만 가능, end_date >= start_date
+    """
+    items = []
+    windows = []  # 좌표별 (셀 키, start_date, end_date), 날짜 오류면 None
+    cells = []
+    for location in body.locations:
+        item = {"lat": location.lat, "lon": location.lon}
+        items.append(item)
+        windows.append(None)
+        try:
+            start_date = validate_forecast_date(location.start_date)
+            end_date = validate_forecast_date(location.end_date)
+            if start_date and end_date and end_date < start_date:
+                raise ValueError("end_date는 start_date보다 빠를 수 없습니다.")
+        except ValueError as e:
+            item.update({"result": "Error", "errorMsg": str(e)})
+            continue
+        cell = grid_cell(location.lat, location.lon)
+        windows[-1] = (cell.key, start_date, end_date)
+        cells.append(cell)
+    
+    forecasts = await weather_service.get_cell_forecasts(cells, WEATHER_BATCH_CONCURRENCY)
+    
+    for item, window in zip(items, windows):
+        if window is None:
+            continue
+        key, start_date, end_date = window
+        forecast, status = forecasts[key]
+        if status == "error":
+            item.update({"result": "Error", "errorMsg": str(forecast)})
+            continue
+        item["cache"] = status
+        item["results"] = [_format_forecast(f) for f in slice_forecast(forecast, start_date, end_date)]
+    
+    statuses = [status for _, status in forecasts.values()]
+    return {
+        "results": items,
+        "cells": len(forecasts),
+        "cache_hits": statuses.count("hit"),
+        "stale": statuses.count("stale"),
+        "fetched": statuses.count("miss") + statuses.count("coalesced"),
+        "errors": statuses.count("error"),
+    }
+
+
 # ============================================================
 # 생성 이력
 # ============================================================
@@ -184,3 +246,16 @@ async def fetch_weather_direct_single(
 #   - connect_db import 제거
 #   - /direct, /direct/single 엔드포인트만 유지
 #   - OpenWeatherMap API 직접 호출만 지원
+#
+# 2026-10-18: 공유 비동기 WeatherService 사용
+#   - 요청마다 WeatherService()를 만들던 방식 → weather_service 공유 인스턴스
+#   - fetch_daily_forecast(), fetch_single_day_weather()를 await (블로킹 HTTP 호출 제거)
+#
+# 2026-10-18: 여러 좌표 일괄 조회
+#   - POST /v1/weather/direct/batch 추가 (좌표 목록 + 좌표별 날짜 구간, 한 번에 응답)
+#   - 응답 항목 포맷팅을 _format_forecast로 분리
+#   - main.py에 라우터 등록 (/v1/weather)
+#
+# 2026-10-18: 배치 응답에 stale 셀 수 추가 (만료된 마지막 예보를 응답하고 백그라운드 갱신한 셀)
+#
+# 2026-10-18: /direct, /direct/single도 _format_forecast로 응답 항목 포맷팅 (중복 제거)
@@ -3,8 +3,12 @@
 HabitCell 습관 앱 MySQL 연결을 위한 설정
 """
 
+import os
+
 import pymysql
 
+from app.database.pool import ConnectionPool
+
 
 # TODO: 실제 데이터베이스 설정으로 변경 필요
 DB_CONFIG = {
@@ -16,19 +20,49 @@ DB_CONFIG = {
     'port': 3306
 }
 
+# 커넥션 풀 설정 (환경변수로 조정 가능)
+DB_POOL_CONFIG = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+    'recycle_seconds': int(os.getenv('DB_POOL_RECYCLE_SECONDS', '3600')),  # MySQL wait_timeout보다 짧게
+    'wait_timeout': float(os.getenv('DB_POOL_WAIT_TIMEOUT', '10')),  # 풀 고갈 시 대기 시간 (초)
+    'pre_ping': os.getenv('DB_POOL_PRE_PING', '1') == '1',  # 대여 시 ping 헬스 체크
+}
+
+_pool = ConnectionPool(DB_CONFIG, **DB_POOL_CONFIG)
+
 
 def connect_db():
     """
-    데이터베이스 연결
+    데이터베이스 연결 (커넥션 풀에서 대여)
+    - 사용 후 conn.close() 호출 시 실제 종료 대신 풀에 반납
     
     Returns:
-        pymysql.Connection: 데이터베이스 연결 객체
+        PooledConnection: pymysql.Connection과 동일하게 사용하는 풀 연결 객체
         
+    Raises:
+        pymysql.Error: 데이터베이스 연결 실패 또는 풀 대기 시간 초과 시
+    """
+    return _pool.acquire()
+
+
+def connect_db_unpooled() -> pymysql.connections.Connection:
+    """
+    풀을 거치지 않는 전용 연결 (장시간 스트리밍 조회용)
+    - 대량 export처럼 오래 걸리는 작업이 풀 슬롯을 점유하지 않도록 분리
+    - 사용 후 conn.close()로 실제 종료
+
     Raises:
         pymysql.Error: 데이터베이스 연결 실패 시
     """
-    try:
-        conn = pymysql.connect(**DB_CONFIG)
-        return conn
-    except pymysql.Error as e:
-        raise pymysql.Error(f"Database connection failed: {str(e)}") from e
+    return pymysql.connect(**DB_CONFIG)
+
+
+def get_pool() -> ConnectionPool:
+    """커넥션 풀 객체 반환 (warmup/close_all 등 수명 관리용)"""
+    return _pool
+
+
+def get_pool_stats() -> dict:
+    """커넥션 풀 통계 (사이징 참고용)"""
+    return _pool.stats()
@@ -0,0 +1,153 @@
+"""
+DB 작업 전용 실행기
+pymysql은 블로킹 드라이버이므로 async 라우트에서 직접 호출하면 이벤트 루프가 멈춤
+→ 크기가 제한된 스레드 풀에서 실행하고, 대기열 길이 등 지표를 함께 수집
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# 워커 수는 커넥션 풀 크기와 맞춤 (더 많아도 풀 대기만 늘어남)
+DB_EXECUTOR_MAX_WORKERS = int(os.getenv('DB_EXECUTOR_MAX_WORKERS', os.getenv('DB_POOL_MAX_SIZE', '10')))
+# 실행 대기 중인 작업 상한 (초과 시 DBQueueFullError → 503)
+DB_EXECUTOR_MAX_QUEUE = int(os.getenv('DB_EXECUTOR_MAX_QUEUE', '1000'))
+
+
+class DBQueueFullError(Exception):
+    """DB 작업 대기열이 가득 찼을 때 (과부하)"""
+
+
+class DBExecutor:
+    """
+    DB 작업용 bounded 스레드 풀
+
+    Args:
+        max_workers: 동시에 실행할 DB 작업 수
+        max_queue: 실행 대기 중인 작업 상한
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._lock = threading.Lock()
+
+        self._queued = 0  # 제출됐지만 아직 시작 안 된 작업
+        self._active = 0  # 실행 중인 작업
+        self._peak_queued = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._queue_wait_total = 0.0
+        self._run_time_total = 0.0
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        블로킹 함수를 DB 스레드 풀에서 실행하고 결과를 await
+
+        Raises:
+            DBQueueFullError: 대기열이 max_queue에 도달했을 때
+            fn에서 발생한 예외는 그대로 전달 (HTTPException 포함)
+        """
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise DBQueueFullError(f"DB queue is full ({self.max_queue} pending)")
+            self._queued += 1
+            self._submitted += 1
+            if self._queued > self._peak_queued:
+                self._peak_queued = self._queued
+
+        submitted_at = time.monotonic()
+        call = functools.partial(self._call, fn, args, kwargs, submitted_at)
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            self._release_queued()
+            raise
+        # 대기 중에 await가 취소되면(클라이언트 연결 끊김 등) 작업도 취소되어 _call이 실행되지 않음
+        # → 대기열 슬롯을 여기서 반환 (안 하면 슬롯이 새어 결국 모든 요청이 DBQueueFullError)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future):
+        if future.cancelled():
+            self._release_queued()
+
+    def _release_queued(self):
+        with self._lock:
+            self._queued -= 1
+
+    def _call(self, fn, args, kwargs, submitted_at: float):
+        started = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._queue_wait_total += started - submitted_at
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._run_time_total += time.monotonic() - started
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+
+    def stats(self) -> dict:
+        """대기열 길이 및 처리 지표"""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "active": self._active,
+                "peak_queued": self._peak_queued,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_queue_wait_ms": round(self._queue_wait_total / finished * 1000, 3) if finished else 0.0,
+                "avg_run_time_ms": round(self._run_time_total / finished * 1000, 3) if finished else 0.0,
+            }
+
+    def shutdown(self):
+        """앱 종료 시 실행 중인 작업 완료 후 종료"""
+        self._executor.shutdown(wait=True)
+
+
+_db_executor = DBExecutor(DB_EXECUTOR_MAX_WORKERS, DB_EXECUTOR_MAX_QUEUE)
+
+
+async def run_db(fn, *args, **kwargs):
+    """
+    DB 작업 실행 (async 라우트에서 사용)
+
+    사용 예시:
+        def _load(device_uuid):
+            conn = connect_db()
+            ...
+        result = await run_db(_load, device_uuid)
+    """
+    return await _db_executor.run(fn, *args, **kwargs)
+
+
+def get_db_executor() -> DBExecutor:
+    """DB 실행기 객체 반환 (수명 관리용)"""
+    return _db_executor
+
+
+def get_db_executor_stats() -> dict:
+    """DB 실행기 통계"""
+    return _db_executor.stats()
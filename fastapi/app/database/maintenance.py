@@ -0,0 +1,367 @@
+"""
+백그라운드 정리 작업 (만료된 인증 코드, 만료된 분할 업로드 세션, 발송 실패 메일, 고아 기기)
+- 앱 수명 주기(lifespan)에서 시작/종료, MAINTENANCE_INTERVAL_SECONDS마다 실행
+- 작업마다 MAINTENANCE_BATCH_SIZE행씩 나눠 삭제 (배치 1개 = 짧은 트랜잭션 1개)
+  → 배치 사이 MAINTENANCE_BATCH_PAUSE_MS 쉬어 API 요청과 잠금/DB 스레드를 나눠 씀
+- 한 번 실행에서 작업당 최대 MAINTENANCE_MAX_BATCHES 배치 (남은 행은 다음 실행에서)
+- 삭제는 멱등이므로 여러 워커 프로세스에서 동시에 돌아도 결과는 같음
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+from app.database.connection import connect_db
+from app.database.executor import DBQueueFullError, run_db
+
+MAINTENANCE_ENABLED = os.getenv('MAINTENANCE_ENABLED', '1') == '1'
+MAINTENANCE_INTERVAL_SECONDS = float(os.getenv('MAINTENANCE_INTERVAL_SECONDS', '600'))
+# 기동 직후 첫 실행까지 대기 (배포 직후 부하와 겹치지 않도록)
+MAINTENANCE_INITIAL_DELAY_SECONDS = float(os.getenv('MAINTENANCE_INITIAL_DELAY_SECONDS', '60'))
+MAINTENANCE_BATCH_SIZE = int(os.getenv('MAINTENANCE_BATCH_SIZE', '500'))
+MAINTENANCE_BATCH_PAUSE_MS = int(os.getenv('MAINTENANCE_BATCH_PAUSE_MS', '200'))
+MAINTENANCE_MAX_BATCHES = int(os.getenv('MAINTENANCE_MAX_BATCHES', '100'))
+# 만료 후 이 시간 동안은 남겨 둠 (그 사이 검증 시도에는 "만료되었습니다" 안내)
+MAINTENANCE_VERIFICATION_GRACE_MINUTES = int(os.getenv('MAINTENANCE_VERIFICATION_GRACE_MINUTES', '60'))
+# 발송 실패(failed) 메일을 만료 후 이 기간 동안 남겨 둠 (last_error 확인용)
+MAINTENANCE_FAILED_EMAIL_DAYS = int(os.getenv('MAINTENANCE_FAILED_EMAIL_DAYS', '7'))
+# 이메일/백업/인증/업로드 세션이 없는 기기를 이 기간 동안 변경이 없으면 삭제
+MAINTENANCE_ORPHAN_DEVICE_DAYS = int(os.getenv('MAINTENANCE_ORPHAN_DEVICE_DAYS', '30'))
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join(["%s"] * count)
+
+
+def _utc_cutoff(**delta) -> str:
+    return (datetime.utcnow() - timedelta(**delta)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _purge_expired_verifications_db(batch_size: int) -> Tuple[int, bool]:
+    """만료된 email_verifications 삭제 (expires_at 인덱스 순서, 1배치)"""
+    cutoff = _utc_cutoff(minutes=MAINTENANCE_VERIFICATION_GRACE_MINUTES)
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id FROM email_verifications WHERE expires_at < %s ORDER BY expires_at LIMIT %s",
+            (cutoff, batch_size),
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return 0, False
+        deleted = cursor.execute(
+            f"DELETE FROM email_verifications WHERE id IN ({_placeholders(len(ids))}) AND expires_at < %s",
+            (*ids, cutoff),
+        )
+        conn.commit()
+        return deleted, len(ids) == batch_size
+    except Exception:
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+
+def _purge_expired_upload_sessions_db(batch_size: int) -> Tuple[int, bool]:
+    """
+    만료된 upload_sessions와 청크 삭제 (1배치)
+    - 세션 하나의 청크 합계는 BACKUP_MAX_BYTES 이하이므로 세션 수 기준으로 배치를 줄임
+    """
+    cutoff = _utc_cutoff()
+    sessions_per_batch = max(batch_size // 50, 1)
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id FROM upload_sessions WHERE expires_at < %s ORDER BY expires_at LIMIT %s",
+            (cutoff, sessions_per_batch),
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return 0, False
+        marks = _placeholders(len(ids))
+        chunks = cursor.execute(f"DELETE FROM upload_session_chunks WHERE session_id IN ({marks})", ids)
+        sessions = cursor.execute(
+            f"DELETE FROM upload_sessions WHERE id IN ({marks}) AND expires_at < %s", (*ids, cutoff)
+        )
+        conn.commit()
+        return chunks + sessions, len(ids) == sessions_per_batch
+    except Exception:
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+
+def _purge_failed_emails_db(batch_size: int) -> Tuple[int, bool]:
+    """발송 실패가 확정된 email_outbox 행 삭제 (1배치)"""
+    cutoff = _utc_cutoff(days=MAINTENANCE_FAILED_EMAIL_DAYS)
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id FROM email_outbox WHERE status = 'failed' AND expires_at < %s LIMIT %s",
+            (cutoff, batch_size),
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return 0, False
+        deleted = cursor.execute(
+            f"DELETE FROM email_outbox WHERE id IN ({_placeholders(len(ids))}) AND status = 'failed'", ids
+        )
+        conn.commit()
+        return deleted, len(ids) == batch_size
+    except Exception:
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+
+# 고아 기기 조건: 이메일 없음 + 오래됨 + 딸린 행 없음 (삭제 시점에 다시 확인)
+_ORPHAN_DEVICE_CONDITION = """
+    devices.email IS NULL
+    AND devices.updated_at < %s
+    AND NOT EXISTS (SELECT 1 FROM backups b WHERE b.device_uuid = devices.device_uuid)
+    AND NOT EXISTS (SELECT 1 FROM backup_versions v WHERE v.device_uuid = devices.device_uuid)
+    AND NOT EXISTS (SELECT 1 FROM email_verifications ev WHERE ev.device_uuid = devices.device_uuid)
+    AND NOT EXISTS (SELECT 1 FROM upload_sessions us WHERE us.device_uuid = devices.device_uuid)
+"""
+
+
+def _purge_orphan_devices_db(batch_size: int, after: Optional[str]) -> Tuple[int, Optional[str]]:
+    """
+    고아 기기 삭제 (인증 코드만 요청하고 인증/백업하지 않은 기기 등, 1배치)
+    - device_uuid 순서로 이어서 조회 (이미 훑은 구간을 배치마다 다시 읽지 않음)
+    - 조회와 삭제 사이에 백업/인증이 생긴 기기는 DELETE 조건에서 다시 걸러짐
+    """
+    cutoff = _utc_cutoff(days=MAINTENANCE_ORPHAN_DEVICE_DAYS)
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT device_uuid FROM devices
+            WHERE device_uuid > %s AND {_ORPHAN_DEVICE_CONDITION}
+            ORDER BY device_uuid
+            LIMIT %s
+            """,
+            (after or "", cutoff, batch_size),
+        )
+        uuids = [row[0] for row in cursor.fetchall()]
+        if not uuids:
+            return 0, None
+        deleted = cursor.execute(
+            f"""
+            DELETE FROM devices
+            WHERE device_uuid IN ({_placeholders(len(uuids))}) AND {_ORPHAN_DEVICE_CONDITION}
+            """,
+            (*uuids, cutoff),
+        )
+        conn.commit()
+        return deleted, (uuids[-1] if len(uuids) == batch_size else None)
+    except Exception:
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+
+# (작업 이름, 1배치 삭제 함수, 키 순서로 이어 조회하는지)
+# - 일반 작업: (batch_size) → (삭제 행 수, 남은 행이 더 있는지)
+# - 이어 조회 작업: (batch_size, 이전 배치 마지막 키) → (삭제 행 수, 다음 배치 시작 키 또는 None=끝)
+MAINTENANCE_JOBS: List[Tuple[str, Callable, bool]] = [
+    ("expired_verifications", _purge_expired_verifications_db, False),
+    ("expired_upload_sessions", _purge_expired_upload_sessions_db, False),
+    ("failed_emails", _purge_failed_emails_db, False),
+    ("orphan_devices", _purge_orphan_devices_db, True),
+]
+
+
+class _JobStats:
+    __slots__ = ("runs", "rows_removed", "batches", "errors", "time_total", "last")
+
+    def __init__(self):
+        self.runs = 0
+        self.rows_removed = 0
+        self.batches = 0
+        self.errors = 0
+        self.time_total = 0.0
+        self.last = None
+
+
+class MaintenanceScheduler:
+    """
+    주기적 정리 작업 실행기
+
+    Args:
+        jobs: (작업 이름, 1배치 삭제 함수, 이어 조회 여부) 목록 (순서대로 실행)
+        interval: 실행 간격 (초, 이전 실행이 끝난 시점부터)
+        initial_delay: 시작 후 첫 실행까지 대기 (초)
+        batch_size: 배치당 최대 삭제 행 수
+        batch_pause_ms: 배치 사이 대기 (스로틀)
+        max_batches: 실행 1회에서 작업당 최대 배치 수
+    """
+
+    def __init__(
+        self,
+        jobs: List[Tuple[str, Callable, bool]],
+        interval: float,
+        initial_delay: float,
+        batch_size: int,
+        batch_pause_ms: int,
+        max_batches: int,
+    ):
+        self.jobs = jobs
+        self.interval = interval
+        self.initial_delay = initial_delay
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause_ms / 1000
+        self.max_batches = max_batches
+
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._runs = 0
+        self._last_started_at: Optional[str] = None
+        self._job_stats = {name: _JobStats() for name, _, _ in jobs}
+        self._recent_runs = deque(maxlen=10)
+
+    def start(self):
+        """주기 실행 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """앱 종료 시 태스크 취소 (진행 중인 배치는 자체 트랜잭션이므로 끊겨도 안전)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self):
+        await asyncio.sleep(self.initial_delay)
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"정리 작업 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> dict:
+        """
+        모든 작업을 한 번 실행 (동시에 두 번 실행되지 않음)
+
+        Returns:
+            {"started_at", "elapsed_ms", "jobs": {작업 이름: {"rows", "batches", "elapsed_ms", "error"}}}
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            started = time.monotonic()
+            self._runs += 1
+            self._last_started_at = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+            report = {"started_at": self._last_started_at, "jobs": {}}
+            for name, fn, keyset in self.jobs:
+                report["jobs"][name] = await self._run_job(name, fn, keyset)
+            report["elapsed_ms"] = round((time.monotonic() - started) * 1000, 3)
+            self._recent_runs.append(report)
+            return report
+
+    async def _run_job(self, name: str, fn: Callable, keyset: bool) -> dict:
+        stats = self._job_stats[name]
+        started = time.monotonic()
+        rows = 0
+        batches = 0
+        error = None
+        after = None
+        try:
+            while batches < self.max_batches:
+                if keyset:
+                    deleted, after = await run_db(fn, self.batch_size, after)
+                    more = after is not None
+                else:
+                    deleted, more = await run_db(fn, self.batch_size)
+                rows += deleted
+                batches += 1
+                if not more:
+                    break
+                await asyncio.sleep(self.batch_pause)
+        except DBQueueFullError:
+            # API 요청이 몰리는 중 → 이번 실행은 여기까지 (다음 실행에서 이어서)
+            error = "db queue full"
+        except Exception as e:
+            error = str(e)
+
+        elapsed = time.monotonic() - started
+        stats.runs += 1
+        stats.rows_removed += rows
+        stats.batches += batches
+        stats.errors += error is not None
+        stats.time_total += elapsed
+        stats.last = {
+            "rows": rows,
+            "batches": batches,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "error": error,
+        }
+        return stats.last
+
+    def stats(self) -> dict:
+        """실행 및 작업별 삭제 지표"""
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "batch_pause_ms": round(self.batch_pause * 1000, 3),
+            "max_batches": self.max_batches,
+            "runs": self._runs,
+            "last_started_at": self._last_started_at,
+            "jobs": {
+                name: {
+                    "runs": s.runs,
+                    "rows_removed": s.rows_removed,
+                    "batches": s.batches,
+                    "errors": s.errors,
+                    "total_ms": round(s.time_total * 1000, 3),
+                    "last": s.last,
+                }
+                for name, s in self._job_stats.items()
+            },
+            "recent_runs": list(self._recent_runs),
+        }
+
+
+maintenance_scheduler = MaintenanceScheduler(
+    MAINTENANCE_JOBS,
+    interval=MAINTENANCE_INTERVAL_SECONDS,
+    initial_delay=MAINTENANCE_INITIAL_DELAY_SECONDS,
+    batch_size=MAINTENANCE_BATCH_SIZE,
+    batch_pause_ms=MAINTENANCE_BATCH_PAUSE_MS,
+    max_batches=MAINTENANCE_MAX_BATCHES,
+)
+
+
+def get_maintenance_stats() -> dict:
+    """정리 작업 통계 (헬스 체크용)"""
+    return maintenance_scheduler.stats()
@@ -0,0 +1,276 @@
+"""
+MySQL 커넥션 풀
+요청마다 pymysql.connect(TCP + 인증 핸드셰이크)를 새로 여는 대신 연결을 재사용하기 위한 풀
+"""
+
+import threading
+import time
+from collections import deque
+
+import pymysql
+
+
+class PoolTimeoutError(pymysql.err.OperationalError):
+    """풀이 가득 찬 상태에서 wait_timeout 동안 반납되는 연결이 없을 때"""
+
+
+class PooledConnection:
+    """
+    풀에서 빌려준 연결 래퍼
+    - close() 호출 시 실제로 끊지 않고 풀에 반납
+    - 그 외 속성(cursor, commit, rollback 등)은 원본 연결에 위임
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn: pymysql.connections.Connection, created_at: float):
+        self._pool = pool
+        self._conn = conn
+        self._created_at = created_at
+        self._released = False
+
+    def __getattr__(self, name):
+        if self._released:
+            raise pymysql.err.InterfaceError("connection already returned to pool")
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def raw(self) -> pymysql.connections.Connection:
+        """원본 pymysql 연결 (풀 반납 전까지만 사용)"""
+        return self._conn
+
+    def close(self):
+        """풀에 반납 (중복 호출 무시)"""
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._conn, self._created_at)
+
+    def discard(self):
+        """연결을 풀에 돌려주지 않고 폐기 (세션 상태를 신뢰할 수 없을 때)"""
+        if self._released:
+            return
+        self._released = True
+        self._pool.discard(self._conn)
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 pymysql 커넥션 풀
+
+    Args:
+        connect_kwargs: pymysql.connect()에 그대로 전달할 설정 (DB_CONFIG)
+        min_size: warmup()에서 미리 열어 둘 연결 수 (반납된 연결은 개수와 관계없이 유휴 목록에 보관)
+        max_size: 동시에 열 수 있는 최대 연결 수
+        recycle_seconds: 생성 후 이 시간이 지난 연결은 폐기 후 새로 연결 (0이면 비활성)
+        wait_timeout: 풀이 가득 찼을 때 반납을 기다리는 최대 시간 (초)
+        pre_ping: 대여 시 ping으로 연결 상태 확인 여부
+    """
+
+    def __init__(
+        self,
+        connect_kwargs: dict,
+        min_size: int = 1,
+        max_size: int = 10,
+        recycle_seconds: int = 3600,
+        wait_timeout: float = 10.0,
+        pre_ping: bool = True,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self._connect_kwargs = dict(connect_kwargs)
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.recycle_seconds = recycle_seconds
+        self.wait_timeout = wait_timeout
+        self.pre_ping = pre_ping
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, created_at)
+        self._size = 0  # 열려 있는 연결 수 (유휴 + 대여 중)
+
+        # 통계
+        self._created = 0
+        self._closed = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._timeouts = 0
+        self._ping_failures = 0
+        self._recycled = 0
+        self._peak_in_use = 0
+
+    # ----------------------------------------
+    # 내부 연결 생성/종료
+    # ----------------------------------------
+    def _open(self):
+        try:
+            conn = pymysql.connect(**self._connect_kwargs)
+        except pymysql.Error as e:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise pymysql.Error(f"Database connection failed: {str(e)}") from e
+        with self._cond:
+            self._created += 1
+        return conn, time.monotonic()
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._closed += 1
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.recycle_seconds > 0 and time.monotonic() - created_at > self.recycle_seconds
+
+    # ----------------------------------------
+    # 대여/반납
+    # ----------------------------------------
+    def acquire(self) -> PooledConnection:
+        """
+        연결 대여
+
+        Returns:
+            PooledConnection: close() 시 풀에 반납되는 연결
+
+        Raises:
+            PoolTimeoutError: wait_timeout 내에 연결을 얻지 못했을 때
+            pymysql.Error: 새 연결 생성 실패 시
+        """
+        while True:
+            conn, created_at = self._checkout_slot()
+            if conn is None:
+                conn, created_at = self._open()
+            elif self._is_expired(created_at):
+                self._close_quietly(conn)
+                with self._cond:
+                    self._recycled += 1
+                conn, created_at = self._open()
+            elif self.pre_ping:
+                try:
+                    conn.ping(reconnect=False)
+                except Exception:
+                    self._close_quietly(conn)
+                    with self._cond:
+                        self._ping_failures += 1
+                        self._size -= 1
+                        self._cond.notify()
+                    continue
+            return PooledConnection(self, conn, created_at)
+
+    def _checkout_slot(self):
+        """
+        유휴 연결을 꺼내거나 새 연결 슬롯을 예약
+        Returns: (conn, created_at) 또는 새로 열어야 하면 (None, None)
+        """
+        deadline = None
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, created_at = self._idle.pop()
+                    self._mark_checkout()
+                    return conn, created_at
+                if self._size < self.max_size:
+                    self._size += 1
+                    self._mark_checkout()
+                    return None, None
+
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self.wait_timeout
+                    self._waits += 1
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Database connection pool exhausted (max_size={self.max_size}, "
+                        f"waited {self.wait_timeout}s)"
+                    )
+                started = now
+                self._cond.wait(remaining)
+                self._wait_time_total += time.monotonic() - started
+
+    def _mark_checkout(self):
+        self._checkouts += 1
+        in_use = self._size - len(self._idle)
+        if in_use > self._peak_in_use:
+            self._peak_in_use = in_use
+
+    def release(self, conn, created_at: float):
+        """대여한 연결 반납 - 열린 트랜잭션은 롤백 후 유휴 목록으로"""
+        try:
+            # SELECT만 한 연결도 REPEATABLE READ 스냅샷이 남으므로 항상 롤백
+            conn.rollback()
+        except Exception:
+            self.discard(conn)
+            return
+
+        if self._is_expired(created_at):
+            with self._cond:
+                self._recycled += 1
+            self.discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, created_at))
+            self._cond.notify()
+
+    def discard(self, conn):
+        """연결 폐기 후 슬롯 반환"""
+        self._close_quietly(conn)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    # ----------------------------------------
+    # 관리
+    # ----------------------------------------
+    def warmup(self):
+        """min_size까지 유휴 연결을 미리 생성 (앱 시작 시 호출)"""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size or self._size >= self.max_size:
+                    return
+                self._size += 1
+            conn, created_at = self._open()
+            with self._cond:
+                self._idle.append((conn, created_at))
+                self._cond.notify()
+
+    def close_all(self):
+        """유휴 연결 전부 종료 (앱 종료 시 호출, 대여 중인 연결은 반납 시 정리되지 않음)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> dict:
+        """풀 사이징용 통계"""
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": idle,
+                "in_use": self._size - idle,
+                "peak_in_use": self._peak_in_use,
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "closed": self._closed,
+                "recycled": self._recycled,
+                "ping_failures": self._ping_failures,
+                "waits": self._waits,
+                "wait_time_total_ms": round(self._wait_time_total * 1000, 3),
+                "timeouts": self._timeouts,
+            }
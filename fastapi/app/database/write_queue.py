@@ -0,0 +1,218 @@
+"""
+그룹 커밋 쓰기 대기열 (write-behind)
+동시에 몰리는 쓰기를 짧은 시간창 동안 모아 한 트랜잭션(커밋 1회)으로 처리
+- 같은 키(기기)의 쓰기는 대기 중 마지막 것만 남김 (먼저 온 요청도 같은 결과를 받음)
+- 같은 키가 처리 중이면 다음 배치로 미룸 (커밋 순서 보장)
+- 배치 처리 함수는 DB 스레드 풀(run_db)에서 실행
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from app.database.executor import DBQueueFullError, run_db
+
+
+class _PendingWrite:
+    """키별 대기 중인 쓰기 (마지막 항목 + 결과를 기다리는 요청들)"""
+
+    __slots__ = ("item", "waiters", "enqueued_at")
+
+    def __init__(self, item, enqueued_at: float):
+        self.item = item
+        self.waiters: List[asyncio.Future] = []
+        self.enqueued_at = enqueued_at
+
+
+class GroupCommitQueue:
+    """
+    키별로 합치는 그룹 커밋 대기열
+
+    Args:
+        flush_fn: 블로킹 배치 처리 함수 (items 목록 → 같은 순서의 결과 목록, 실패 항목은 예외 객체)
+        window_ms: 첫 쓰기 후 배치를 모으는 시간
+        max_batch: 배치당 최대 항목 수 (차면 시간창을 기다리지 않고 처리)
+        max_pending: 대기 가능한 키 수 상한 (초과 시 DBQueueFullError → 503)
+        flushers: 동시에 처리하는 배치 수
+    """
+
+    def __init__(self, flush_fn: Callable, window_ms: int, max_batch: int, max_pending: int, flushers: int = 1):
+        self.flush_fn = flush_fn
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.flushers = flushers
+
+        self._pending: Dict[str, _PendingWrite] = {}
+        self._inflight = set()
+        self._tasks = set()
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._closing = False
+
+        self._submitted = 0
+        self._coalesced = 0
+        self._rejected = 0
+        self._batches = 0
+        self._rows = 0
+        self._failed_rows = 0
+        self._max_batch_size = 0
+        self._flush_time_total = 0.0
+        self._recent_batches = deque(maxlen=20)
+
+    def start(self):
+        """배치 처리 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._runner is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.flushers)
+        self._closing = False
+        self._runner = asyncio.create_task(self._run())
+
+    async def submit(self, key: str, item, wait: bool = True):
+        """
+        쓰기 등록
+
+        Args:
+            key: 합치기 기준 (같은 키는 마지막 항목만 기록)
+            wait: True면 커밋 결과를 기다려 반환, False면 등록만 하고 None 반환
+
+        Raises:
+            DBQueueFullError: 대기 중인 키가 max_pending에 도달했을 때
+            flush_fn이 해당 항목에 대해 반환한 예외
+        """
+        entry = self._pending.get(key)
+        if entry is None and len(self._pending) >= self.max_pending:
+            self._rejected += 1
+            raise DBQueueFullError(f"write queue is full ({self.max_pending} pending)")
+        self.start()
+
+        self._submitted += 1
+        if entry is None:
+            entry = _PendingWrite(item, time.monotonic())
+            self._pending[key] = entry
+        else:
+            entry.item = item
+            self._coalesced += 1
+
+        future = None
+        if wait:
+            future = asyncio.get_running_loop().create_future()
+            entry.waiters.append(future)
+        self._wakeup.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        if future is not None:
+            return await future
+        return None
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            if self._closing and not self._pending:
+                break
+            if not self._closing and len(self._pending) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+
+            await self._slots.acquire()
+            batch = self._take_batch()
+            if not batch:
+                # 남은 키가 모두 처리 중 → 해당 배치가 끝나면 다시 깨어남
+                self._slots.release()
+                self._wakeup.clear()
+                continue
+
+            task = asyncio.create_task(self._flush(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            if len(self._pending) < self.max_batch:
+                self._full.clear()
+            if not self._pending and not self._closing:
+                self._wakeup.clear()
+
+    def _take_batch(self) -> list:
+        batch = []
+        for key in list(self._pending):
+            if key in self._inflight:
+                continue
+            batch.append((key, self._pending.pop(key)))
+            self._inflight.add(key)
+            if len(batch) >= self.max_batch:
+                break
+        return batch
+
+    async def _flush(self, batch: list):
+        started = time.monotonic()
+        try:
+            results = await run_db(self.flush_fn, [entry.item for _, entry in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+
+        elapsed = time.monotonic() - started
+        failed = 0
+        for (key, entry), result in zip(batch, results):
+            self._inflight.discard(key)
+            failed += isinstance(result, BaseException)
+            for future in entry.waiters:
+                if future.done():
+                    continue  # 요청이 취소됨 (클라이언트 연결 종료)
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+        self._batches += 1
+        self._rows += len(batch)
+        self._failed_rows += failed
+        self._max_batch_size = max(self._max_batch_size, len(batch))
+        self._flush_time_total += elapsed
+        self._recent_batches.append({
+            "size": len(batch),
+            "requests": sum(max(len(entry.waiters), 1) for _, entry in batch),
+            "failed": failed,
+            "max_wait_ms": round(max(started - entry.enqueued_at for _, entry in batch) * 1000, 3),
+            "flush_ms": round(elapsed * 1000, 3),
+        })
+
+        self._slots.release()
+        if self._pending or self._closing:
+            self._wakeup.set()
+
+    async def drain(self):
+        """앱 종료 시 대기 중인 쓰기를 모두 커밋한 뒤 태스크 종료"""
+        if self._runner is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._runner
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._runner = None
+
+    def stats(self) -> dict:
+        """대기열 및 배치 지표"""
+        return {
+            "window_ms": round(self.window * 1000, 3),
+            "max_batch": self.max_batch,
+            "max_pending": self.max_pending,
+            "flushers": self.flushers,
+            "pending": len(self._pending),
+            "inflight": len(self._inflight),
+            "submitted": self._submitted,
+            "coalesced": self._coalesced,
+            "rejected": self._rejected,
+            "batches": self._batches,
+            "rows": self._rows,
+            "failed_rows": self._failed_rows,
+            "avg_batch_size": round(self._rows / self._batches, 3) if self._batches else 0.0,
+            "max_batch_size": self._max_batch_size,
+            "avg_flush_ms": round(self._flush_time_total / self._batches * 1000, 3) if self._batches else 0.0,
+            "recent_batches": list(self._recent_batches),
+        }
@@ -3,8 +3,11 @@ Habit App FastAPI 백엔드
 습관 앱 백업/복구 API (Local-first + Snapshot Backup)
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 import os
 
@@ -12,10 +15,41 @@ import os
 env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
 load_dotenv(dotenv_path=env_path)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작/종료 시 공유 리소스 관리"""
+    pool = get_pool()
+    try:
+        pool.warmup()
+    except Exception as e:
+        # DB가 아직 준비되지 않아도 서버는 기동 (첫 요청 시 연결 재시도)
+        print(f"DB 커넥션 풀 warmup 실패: {e}")
+    if backups.BACKUP_WRITE_QUEUE:
+        backups.backup_write_queue.start()
+    if MAINTENANCE_ENABLED:
+        maintenance_scheduler.start()
+    email_outbox.start()
+    if WEATHER_PREFETCH_ENABLED:
+        forecast_prefetcher.start()
+    yield
+    # 정리 작업/날씨 미리 갱신 중단, 보내는 중인 메일과 대기 중인 백업 쓰기를 마친 뒤 DB 실행기/풀 정리
+    await maintenance_scheduler.stop()
+    await forecast_prefetcher.stop()
+    await email_outbox.stop()
+    await backups.backup_write_queue.drain()
+    get_db_executor().shutdown()
+    pool.close_all()
+    smtp_pool.close_all()
+    await weather_http_client.close()
+    await forecast_cache.close()
+
+
 app = FastAPI(
     title="Habit App API",
     description="습관 앱 백업/복구를 위한 REST API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정 (Flutter 앱과 통신을 위해 필요)
@@ -30,9 +64,27 @@ app.add_middleware(
 # ============================================
 # 라우터 등록
 # ============================================
-from app.api import backups, recovery
+from app.api import admin, backups, recovery, weather
+from app.database.connection import get_pool, get_pool_stats
+from app.database.executor import DBQueueFullError, get_db_executor, get_db_executor_stats
+from app.database.maintenance import MAINTENANCE_ENABLED, get_maintenance_stats, maintenance_scheduler
+from app.utils.email_outbox import email_outbox, get_email_outbox_stats
+from app.utils.email_service import get_smtp_pool_stats, smtp_pool
+from app.utils.habit_stats import get_stats_cache_stats
+from app.utils.lookup_cache import get_lookup_cache_stats
+from app.utils.weather_cache import WEATHER_PREFETCH_ENABLED, forecast_cache, forecast_prefetcher, get_weather_prefetch_stats
+from app.utils.weather_service import get_weather_cache_stats, get_weather_http_stats, weather_http_client
+
 app.include_router(backups.router, prefix="/v1/backups", tags=["backups"])
 app.include_router(recovery.router, prefix="/v1/recovery", tags=["recovery"])
+app.include_router(admin.router, prefix="/v1/admin", tags=["admin"])
+app.include_router(weather.router, prefix="/v1/weather", tags=["weather"])
+
+@app.exception_handler(DBQueueFullError)
+async def db_queue_full_handler(request: Request, exc: DBQueueFullError):
+    """DB 작업 대기열 초과 시 503 (클라이언트 재시도 유도)"""
+    return JSONResponse(status_code=503, content={"detail": "서버가 혼잡합니다. 잠시 후 다시 시도해 주세요."})
+
 
 @app.get("/")
 async def root():
@@ -62,7 +114,18 @@ async def health_check():
     
     return {
         "status": "healthy",
-        "message": "API is running"
+        "message": "API is running",
+        "db_pool": get_pool_stats(),
+        "db_executor": get_db_executor_stats(),
+        "backup_write_queue": backups.backup_write_queue.stats() if backups.BACKUP_WRITE_QUEUE else None,
+        "lookup_cache": get_lookup_cache_stats(),
+        "stats_cache": get_stats_cache_stats(),
+        "maintenance": get_maintenance_stats() if MAINTENANCE_ENABLED else None,
+        "email_outbox": get_email_outbox_stats(),
+        "smtp_pool": get_smtp_pool_stats(),
+        "weather_http": get_weather_http_stats(),
+        "weather_cache": get_weather_cache_stats(),
+        "weather_prefetch": get_weather_prefetch_stats() if WEATHER_PREFETCH_ENABLED else None,
     }
 
 
@@ -0,0 +1,79 @@
+"""
+백업 스냅샷 청크 분할/조립 (내용 주소 기반 중복 제거용)
+- meta: 목록이 아닌 최상위 키 (schema_version, device_uuid, exported_at, settings 등)
+- categories, habits: 섹션 전체를 한 청크
+- logs, heatmap_snapshots: date 기준 월(YYYY-MM) 단위 청크 (행 순서 유지)
+→ 연속된 버전은 바뀐 달의 로그 청크와 meta만 새로 저장되고 나머지는 공유
+"""
+
+import hashlib
+from typing import List, Tuple
+
+from app.utils.canonical_json import dumps_canonical, loads
+
+# 월 단위로 나누는 섹션 (행의 date 필드 기준)
+DATED_SECTIONS = ("logs", "heatmap_snapshots")
+# 섹션 전체를 한 청크로 저장하는 목록 섹션
+WHOLE_SECTIONS = ("categories", "habits")
+
+
+def chunk_hash(data: bytes) -> str:
+    """청크 주소 (SHA256 hex)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def split_snapshot(payload: dict) -> List[Tuple[str, bytes]]:
+    """
+    스냅샷을 (라벨, 청크 바이트) 목록으로 분할
+    - 라벨: "meta", "habits", "logs:2025-02" 등 (조립 시 순서대로 이어 붙임)
+    - 같은 내용이면 항상 같은 바이트 (키 정렬 직렬화)
+    """
+    sections = set(DATED_SECTIONS) | set(WHOLE_SECTIONS)
+    meta = {k: v for k, v in payload.items() if k not in sections or not isinstance(v, list)}
+    entries = [("meta", dumps_canonical(meta))]
+
+    for section in WHOLE_SECTIONS:
+        rows = payload.get(section)
+        if isinstance(rows, list):
+            entries.append((section, dumps_canonical(rows)))
+
+    for section in DATED_SECTIONS:
+        rows = payload.get(section)
+        if not isinstance(rows, list):
+            continue
+        if not rows:
+            entries.append((f"{section}:", dumps_canonical([])))
+        for month, run in _month_runs(rows):
+            entries.append((f"{section}:{month}", dumps_canonical(run)))
+    return entries
+
+
+def _month_runs(rows: list):
+    """
+    같은 달이 연속된 구간 단위로 묶기
+    - 행 순서를 바꾸지 않아야 조립 결과의 checksum이 원본과 같음
+    - 날짜순 스냅샷이면 달마다 한 청크, delta로 뒤에 붙은 행은 별도 청크
+    """
+    month, run = None, []
+    for row in rows:
+        row_month = str(row.get("date") or "")[:7] if isinstance(row, dict) else ""
+        if run and row_month != month:
+            yield month, run
+            run = []
+        month = row_month
+        run.append(row)
+    if run:
+        yield month, run
+
+
+def assemble_snapshot(entries: List[Tuple[str, bytes]]) -> dict:
+    """split_snapshot 결과(라벨 순서 유지)로 스냅샷 복원"""
+    payload = {}
+    for label, data in entries:
+        value = loads(data)
+        if label == "meta":
+            payload.update(value)
+            continue
+        section = label.split(":", 1)[0]
+        payload.setdefault(section, []).extend(value)
+    return payload
@@ -0,0 +1,71 @@
+"""
+증분(delta) 백업 병합
+변경/삭제된 행만 받아 서버에 저장된 스냅샷에 반영
+- 섹션별 키: categories/habits/logs → id, heatmap_snapshots → date
+"""
+
+from typing import Dict, List
+
+
+# 섹션 이름 → 행 식별 키
+DELTA_SECTION_KEYS = {
+    "categories": "id",
+    "habits": "id",
+    "logs": "id",
+    "heatmap_snapshots": "date",
+}
+
+
+def merge_section(rows: List[dict], upserts: List[dict], deletes: List[str], key: str) -> List[dict]:
+    """
+    한 섹션 병합
+    - 기존 행은 순서를 유지한 채 교체, 새 행은 뒤에 추가
+    - deletes에 있는 키는 제거 (같은 요청의 upsert보다 삭제가 우선)
+
+    Raises:
+        ValueError: upsert 행에 식별 키가 없을 때
+    """
+    deleted = set(deletes)
+    replacements: Dict[str, dict] = {}
+    for row in upserts:
+        row_key = row.get(key)
+        if row_key is None:
+            raise ValueError(f"'{key}' required for every upserted row")
+        replacements[row_key] = row
+
+    merged = []
+    for row in rows:
+        row_key = row.get(key)
+        if row_key in deleted:
+            continue
+        if row_key in replacements:
+            merged.append(replacements.pop(row_key))
+        else:
+            merged.append(row)
+    for row_key, row in replacements.items():
+        if row_key not in deleted:
+            merged.append(row)
+    return merged
+
+
+def apply_delta(payload: dict, changes: Dict[str, dict]) -> dict:
+    """
+    스냅샷에 delta 반영 (payload는 제자리 수정 후 반환)
+
+    Args:
+        payload: 저장된 스냅샷 dict
+        changes: {섹션명: {"upserts": [...], "deletes": [...]}}
+
+    Raises:
+        ValueError: 알 수 없는 섹션, 식별 키 누락
+    """
+    for section, change in changes.items():
+        key = DELTA_SECTION_KEYS.get(section)
+        if key is None:
+            raise ValueError(f"unknown delta section: {section}")
+        upserts = change.get("upserts") or []
+        deletes = change.get("deletes") or []
+        if not upserts and not deletes:
+            continue
+        payload[section] = merge_section(payload.get(section) or [], upserts, deletes, key)
+    return payload
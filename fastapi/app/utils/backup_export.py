@@ -0,0 +1,155 @@
+"""
+전체 백업 export (NDJSON, 데이터 웨어하우스 적재/재해 복구 훈련용)
+- 기기 1대 = 1줄: devices 행 + backups 행(없으면 null), device_uuid 오름차순
+- 서버 측 커서(SSCursor)로 한 행씩 받아 바로 내보냄
+  → 결과 전체를 메모리에 올리지 않음 (메모리 사용량은 가장 큰 백업 1건 수준)
+- payload는 저장된 JSON 바이트를 파싱하지 않고 줄에 그대로 삽입
+- 이어받기: 마지막으로 받은 줄의 device_uuid를 after로 넘기면 그 다음 기기부터
+- 풀을 거치지 않는 전용 연결 사용 (오래 걸리는 조회가 API 요청의 풀 슬롯을 점유하지 않음)
+
+CLI (fastapi 디렉터리에서):
+    python -m app.utils.backup_export --out backups.ndjson.gz --compression gzip
+    python -m app.utils.backup_export --out backups.ndjson.gz --compression gzip --append --after <device_uuid>
+    python -m app.utils.backup_export --no-payload > devices.ndjson
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Iterable, Iterator, Optional, Tuple
+
+import pymysql
+
+from app.database.connection import connect_db_unpooled
+from app.utils import canonical_json
+from app.utils.backup_storage import format_payload_updated_at, load_payload_bytes
+from app.utils.payload_codec import StreamEncoder
+
+# 클라이언트가 느리게 읽는 동안 MySQL이 결과 전송을 끊지 않도록 (초)
+BACKUP_EXPORT_NET_WRITE_TIMEOUT = int(os.getenv('BACKUP_EXPORT_NET_WRITE_TIMEOUT', '600'))
+
+
+def _export_line(row: tuple, include_payload: bool) -> bytes:
+    """조회 행 → NDJSON 한 줄"""
+    device_uuid, email, email_verified_at, created_at, updated_at, checksum, payload_updated_at = row[:7]
+    head = canonical_json.dumps({
+        "device_uuid": device_uuid,
+        "email": email,
+        "email_verified_at": format_payload_updated_at(email_verified_at),
+        "created_at": format_payload_updated_at(created_at),
+        "updated_at": format_payload_updated_at(updated_at),
+    })
+    if checksum is None:
+        return head[:-1] + b',"backup":null}\n'
+
+    backup = canonical_json.dumps({
+        "checksum": checksum,
+        "payload_updated_at": format_payload_updated_at(payload_updated_at),
+    })
+    if include_payload:
+        payload = load_payload_bytes(*row[7:10])
+        if b"\n" in payload or b"\r" in payload:
+            # 줄바꿈이 들어간(들여쓰기된) 본문은 한 줄로 다시 직렬화
+            payload = canonical_json.dumps(canonical_json.loads(payload))
+        backup = backup[:-1] + b',"payload":' + payload + b"}"
+    return head[:-1] + b',"backup":' + backup + b"}\n"
+
+
+def start_export(
+    after: Optional[str] = None, include_payload: bool = True, limit: Optional[int] = None
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    export 시작 (연결과 쿼리 실행은 즉시, 행은 반환된 이터레이터를 돌 때 한 행씩 읽음)
+
+    Returns:
+        (device_uuid, NDJSON 줄) 이터레이터 (끝까지 돌거나 close()하면 연결 종료)
+
+    Raises:
+        pymysql.Error: 연결/쿼리 실패
+    """
+    conn = connect_db_unpooled()
+    try:
+        cursor = conn.cursor(pymysql.cursors.SSCursor)
+        cursor.execute(f"SET SESSION net_write_timeout = {BACKUP_EXPORT_NET_WRITE_TIMEOUT:d}")
+        payload_columns = ", b.payload_codec, b.payload_json, b.payload_blob" if include_payload else ""
+        cursor.execute(
+            f"""
+            SELECT d.device_uuid, d.email, d.email_verified_at, d.created_at, d.updated_at,
+                   b.checksum, b.payload_updated_at{payload_columns}
+            FROM devices d
+            LEFT JOIN backups b ON b.device_uuid = d.device_uuid
+            WHERE d.device_uuid > %s
+            ORDER BY d.device_uuid
+            {"LIMIT %s" if limit else ""}
+            """,
+            (after or "", limit) if limit else (after or "",),
+        )
+    except Exception:
+        conn.close()
+        raise
+    return _iter_rows(conn, cursor, include_payload)
+
+
+def _iter_rows(conn, cursor, include_payload: bool) -> Iterator[Tuple[str, bytes]]:
+    try:
+        for row in cursor:
+            yield row[0], _export_line(row, include_payload)
+    finally:
+        # 남은 행을 읽지 않고 바로 종료 (중간에 끊긴 export)
+        conn.close()
+
+
+def encode_export(lines: Iterable[Tuple[str, bytes]], codec: str = "identity") -> Iterator[bytes]:
+    """NDJSON 줄 → (압축된) 바이트 조각"""
+    encoder = StreamEncoder(codec)
+    for _, line in lines:
+        chunk = encoder.compress(line)
+        if chunk:
+            yield chunk
+    tail = encoder.flush()
+    if tail:
+        yield tail
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", help="출력 파일 (생략 시 표준 출력)")
+    parser.add_argument("--append", action="store_true", help="출력 파일 뒤에 이어 쓰기 (--after와 함께 이어받기)")
+    parser.add_argument("--after", help="이 device_uuid 다음 기기부터")
+    parser.add_argument("--limit", type=int, help="최대 기기 수")
+    parser.add_argument("--no-payload", action="store_true", help="payload 제외 (기기/백업 메타데이터만)")
+    parser.add_argument("--compression", default="identity", help="identity / gzip / zstd")
+    args = parser.parse_args()
+
+    # gzip 멤버/zstd 프레임은 이어 붙여도 유효하므로 --append로 같은 파일에 이어 쓸 수 있음
+    encoder = StreamEncoder(args.compression)
+    out = open(args.out, "ab" if args.append else "wb") if args.out else sys.stdout.buffer
+    started = time.monotonic()
+    rows = 0
+    written = 0
+    last_device_uuid = args.after
+    try:
+        for device_uuid, line in start_export(args.after, not args.no_payload, args.limit):
+            chunk = encoder.compress(line)
+            out.write(chunk)
+            written += len(chunk)
+            rows += 1
+            last_device_uuid = device_uuid
+        tail = encoder.flush()
+        out.write(tail)
+        written += len(tail)
+    except BaseException:
+        # 압축 스트림을 닫아 지금까지 쓴 줄은 읽을 수 있게 함
+        out.write(encoder.flush())
+        print(f"export interrupted after {rows} devices, resume with: --append --after {last_device_uuid}", file=sys.stderr)
+        raise
+    finally:
+        if args.out:
+            out.close()
+    elapsed = time.monotonic() - started
+    print(f"exported {rows} devices, {written} bytes in {elapsed:.1f}s (last device_uuid: {last_device_uuid})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
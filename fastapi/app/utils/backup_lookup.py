@@ -0,0 +1,194 @@
+"""
+기기/백업 메타데이터 조회 (lookup_cache 경유)
+- device:{device_uuid} → 이메일 인증 정보
+- backup_meta:{device_uuid} → 기기 백업의 checksum, payload_updated_at
+- email_latest:{email} → 이메일로 인증된 기기들의 백업 중 최신 1건
+- 캐시 miss 시에만 커넥션을 빌려 조회 (DB 스레드에서 호출)
+- 백업 업로드/이메일 인증 후 invalidate_* 호출
+- 이메일별 최신 백업은 email_latest_backups 포인터 테이블(PK = email)에서 읽음
+  → 업로드/인증 트랜잭션에서 update_email_latest / refresh_email_latest로 유지
+"""
+
+from typing import Optional
+
+from app.database.connection import connect_db
+from app.utils.backup_storage import format_payload_updated_at
+from app.utils.lookup_cache import lookup_cache
+
+
+def _query_one(sql: str, args: tuple):
+    conn = connect_db()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql, args)
+        return cursor.fetchone()
+    finally:
+        conn.close()
+
+
+def get_device(device_uuid: str) -> Optional[dict]:
+    """
+    기기 이메일 인증 정보
+
+    Returns:
+        {"email", "email_verified_at"} (등록되지 않은 기기면 None)
+    """
+    def load():
+        row = _query_one(
+            "SELECT email, email_verified_at FROM devices WHERE device_uuid = %s",
+            (device_uuid,),
+        )
+        if not row:
+            return None
+        return {"email": row[0], "email_verified_at": format_payload_updated_at(row[1])}
+
+    return lookup_cache.get_or_load(f"device:{device_uuid}", load)
+
+
+def get_backup_meta(device_uuid: str) -> Optional[dict]:
+    """
+    기기 백업 메타데이터 (payload 제외)
+
+    Returns:
+        {"checksum", "payload_updated_at"} (백업이 없으면 None)
+    """
+    def load():
+        row = _query_one(
+            "SELECT checksum, payload_updated_at FROM backups WHERE device_uuid = %s",
+            (device_uuid,),
+        )
+        if not row:
+            return None
+        return {"checksum": row[0], "payload_updated_at": format_payload_updated_at(row[1])}
+
+    return lookup_cache.get_or_load(f"backup_meta:{device_uuid}", load)
+
+
+def get_email_latest_backup(email: str) -> Optional[dict]:
+    """
+    이메일로 인증된 기기들의 백업 중 최신 1건 메타데이터
+
+    Returns:
+        {"device_uuid", "checksum", "payload_updated_at"} (백업이 없으면 None)
+    """
+    def load():
+        conn = connect_db()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT device_uuid, checksum, payload_updated_at FROM email_latest_backups WHERE email = %s",
+                (email,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                # 포인터가 아직 없는 이메일 (백필 이전 등) → 인덱스로 직접 계산
+                row = _latest_backup_for_email(cursor, email)
+        finally:
+            conn.close()
+        if not row or row[0] is None:
+            return None
+        return {"device_uuid": row[0], "checksum": row[1], "payload_updated_at": format_payload_updated_at(row[2])}
+
+    return lookup_cache.get_or_load(f"email_latest:{email}", load)
+
+
+def _latest_backup_for_email(cursor, email: str, locking: bool = False):
+    """
+    이메일로 인증된 기기들의 백업 중 최신 1건 (devices(email, email_verified_at) 인덱스 사용)
+    - locking=True: 트랜잭션 스냅샷이 아닌 최신 커밋 기준으로 읽음 (포인터 재계산용)
+    """
+    cursor.execute(
+        f"""
+        SELECT b.device_uuid, b.checksum, b.payload_updated_at
+        FROM devices d
+        JOIN backups b ON b.device_uuid = d.device_uuid
+        WHERE d.email = %s AND d.email_verified_at IS NOT NULL
+        ORDER BY b.payload_updated_at DESC
+        LIMIT 1
+        {"FOR SHARE" if locking else ""}
+        """,
+        (email,),
+    )
+    return cursor.fetchone()
+
+
+def _to_datetime_str(value) -> str:
+    """DATETIME 비교용 문자열 (YYYY-MM-DD HH:MM:SS)"""
+    return value.strftime("%Y-%m-%d %H:%M:%S") if hasattr(value, "strftime") else str(value)
+
+
+def update_email_latest(cursor, email: str, device_uuid: str, checksum: str, payload_updated_at: str):
+    """
+    기기 백업 기록 후 이메일 포인터 갱신 (업로드 트랜잭션 안에서 호출)
+    - 포인터 행을 잠가 같은 이메일의 동시 업로드를 직렬화
+    - 더 최신이면 이 기기로 교체, 포인터 기기 자신의 시각이 뒤로 가면 다시 계산
+    """
+    cursor.execute(
+        "SELECT device_uuid, payload_updated_at FROM email_latest_backups WHERE email = %s FOR UPDATE",
+        (email,),
+    )
+    row = cursor.fetchone()
+    if row is None:
+        refresh_email_latest(cursor, email)
+        return
+
+    current_device, current_updated_at = row
+    is_newer = current_updated_at is None or payload_updated_at >= _to_datetime_str(current_updated_at)
+    if current_device == device_uuid and not is_newer:
+        refresh_email_latest(cursor, email)
+        return
+    if current_device is None or current_device == device_uuid or is_newer:
+        cursor.execute(
+            """
+            UPDATE email_latest_backups
+            SET device_uuid = %s, checksum = %s, payload_updated_at = %s
+            WHERE email = %s
+            """,
+            (device_uuid, checksum, payload_updated_at, email),
+        )
+
+
+def refresh_email_latest(cursor, email: str):
+    """
+    이메일 포인터를 backups에서 다시 계산 (이메일 인증 변경, 포인터 없음 등)
+    - 인증된 기기가 없으면 포인터 삭제, 인증됐지만 백업이 없으면 NULL 포인터
+    """
+    cursor.execute("SELECT email FROM email_latest_backups WHERE email = %s FOR UPDATE", (email,))
+    cursor.fetchall()
+    cursor.execute(
+        "SELECT 1 FROM devices WHERE email = %s AND email_verified_at IS NOT NULL LIMIT 1 FOR SHARE",
+        (email,),
+    )
+    if cursor.fetchone() is None:
+        cursor.execute("DELETE FROM email_latest_backups WHERE email = %s", (email,))
+        return
+
+    row = _latest_backup_for_email(cursor, email, locking=True) or (None, None, None)
+    cursor.execute(
+        """
+        INSERT INTO email_latest_backups (email, device_uuid, checksum, payload_updated_at)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            device_uuid = VALUES(device_uuid),
+            checksum = VALUES(checksum),
+            payload_updated_at = VALUES(payload_updated_at)
+        """,
+        (email, row[0], row[1], row[2]),
+    )
+
+
+def invalidate_backup(device_uuid: str, verified_email: Optional[str] = None):
+    """기기 백업이 바뀐 뒤 호출 (커밋 후)"""
+    lookup_cache.invalidate(
+        f"device:{device_uuid}",
+        f"backup_meta:{device_uuid}",
+        f"email_latest:{verified_email}" if verified_email else None,
+    )
+
+
+def invalidate_device(device_uuid: str, *emails: Optional[str]):
+    """기기 이메일 인증 정보가 바뀐 뒤 호출 (커밋 후, 이전/새 이메일 모두 전달)"""
+    lookup_cache.invalidate(
+        f"device:{device_uuid}",
+        *[f"email_latest:{email}" for email in emails if email],
+    )
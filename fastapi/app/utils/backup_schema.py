@@ -0,0 +1,146 @@
+"""
+백업 스냅샷 스키마 (schema_version 1)
+Flutter BackupService.buildPayload()와 각 모델의 toMap() 구조
+- 요청 본문 바이트를 TypeAdapter.validate_json으로 바로 검증
+  (파싱과 검증을 한 번에, 결과는 바로 dict → json.loads 후 재검증/모델 인스턴스 생성 없음)
+- strict: 문자열 숫자("1"), 실수(1.0), true/false를 정수 자리에 허용하지 않음
+- extra="forbid": 정의되지 않은 키가 있으면 거부
+"""
+
+from typing import Annotated, Any, Dict, List, Literal, Optional
+
+from pydantic import ConfigDict, Field, TypeAdapter, ValidationError, with_config
+from typing_extensions import NotRequired, TypedDict
+
+# 0/1 플래그 (SQLite INTEGER)
+Flag = Annotated[int, Field(ge=0, le=1)]
+# YYYY-MM-DD
+DateStr = Annotated[str, Field(pattern=r"^\d{4}-\d{2}-\d{2}$")]
+RowId = Annotated[str, Field(min_length=1, max_length=64)]
+
+# 응답에 포함할 검증 오류 최대 개수 (손상된 큰 스냅샷의 오류 응답 크기 제한)
+MAX_REPORTED_ERRORS = 20
+
+_STRICT = ConfigDict(strict=True, extra="forbid")
+
+
+@with_config(_STRICT)
+class CategoryRow(TypedDict):
+    id: RowId
+    name: str
+    color_value: int
+    sort_order: int
+
+
+@with_config(_STRICT)
+class HabitRow(TypedDict):
+    id: RowId
+    title: str
+    daily_target: Annotated[int, Field(ge=1)]
+    sort_order: int
+    category_id: Optional[str]
+    deadline_reminder_time: Optional[str]
+    is_active: Flag
+    is_deleted: Flag
+    is_dirty: Flag
+    created_at: str
+    updated_at: str
+
+
+@with_config(_STRICT)
+class LogRow(TypedDict):
+    id: RowId
+    habit_id: RowId
+    date: DateStr
+    count: Annotated[int, Field(ge=0)]
+    is_completed: Flag
+    is_deleted: Flag
+    is_dirty: Flag
+    created_at: str
+    updated_at: str
+
+
+@with_config(_STRICT)
+class HeatmapSnapshotRow(TypedDict):
+    date: DateStr
+    achieved: Annotated[int, Field(ge=0)]
+    total: Annotated[int, Field(ge=0)]
+    level: Annotated[int, Field(ge=0, le=4)]
+
+
+@with_config(_STRICT)
+class SnapshotV1(TypedDict):
+    schema_version: Literal[1]
+    device_uuid: Annotated[str, Field(min_length=1, max_length=36)]
+    exported_at: str
+    settings: NotRequired[Optional[Dict[str, Any]]]
+    categories: List[CategoryRow]
+    habits: List[HabitRow]
+    logs: List[LogRow]
+    heatmap_snapshots: NotRequired[List[HeatmapSnapshotRow]]  # 생략 시 서버가 habits/logs로 계산
+
+
+_SNAPSHOT_ADAPTER = TypeAdapter(SnapshotV1)
+
+# 섹션 이름 → 행 검증기 (delta upsert 행 검증용)
+SECTION_ROW_ADAPTERS = {
+    "categories": TypeAdapter(CategoryRow),
+    "habits": TypeAdapter(HabitRow),
+    "logs": TypeAdapter(LogRow),
+    "heatmap_snapshots": TypeAdapter(HeatmapSnapshotRow),
+}
+
+
+class SnapshotError(ValueError):
+    """
+    스냅샷 검증 실패
+    - invalid_json: JSON 형식 자체가 잘못됨 (400)
+    - errors: 필드별 오류 목록 (422, 최대 MAX_REPORTED_ERRORS개)
+    """
+
+    def __init__(self, errors: List[dict], invalid_json: bool = False):
+        super().__init__("invalid JSON body" if invalid_json else "invalid backup snapshot")
+        self.errors = errors
+        self.invalid_json = invalid_json
+
+
+def _error_list(e: ValidationError) -> List[dict]:
+    return [
+        {"loc": list(err["loc"]), "type": err["type"], "msg": err["msg"]}
+        for err in e.errors(include_url=False, include_input=False)[:MAX_REPORTED_ERRORS]
+    ]
+
+
+def parse_snapshot(body: bytes) -> dict:
+    """
+    요청 본문 바이트 → 검증된 스냅샷 dict
+    - 반환 dict는 본문을 json.loads한 것과 같은 내용 → checksum이 기존 계산 방식과 같음
+
+    Raises:
+        SnapshotError: JSON 형식 오류, 스키마 불일치
+    """
+    try:
+        return _SNAPSHOT_ADAPTER.validate_json(body)
+    except ValidationError as e:
+        errors = _error_list(e)
+        raise SnapshotError(errors, invalid_json=any(err["type"] == "json_invalid" for err in errors))
+
+
+def validate_rows(section: str, rows: List[dict]):
+    """
+    delta upsert 행 검증 (섹션 행 모델 기준)
+
+    Raises:
+        SnapshotError: 스키마 불일치 (loc는 [섹션, 행 index, 필드])
+    """
+    adapter = SECTION_ROW_ADAPTERS[section]
+    errors = []
+    for index, row in enumerate(rows):
+        try:
+            adapter.validate_python(row)
+        except ValidationError as e:
+            errors.extend(dict(err, loc=[section, index] + err["loc"]) for err in _error_list(e))
+            if len(errors) >= MAX_REPORTED_ERRORS:
+                break
+    if errors:
+        raise SnapshotError(errors[:MAX_REPORTED_ERRORS])
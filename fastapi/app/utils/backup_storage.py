@@ -0,0 +1,198 @@
+"""
+backups 테이블 payload 저장 형식 처리
+- 신규 행: payload_blob(압축 바이트) + payload_codec, payload_json은 NULL
+- 기존 행: payload_json(LONGTEXT) + payload_codec='identity'
+- checksum: exported_at을 제외한 스냅샷 내용의 SHA256 → 강한 ETag로 사용
+  (checksum이 같으면 저장 바이트도 다시 쓰지 않으므로 ETag가 같으면 바이트도 같음 → Range 이어받기 가능)
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import Response
+
+from app.utils.canonical_json import dumps_canonical
+from app.utils.payload_codec import CODEC_IDENTITY, STORAGE_CODEC, accepts_encoding, compress, decompress
+
+
+# checksum 계산에서 제외하는 키 (백업 시각만 바뀐 스냅샷은 같은 내용으로 취급)
+CHECKSUM_EXCLUDED_KEYS = ("exported_at",)
+
+
+def payload_checksum(payload: dict) -> str:
+    """
+    스냅샷 내용 checksum (SHA256 hex)
+    - 키 정렬 후 직렬화하므로 클라이언트의 키 순서와 무관
+    - exported_at 제외: 내용이 같으면 매일 백업해도 같은 checksum
+    """
+    content = {k: v for k, v in payload.items() if k not in CHECKSUM_EXCLUDED_KEYS}
+    return hashlib.sha256(dumps_canonical(content)).hexdigest()
+
+
+def make_etag(checksum: str, codec: Optional[str] = None) -> str:
+    """
+    강한 ETag
+    - 압축 바이트를 그대로 보내는 표현은 content-coding별로 구분 (예: "<checksum>-zstd")
+    """
+    if codec and codec != CODEC_IDENTITY:
+        return f'"{checksum}-{codec}"'
+    return f'"{checksum}"'
+
+
+def etag_matches(if_none_match: Optional[str], checksum: str) -> bool:
+    """
+    If-None-Match 비교 (RFC 9110 약한 비교: W/ 접두어 무시, content-coding 접미어 무시)
+    """
+    if not if_none_match or not checksum:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag == checksum or tag.split("-", 1)[0] == checksum:
+            return True
+    return False
+
+
+def not_modified_response(checksum: str) -> Response:
+    """304 Not Modified (본문 없음)"""
+    return Response(status_code=304, headers={"ETag": make_etag(checksum)})
+
+
+def envelope_response(payload_bytes: bytes, checksum: str, payload_updated_at) -> Response:
+    """
+    {payload, checksum, payload_updated_at} 응답 + ETag
+    - 저장된 payload JSON 바이트를 파싱하지 않고 그대로 끼워 넣음
+      (json.loads → jsonable_encoder → 재직렬화 생략, 큰 스냅샷의 CPU/메모리 절감)
+    """
+    body = b"".join((
+        b'{"payload":',
+        payload_bytes,
+        b',"checksum":',
+        json.dumps(checksum).encode("ascii"),
+        b',"payload_updated_at":',
+        json.dumps(format_payload_updated_at(payload_updated_at)).encode("ascii"),
+        b"}",
+    ))
+    return Response(content=body, media_type="application/json", headers={"ETag": make_etag(checksum)})
+
+
+def encode_for_storage(payload_bytes: bytes, codec: str = STORAGE_CODEC) -> Tuple[str, bytes]:
+    """
+    저장용 압축
+
+    Returns:
+        (codec, payload_blob)
+    """
+    return codec, compress(payload_bytes, codec)
+
+
+def load_payload_bytes(codec: str, payload_json: Optional[str], payload_blob: Optional[bytes]) -> bytes:
+    """저장된 행에서 원본 JSON 바이트 복원"""
+    if payload_blob is None:
+        # 압축 도입 이전 행 (LONGTEXT)
+        return (payload_json or "").encode("utf-8")
+    return decompress(bytes(payload_blob), codec or CODEC_IDENTITY)
+
+
+def format_payload_updated_at(value) -> Optional[str]:
+    """payload_updated_at을 JSON 응답과 동일한 ISO8601 문자열로"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class RangeNotSatisfiableError(ValueError):
+    """요청한 범위가 본문 크기를 벗어남 (416)"""
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range 헤더 해석 (단일 bytes 범위만 지원)
+
+    Returns:
+        (start, end) 양 끝 포함, 범위 요청이 아니거나 지원하지 않는 형식(여러 범위 등)이면 None → 전체 응답
+
+    Raises:
+        RangeNotSatisfiableError: 시작 위치가 본문 크기 이상
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.strip().partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if not sep:
+        return None
+    if not (first or last).isdigit() or (first and last and not last.isdigit()):
+        return None
+    if first == "":
+        # 마지막 N바이트 (bytes=-N)
+        suffix = int(last)
+        if suffix == 0:
+            raise RangeNotSatisfiableError(range_header)
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiableError(range_header)
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def raw_payload_response(
+    codec: str,
+    payload_json: Optional[str],
+    payload_blob: Optional[bytes],
+    checksum: str,
+    payload_updated_at,
+    accept_encoding: Optional[str],
+    range_header: Optional[str] = None,
+    if_range: Optional[str] = None,
+) -> Response:
+    """
+    payload JSON 자체를 본문으로 반환 (envelope 없음)
+    - 클라이언트가 저장 코덱을 Accept-Encoding으로 허용하면 압축 바이트를 그대로 전송
+      (압축 해제 → 재압축 없음)
+    - checksum, payload_updated_at은 헤더로 전달
+    - Range: 저장 바이트의 일부만 206으로 전송 (끊긴 다운로드 이어받기)
+      압축 전송이면 범위는 압축 바이트 기준, If-Range가 현재 ETag와 다르면 전체 전송
+    """
+    headers = {
+        "ETag": make_etag(checksum),
+        "X-Backup-Checksum": checksum,
+        "Vary": "Accept-Encoding",
+        "Accept-Ranges": "bytes",
+    }
+    updated_at = format_payload_updated_at(payload_updated_at)
+    if updated_at:
+        headers["X-Payload-Updated-At"] = updated_at
+
+    if payload_blob is not None and codec != CODEC_IDENTITY and accepts_encoding(accept_encoding or "", codec):
+        headers["Content-Encoding"] = codec
+        headers["ETag"] = make_etag(checksum, codec)
+        body = bytes(payload_blob)
+    else:
+        body = load_payload_bytes(codec, payload_json, payload_blob)
+
+    if range_header and (not if_range or if_range.strip() == headers["ETag"]):
+        try:
+            byte_range = parse_byte_range(range_header, len(body))
+        except RangeNotSatisfiableError:
+            headers["Content-Range"] = f"bytes */{len(body)}"
+            return Response(status_code=416, headers=headers)
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            return Response(
+                content=body[start:end + 1], status_code=206, media_type="application/json", headers=headers
+            )
+    return Response(content=body, media_type="application/json", headers=headers)
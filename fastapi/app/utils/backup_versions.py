@@ -0,0 +1,178 @@
+"""
+백업 버전 이력 (device당 최근 N개)
+- 버전 = 청크 해시 목록(manifest), 청크 본문은 backup_chunks에 해시 기준으로 한 번만 저장
+- 연속된 버전은 대부분의 청크를 공유 → 저장 용량은 버전 수가 아니라 변경량에 비례
+- 모든 함수는 호출 측 트랜잭션의 cursor 사용 (commit은 호출 측)
+"""
+
+import os
+from typing import List, Optional
+
+from app.utils.backup_chunks import assemble_snapshot, chunk_hash, split_snapshot
+from app.utils.backup_storage import encode_for_storage, format_payload_updated_at, load_payload_bytes
+
+# device당 보관할 버전 수 (0이면 이력 저장 안 함)
+BACKUP_VERSION_RETENTION = int(os.getenv('BACKUP_VERSION_RETENTION', '10'))
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join(["%s"] * count)
+
+
+def store_version(cursor, device_uuid: str, payload: dict, checksum: str, payload_updated_at: str) -> Optional[int]:
+    """
+    스냅샷을 새 버전으로 저장 + 보관 개수를 넘는 오래된 버전 정리
+
+    Returns:
+        새 version_id (이력 비활성화 시 None)
+    """
+    if BACKUP_VERSION_RETENTION <= 0:
+        return None
+
+    entries = [(label, data, chunk_hash(data)) for label, data in split_snapshot(payload)]
+    hashes = list({h for _, _, h in entries})
+
+    # 이미 있는 청크는 공유 잠금 → 동시에 실행되는 GC가 지우지 못함
+    cursor.execute(
+        f"SELECT chunk_hash FROM backup_chunks WHERE chunk_hash IN ({_placeholders(len(hashes))}) FOR SHARE",
+        hashes,
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+
+    new_chunks = {}
+    for _, data, h in entries:
+        if h not in existing and h not in new_chunks:
+            codec, blob = encode_for_storage(data)
+            new_chunks[h] = (h, codec, blob, len(data))
+    if new_chunks:
+        cursor.executemany(
+            """
+            INSERT IGNORE INTO backup_chunks (chunk_hash, chunk_codec, chunk_blob, raw_size)
+            VALUES (%s, %s, %s, %s)
+            """,
+            list(new_chunks.values()),
+        )
+
+    cursor.execute(
+        """
+        INSERT INTO backup_versions (device_uuid, checksum, payload_updated_at, raw_size, stored_size)
+        VALUES (%s, %s, %s, %s, %s)
+        """,
+        (
+            device_uuid,
+            checksum,
+            payload_updated_at,
+            sum(len(data) for _, data, _ in entries),
+            sum(len(blob) for _, _, blob, _ in new_chunks.values()),
+        ),
+    )
+    version_id = cursor.lastrowid
+    cursor.executemany(
+        """
+        INSERT INTO backup_version_chunks (version_id, seq, section, chunk_hash)
+        VALUES (%s, %s, %s, %s)
+        """,
+        [(version_id, seq, label, h) for seq, (label, _, h) in enumerate(entries)],
+    )
+
+    _prune_versions(cursor, device_uuid)
+    return version_id
+
+
+def _prune_versions(cursor, device_uuid: str):
+    """보관 개수를 넘는 버전 삭제 후, 더 이상 참조되지 않는 청크 삭제"""
+    cursor.execute(
+        """
+        SELECT id FROM backup_versions
+        WHERE device_uuid = %s
+        ORDER BY id DESC
+        LIMIT %s, 1000
+        """,
+        (device_uuid, BACKUP_VERSION_RETENTION),
+    )
+    expired = [row[0] for row in cursor.fetchall()]
+    if not expired:
+        return
+
+    marks = _placeholders(len(expired))
+    cursor.execute(
+        f"SELECT DISTINCT chunk_hash FROM backup_version_chunks WHERE version_id IN ({marks})",
+        expired,
+    )
+    candidates = [row[0] for row in cursor.fetchall()]
+    cursor.execute(f"DELETE FROM backup_version_chunks WHERE version_id IN ({marks})", expired)
+    cursor.execute(f"DELETE FROM backup_versions WHERE id IN ({marks})", expired)
+    if candidates:
+        cursor.execute(
+            f"""
+            DELETE FROM backup_chunks
+            WHERE chunk_hash IN ({_placeholders(len(candidates))})
+              AND NOT EXISTS (
+                SELECT 1 FROM backup_version_chunks vc
+                WHERE vc.chunk_hash = backup_chunks.chunk_hash
+              )
+            """,
+            candidates,
+        )
+
+
+def list_versions(cursor, device_uuid: str) -> List[dict]:
+    """device의 버전 목록 (최신순)"""
+    cursor.execute(
+        """
+        SELECT id, checksum, payload_updated_at, raw_size, stored_size, created_at
+        FROM backup_versions
+        WHERE device_uuid = %s
+        ORDER BY id DESC
+        """,
+        (device_uuid,),
+    )
+    return [
+        {
+            "version_id": version_id,
+            "checksum": checksum,
+            "payload_updated_at": format_payload_updated_at(payload_updated_at),
+            "raw_size": raw_size,
+            "stored_size": stored_size,  # 이 버전에서 새로 저장된 청크 크기 (압축 후)
+            "created_at": format_payload_updated_at(created_at),
+        }
+        for version_id, checksum, payload_updated_at, raw_size, stored_size, created_at in cursor.fetchall()
+    ]
+
+
+def load_version(cursor, device_uuid: str, version_id: int) -> Optional[dict]:
+    """
+    버전 하나를 청크에서 조립
+
+    Returns:
+        {"payload", "checksum", "payload_updated_at"} (없으면 None)
+    """
+    cursor.execute(
+        """
+        SELECT checksum, payload_updated_at
+        FROM backup_versions
+        WHERE id = %s AND device_uuid = %s
+        """,
+        (version_id, device_uuid),
+    )
+    row = cursor.fetchone()
+    if not row:
+        return None
+    checksum, payload_updated_at = row
+
+    cursor.execute(
+        """
+        SELECT vc.section, c.chunk_codec, c.chunk_blob
+        FROM backup_version_chunks vc
+        JOIN backup_chunks c ON c.chunk_hash = vc.chunk_hash
+        WHERE vc.version_id = %s
+        ORDER BY vc.seq
+        """,
+        (version_id,),
+    )
+    entries = [(section, load_payload_bytes(codec, None, blob)) for section, codec, blob in cursor.fetchall()]
+    return {
+        "payload": assemble_snapshot(entries),
+        "checksum": checksum,
+        "payload_updated_at": payload_updated_at,
+    }
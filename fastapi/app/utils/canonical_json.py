@@ -0,0 +1,42 @@
+"""
+JSON 직렬화 유틸리티
+- orjson이 설치되어 있으면 사용, 없으면 표준 json으로 같은 형식 출력
+  (지수 표기 실수만 1e-07 / 1e-7로 다름, 스냅샷에는 실수 필드 없음)
+- dumps_canonical: 키 정렬 + 공백 없는 직렬화 (checksum 계산용, 클라이언트 키 순서와 무관)
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+def loads(data):
+    """
+    JSON 파싱 (bytes / str)
+
+    Raises:
+        ValueError: JSON 형식 오류
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """UTF-8 JSON 바이트 (키 순서 유지)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_canonical(obj) -> bytes:
+    """키 정렬 UTF-8 JSON 바이트 (같은 내용이면 항상 같은 바이트)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
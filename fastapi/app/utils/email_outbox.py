@@ -0,0 +1,388 @@
+"""
+이메일 발송 대기열 (outbox)
+요청 처리 중 SMTP로 직접 보내지 않고 email_outbox 테이블에 저장만 한 뒤 바로 응답
+→ 백그라운드 발송기가 꺼내 SMTP 커넥션 풀(smtp_pool)로 발송
+- 저장은 호출 쪽 트랜잭션 안에서 (인증 코드 저장과 발송 요청이 함께 커밋/롤백)
+- 꺼낼 때 임대(locked_until)를 걸어 여러 워커 프로세스가 같은 메일을 중복 발송하지 않음
+  (발송 중 프로세스가 죽으면 임대 만료 후 다른 발송기가 다시 시도)
+- 실패 시 지수 백오프로 재시도, 서버가 5xx로 거절하거나 시도 초과/만료 시 failed
+- 발송 성공 행은 삭제, failed 행은 params(인증 코드)를 지움
+"""
+
+import asyncio
+import json
+import os
+import random
+import secrets
+import smtplib
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.database.connection import connect_db
+from app.database.executor import run_db
+from app.utils.email_service import EmailService
+
+# 동시에 발송하는 메일 수 (SMTP_POOL_SIZE와 맞춤)
+EMAIL_OUTBOX_CONCURRENCY = int(os.getenv('EMAIL_OUTBOX_CONCURRENCY', os.getenv('SMTP_POOL_SIZE', '2')))
+# 알림이 없을 때 대기열을 다시 확인하는 간격 (다른 프로세스가 넣은 메일, 재시도 시각 도래)
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv('EMAIL_OUTBOX_POLL_SECONDS', '5'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = float(os.getenv('EMAIL_OUTBOX_RETRY_BASE_SECONDS', '2'))
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = float(os.getenv('EMAIL_OUTBOX_RETRY_MAX_SECONDS', '60'))
+# 발송기가 꺼낸 메일을 다른 발송기가 가져가지 못하는 시간 (SMTP 타임아웃보다 충분히 길게)
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_LEASE_SECONDS', '120'))
+
+KIND_VERIFICATION_CODE = "verification_code"
+
+STATUS_PENDING = "pending"
+STATUS_FAILED = "failed"
+
+
+def _utc_str(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%d %H:%M:%S.%f")[:23]
+
+
+def enqueue_email(
+    cursor, kind: str, to_email: str, params: dict, expires_at: datetime, dedupe_key: Optional[str] = None
+) -> None:
+    """
+    발송 요청 저장 (호출 쪽 트랜잭션에서 실행, 커밋 후 email_outbox.notify() 호출)
+
+    Args:
+        kind: 메일 종류 (KIND_VERIFICATION_CODE)
+        params: 메시지 생성 인자 (JSON 저장)
+        expires_at: 이 시각(UTC)이 지나면 보내지 않음 (인증 코드 만료 등)
+        dedupe_key: 같은 키의 아직 보내지 않은 메일은 새 메일로 대체 (예: 코드 재요청 시 이전 코드 메일)
+    """
+    if dedupe_key:
+        cursor.execute(
+            "DELETE FROM email_outbox WHERE dedupe_key = %s AND status = %s",
+            (dedupe_key, STATUS_PENDING),
+        )
+    now = _utc_str(datetime.utcnow())
+    cursor.execute(
+        """
+        INSERT INTO email_outbox (kind, to_email, params, dedupe_key, status, next_attempt_at, expires_at, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """,
+        (kind, to_email, json.dumps(params), dedupe_key, STATUS_PENDING, now, _utc_str(expires_at), now),
+    )
+
+
+def _send_outbox_message(kind: str, to_email: str, params: dict):
+    """outbox 행 → 메시지 생성 후 발송 (블로킹)"""
+    if kind == KIND_VERIFICATION_CODE:
+        EmailService.deliver(EmailService.build_verification_code_message(to_email, **params))
+        return
+    raise ValueError(f"unknown email kind: {kind}")
+
+
+def _is_permanent(e: Exception) -> bool:
+    """재시도해도 소용없는 실패 (수신자 거절, 5xx 응답, 알 수 없는 종류)"""
+    if isinstance(e, smtplib.SMTPRecipientsRefused) or isinstance(e, ValueError):
+        return True
+    return isinstance(e, smtplib.SMTPResponseException) and 500 <= e.smtp_code < 600
+
+
+def _claim_outbox_db(limit: int, lease_seconds: int) -> list:
+    """
+    보낼 메일을 꺼내 임대 (DB 스레드에서 실행)
+
+    Returns:
+        [(id, claim_token, kind, to_email, params, attempts, expires_at, created_at)]
+    """
+    now = datetime.utcnow()
+    now_str = _utc_str(now)
+    token = secrets.token_hex(16)
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id FROM email_outbox
+            WHERE status = %s AND next_attempt_at <= %s AND (locked_until IS NULL OR locked_until < %s)
+            ORDER BY next_attempt_at
+            LIMIT %s
+            """,
+            (STATUS_PENDING, now_str, now_str, limit),
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return []
+        marks = ", ".join(["%s"] * len(ids))
+        # 조건부 UPDATE: 그 사이 다른 발송기가 임대한 행은 제외됨
+        cursor.execute(
+            f"""
+            UPDATE email_outbox
+            SET locked_until = %s, claim_token = %s, attempts = attempts + 1
+            WHERE id IN ({marks}) AND status = %s AND (locked_until IS NULL OR locked_until < %s)
+            """,
+            (_utc_str(now + timedelta(seconds=lease_seconds)), token, *ids, STATUS_PENDING, now_str),
+        )
+        conn.commit()
+        cursor.execute(
+            f"""
+            SELECT id, claim_token, kind, to_email, params, attempts, expires_at, created_at
+            FROM email_outbox
+            WHERE id IN ({marks}) AND claim_token = %s
+            """,
+            (*ids, token),
+        )
+        return list(cursor.fetchall())
+    except Exception:
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+
+def _finish_outbox_db(outbox_id: int, token: str, retry_at: Optional[datetime], error: Optional[str]) -> None:
+    """
+    발송 결과 기록 (DB 스레드에서 실행)
+    - error 없음: 행 삭제
+    - retry_at 있음: 그 시각에 재시도
+    - retry_at 없음: failed (params 삭제)
+    - 임대가 만료돼 다른 발송기가 가져간 행(claim_token 불일치)은 건드리지 않음
+    """
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        if error is None:
+            cursor.execute("DELETE FROM email_outbox WHERE id = %s AND claim_token = %s", (outbox_id, token))
+        elif retry_at is not None:
+            cursor.execute(
+                """
+                UPDATE email_outbox
+                SET next_attempt_at = %s, locked_until = NULL, claim_token = NULL, last_error = %s
+                WHERE id = %s AND claim_token = %s
+                """,
+                (_utc_str(retry_at), error[:255], outbox_id, token),
+            )
+        else:
+            cursor.execute(
+                """
+                UPDATE email_outbox
+                SET status = %s, params = NULL, locked_until = NULL, claim_token = NULL, last_error = %s
+                WHERE id = %s AND claim_token = %s
+                """,
+                (STATUS_FAILED, error[:255], outbox_id, token),
+            )
+        conn.commit()
+    except Exception:
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+
+def _count_pending_db() -> int:
+    """발송 대기 중인 메일 수 (재시도 대기 포함)"""
+    conn = None
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM email_outbox WHERE status = %s", (STATUS_PENDING,))
+        return int(cursor.fetchone()[0])
+    finally:
+        if conn:
+            conn.close()
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return round(ordered[min(int(len(ordered) * q), len(ordered) - 1)], 3)
+
+
+class EmailOutbox:
+    """
+    outbox 발송기 (앱 수명 주기에서 start/stop)
+
+    Args:
+        send_fn: 블로킹 발송 함수 (kind, to_email, params)
+        concurrency: 한 번에 꺼내 동시에 보내는 메일 수
+        poll_interval: 알림 없이 대기열을 다시 확인하는 간격 (초)
+        max_attempts: 최대 시도 횟수
+        retry_base, retry_max: 재시도 대기 (retry_base * 2^(시도-1), 최대 retry_max, 50~100% 지터)
+        lease_seconds: 꺼낸 메일 임대 시간
+    """
+
+    def __init__(
+        self,
+        send_fn: Callable,
+        concurrency: int,
+        poll_interval: float,
+        max_attempts: int,
+        retry_base: float,
+        retry_max: float,
+        lease_seconds: int,
+    ):
+        self.send_fn = send_fn
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease_seconds = lease_seconds
+
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closing = False
+
+        self._enqueued = 0
+        self._sent = 0
+        self._retried = 0
+        self._failed = 0
+        self._expired = 0
+        self._claim_errors = 0
+        self._pending: Optional[int] = None
+        self._pending_checked_at = 0.0
+        self._last_error: Optional[str] = None
+        self._send_ms = deque(maxlen=200)  # 최근 SMTP 발송 시간
+        self._queue_delay_ms = deque(maxlen=200)  # 최근 저장 → 발송 완료 시간
+
+    def start(self):
+        """발송 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._runner is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._runner = asyncio.create_task(self._run())
+
+    def notify(self):
+        """새 메일 저장(커밋) 후 호출 - 다음 확인 주기를 기다리지 않고 바로 발송"""
+        self._enqueued += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self):
+        """앱 종료 시 보내는 중인 메일을 마친 뒤 종료 (남은 메일은 DB에 남아 다음 기동 시 발송)"""
+        if self._runner is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._runner
+        self._runner = None
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                rows = await run_db(_claim_outbox_db, self.concurrency, self.lease_seconds)
+            except Exception as e:
+                self._claim_errors += 1
+                self._last_error = str(e)
+                rows = []
+            if rows:
+                await asyncio.gather(*(self._deliver(row) for row in rows))
+                if len(rows) == self.concurrency:
+                    continue
+
+            await self._refresh_pending()
+            if self._closing:
+                break
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _refresh_pending(self):
+        """대기열 길이 갱신 (확인 주기당 최대 1회)"""
+        if time.monotonic() - self._pending_checked_at < self.poll_interval:
+            return
+        self._pending_checked_at = time.monotonic()
+        try:
+            self._pending = await run_db(_count_pending_db)
+        except Exception:
+            pass
+
+    def _retry_delay(self, attempts: int) -> float:
+        delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _deliver(self, row: tuple):
+        outbox_id, token, kind, to_email, params, attempts, expires_at, created_at = row
+        now = datetime.utcnow()
+        if expires_at is not None and now >= expires_at:
+            self._expired += 1
+            await self._finish(outbox_id, token, None, "expired before delivery")
+            return
+
+        started = time.monotonic()
+        try:
+            await run_in_threadpool(self.send_fn, kind, to_email, json.loads(params or "{}"))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            self._last_error = error
+            retry_at = None
+            if not _is_permanent(e) and attempts < self.max_attempts:
+                retry_at = datetime.utcnow() + timedelta(seconds=self._retry_delay(attempts))
+                if expires_at is not None and retry_at >= expires_at:
+                    retry_at = None
+            if retry_at is None:
+                self._failed += 1
+            else:
+                self._retried += 1
+            await self._finish(outbox_id, token, retry_at, error)
+            return
+
+        self._sent += 1
+        self._send_ms.append((time.monotonic() - started) * 1000)
+        if created_at is not None:
+            self._queue_delay_ms.append((datetime.utcnow() - created_at).total_seconds() * 1000)
+        await self._finish(outbox_id, token, None, None)
+
+    async def _finish(self, outbox_id: int, token: str, retry_at: Optional[datetime], error: Optional[str]):
+        try:
+            await run_db(_finish_outbox_db, outbox_id, token, retry_at, error)
+        except Exception as e:
+            # 기록 실패: 임대 만료 후 다시 꺼내짐 (성공한 메일이면 중복 발송될 수 있음)
+            self._last_error = str(e)
+
+    def stats(self) -> dict:
+        """대기열 길이 및 발송 지표"""
+        send_ms = list(self._send_ms)
+        queue_delay_ms = list(self._queue_delay_ms)
+        return {
+            "running": self._runner is not None,
+            "concurrency": self.concurrency,
+            "pending": self._pending,
+            "enqueued": self._enqueued,
+            "sent": self._sent,
+            "retried": self._retried,
+            "failed": self._failed,
+            "expired": self._expired,
+            "claim_errors": self._claim_errors,
+            "last_error": self._last_error,
+            "avg_send_ms": round(sum(send_ms) / len(send_ms), 3) if send_ms else 0.0,
+            "p95_send_ms": _percentile(send_ms, 0.95),
+            "avg_queue_delay_ms": round(sum(queue_delay_ms) / len(queue_delay_ms), 3) if queue_delay_ms else 0.0,
+            "p95_queue_delay_ms": _percentile(queue_delay_ms, 0.95),
+        }
+
+
+email_outbox = EmailOutbox(
+    _send_outbox_message,
+    concurrency=EMAIL_OUTBOX_CONCURRENCY,
+    poll_interval=EMAIL_OUTBOX_POLL_SECONDS,
+    max_attempts=EMAIL_OUTBOX_MAX_ATTEMPTS,
+    retry_base=EMAIL_OUTBOX_RETRY_BASE_SECONDS,
+    retry_max=EMAIL_OUTBOX_RETRY_MAX_SECONDS,
+    lease_seconds=EMAIL_OUTBOX_LEASE_SECONDS,
+)
+
+
+def get_email_outbox_stats() -> dict:
+    """outbox 통계 (헬스 체크용)"""
+    return email_outbox.stats()
@@ -5,12 +5,13 @@
 작성자: 김택권
 """
 
-import smtplib
 import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
 
+from app.utils.smtp_pool import SMTPConnectionPool
+
 
 class EmailService:
     """이메일 발송 서비스 클래스"""
@@ -21,6 +22,11 @@ class EmailService:
     SMTP_USER = os.getenv('SMTP_USER', '')  # 발신자 이메일
     SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', '')  # 발신자 비밀번호 또는 앱 비밀번호
     FROM_NAME = os.getenv('FROM_NAME', 'HabitCell')
+    # SMTP 커넥션 풀 설정
+    SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', '2'))  # 동시에 유지하는 로그인 세션 수
+    SMTP_POOL_IDLE_SECONDS = float(os.getenv('SMTP_POOL_IDLE_SECONDS', '60'))  # 이보다 오래 쉰 세션은 새로 연결
+    SMTP_POOL_MAX_MESSAGES = int(os.getenv('SMTP_POOL_MAX_MESSAGES', '100'))  # 세션당 최대 발송 수
+    SMTP_TIMEOUT = float(os.getenv('SMTP_TIMEOUT', '10'))  # 소켓 타임아웃 (초)
     
     @classmethod
     def get_from_email(cls) -> str:
@@ -101,12 +107,8 @@ class EmailService:
             msg.attach(part1)
             msg.attach(part2)
             
-            # SMTP 서버 연결 및 이메일 발송
-            with smtplib.SMTP(cls.SMTP_HOST, cls.SMTP_PORT) as server:
-                server.starttls()
-                if cls.SMTP_USER and cls.SMTP_PASSWORD:
-                    server.login(cls.SMTP_USER, cls.SMTP_PASSWORD)
-                server.send_message(msg)
+            # SMTP 발송 (풀의 로그인된 연결 재사용)
+            cls.deliver(msg)
             
             return True
             
@@ -168,11 +170,7 @@ class EmailService:
             part = MIMEText(html_content, 'html', 'utf-8')
             msg.attach(part)
             
-            with smtplib.SMTP(cls.SMTP_HOST, cls.SMTP_PORT) as server:
-                server.starttls()
-                if cls.SMTP_USER and cls.SMTP_PASSWORD:
-                    server.login(cls.SMTP_USER, cls.SMTP_PASSWORD)
-                server.send_message(msg)
+            cls.deliver(msg)
             
             return True
             
@@ -183,14 +181,14 @@ class EmailService:
             return False
 
     @classmethod
-    def send_verification_code(
+    def build_verification_code_message(
         cls,
         to_email: str,
         code: str,
         expires_minutes: int = 10
-    ) -> bool:
+    ) -> MIMEMultipart:
         """
-        Habit App 복구용 6자리 인증 코드 이메일 발송
+        Habit App 복구용 6자리 인증 코드 이메일 메시지 생성
 
         Args:
             to_email: 수신자 이메일
@@ -198,55 +196,70 @@ class EmailService:
             expires_minutes: 만료 시간 (분)
 
         Returns:
-            bool: 발송 성공 여부
+            MIMEMultipart: 발송할 메시지
         """
-        try:
-            subject = '[HabitCell] 백업 복구 인증 코드'
+        subject = '[HabitCell] 백업 복구 인증 코드'
 
-            html_content = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #212121;">백업 복구 인증</h2>
-                    <p>HabitCell 백업 복구를 위한 인증 코드입니다.</p>
-                    <div style="background-color: #f5f5f5; padding: 20px; text-align: center; margin: 20px 0; border-radius: 8px;">
-                        <h1 style="color: #212121; margin: 0; font-size: 32px; letter-spacing: 5px;">{code}</h1>
-                    </div>
-                    <p>이 코드는 <strong>{expires_minutes}분</strong> 동안 유효합니다.</p>
-                    <p style="color: #757575; font-size: 12px;">본인이 요청한 것이 아니라면 이 이메일을 무시하세요.</p>
+        html_content = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2 style="color: #212121;">백업 복구 인증</h2>
+                <p>HabitCell 백업 복구를 위한 인증 코드입니다.</p>
+                <div style="background-color: #f5f5f5; padding: 20px; text-align: center; margin: 20px 0; border-radius: 8px;">
+                    <h1 style="color: #212121; margin: 0; font-size: 32px; letter-spacing: 5px;">{code}</h1>
                 </div>
-            </body>
-            </html>
-            """
+                <p>이 코드는 <strong>{expires_minutes}분</strong> 동안 유효합니다.</p>
+                <p style="color: #757575; font-size: 12px;">본인이 요청한 것이 아니라면 이 이메일을 무시하세요.</p>
+            </div>
+        </body>
+        </html>
+        """
 
-            text_content = f"""
-            백업 복구 인증
+        text_content = f"""
+        백업 복구 인증
 
-            HabitCell 백업 복구를 위한 인증 코드입니다.
+        HabitCell 백업 복구를 위한 인증 코드입니다.
 
-            인증 코드: {code}
+        인증 코드: {code}
 
-            이 코드는 {expires_minutes}분 동안 유효합니다.
+        이 코드는 {expires_minutes}분 동안 유효합니다.
 
-            본인이 요청한 것이 아니라면 이 이메일을 무시하세요.
-            """
+        본인이 요청한 것이 아니라면 이 이메일을 무시하세요.
+        """
 
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{cls.FROM_NAME} <{cls.get_from_email()}>"
-            msg['To'] = to_email
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{cls.FROM_NAME} <{cls.get_from_email()}>"
+        msg['To'] = to_email
 
-            part1 = MIMEText(text_content, 'plain', 'utf-8')
-            part2 = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(part1)
-            msg.attach(part2)
+        part1 = MIMEText(text_content, 'plain', 'utf-8')
+        part2 = MIMEText(html_content, 'html', 'utf-8')
+        msg.attach(part1)
+        msg.attach(part2)
+        return msg
 
-            with smtplib.SMTP(cls.SMTP_HOST, cls.SMTP_PORT) as server:
-                server.starttls()
-                if cls.SMTP_USER and cls.SMTP_PASSWORD:
-                    server.login(cls.SMTP_USER, cls.SMTP_PASSWORD)
-                server.send_message(msg)
+    @classmethod
+    def send_verification_code(
+        cls,
+        to_email: str,
+        code: str,
+        expires_minutes: int = 10
+    ) -> bool:
+        """
+        Habit App 복구용 6자리 인증 코드 이메일 발송
+        (복구 API는 email_outbox를 거쳐 백그라운드에서 발송, 이 메서드는 즉시 발송용)
 
+        Args:
+            to_email: 수신자 이메일
+            code: 6자리 인증 코드
+            expires_minutes: 만료 시간 (분)
+
+        Returns:
+            bool: 발송 성공 여부
+        """
+        try:
+            cls.deliver(cls.build_verification_code_message(to_email, code, expires_minutes))
             return True
 
         except Exception as e:
@@ -255,6 +268,33 @@ class EmailService:
             traceback.print_exc()
             return False
 
+    @classmethod
+    def deliver(cls, msg) -> None:
+        """
+        메시지 발송 (SMTP 커넥션 풀 경유, 블로킹)
+
+        Raises:
+            smtplib.SMTPException, OSError: 연결/발송 실패
+        """
+        smtp_pool.send(msg)
+
+
+# 로그인된 SMTP 세션 재사용 (발송마다 연결 + STARTTLS + 로그인 생략)
+smtp_pool = SMTPConnectionPool(
+    EmailService.SMTP_HOST,
+    EmailService.SMTP_PORT,
+    EmailService.SMTP_USER,
+    EmailService.SMTP_PASSWORD,
+    max_size=EmailService.SMTP_POOL_SIZE,
+    idle_seconds=EmailService.SMTP_POOL_IDLE_SECONDS,
+    max_messages=EmailService.SMTP_POOL_MAX_MESSAGES,
+    timeout=EmailService.SMTP_TIMEOUT,
+)
+
+
+def get_smtp_pool_stats() -> dict:
+    """SMTP 커넥션 풀 통계 (헬스 체크용)"""
+    return smtp_pool.stats()
 
 # ============================================================
 # 생성 이력
@@ -273,3 +313,9 @@ class EmailService:
 #   - send_password_reset_link 메서드 구현 (비밀번호 변경 링크 이메일 발송, 대안 방법)
 #   - HTML 및 텍스트 형식 이메일 지원
 #   - 에러 처리 및 로깅 구현
+#
+# 2026-10-18: SMTP 커넥션 풀 적용
+#   - 발송마다 연결/STARTTLS/로그인하던 방식을 smtp_pool(SMTPConnectionPool) 재사용으로 변경
+#   - deliver 메서드 추가 (예외를 그대로 전달, 재시도 판단용)
+#   - build_verification_code_message 분리 (email_outbox 워커가 발송 시점에 메시지 생성)
+#   - SMTP_POOL_SIZE, SMTP_POOL_IDLE_SECONDS, SMTP_POOL_MAX_MESSAGES, SMTP_TIMEOUT 환경변수
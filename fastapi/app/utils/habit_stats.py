@@ -0,0 +1,137 @@
+"""
+습관 통계 (서버 저장 스냅샷 기준)
+Flutter habit_stats_provider.dart와 같은 정책을 습관 × 날짜 배열(heatmap.build_day_matrix)로 계산
+- 기준일: 스냅샷 exported_at의 로컬 날짜, 기간: 기준일 포함 최근 STATS_DAYS + 1일
+- achieved7/30: 최근 7/30일 중 count >= daily_target인 날 수
+- streak: 어제부터 역순으로 달성이 끊길 때까지 (오늘은 아직 지나지 않아 제외)
+- 전체(overall): 그날 존재한 습관이 모두 달성한 날 기준
+- 주간/월간 곡선: 그날 존재한 습관-일 중 달성 비율
+- 결과는 스냅샷 내용에만 의존하므로 checksum을 키로 캐시 (stats_cache)
+"""
+
+import os
+from datetime import timedelta
+
+import numpy as np
+
+from app.utils.heatmap import build_day_matrix, snapshot_end_date
+from app.utils.lookup_cache import LRUCache
+
+# 통계 계산 기간 (앱 통계 화면과 같은 1년)
+STATS_DAYS = 365
+
+# checksum → 통계 결과 캐시 (같은 checksum이면 결과가 같으므로 TTL은 메모리 회수용)
+STATS_CACHE_TTL_SECONDS = float(os.getenv('STATS_CACHE_TTL_SECONDS', '3600'))
+STATS_CACHE_MAX_ENTRIES = int(os.getenv('STATS_CACHE_MAX_ENTRIES', '1000'))
+
+stats_cache = LRUCache(STATS_CACHE_TTL_SECONDS, STATS_CACHE_MAX_ENTRIES)
+
+
+def _trailing_runs(done: np.ndarray) -> np.ndarray:
+    """행별로 마지막 열부터 연속된 True 개수"""
+    reversed_done = done[:, ::-1]
+    return np.where(reversed_done.all(axis=1), done.shape[1], np.argmin(reversed_done, axis=1))
+
+
+def _longest_runs(done: np.ndarray) -> np.ndarray:
+    """행별 최장 연속 True 길이"""
+    padded = np.zeros((done.shape[0], done.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = done
+    edges = np.diff(padded, axis=1)
+    start_rows, start_cols = np.nonzero(edges == 1)
+    _, end_cols = np.nonzero(edges == -1)
+    longest = np.zeros(done.shape[0], dtype=np.int64)
+    np.maximum.at(longest, start_rows, end_cols - start_cols)
+    return longest
+
+
+def _rate(achieved, total) -> float:
+    return round(float(achieved) / float(total), 4) if total else 0.0
+
+
+def _curve(labels: np.ndarray, achieved: np.ndarray, total: np.ndarray, label_key: str) -> list:
+    """정렬된 날짜 라벨(주 시작일/월)별 합계 → [{label_key, achieved, total, rate}]"""
+    unique, bucket = np.unique(labels, return_inverse=True)
+    achieved_sum = np.bincount(bucket, weights=achieved).astype(np.int64)
+    total_sum = np.bincount(bucket, weights=total).astype(np.int64)
+    return [
+        {label_key: label, "achieved": a, "total": t, "rate": _rate(a, t)}
+        for label, a, t in zip(unique.astype(str).tolist(), achieved_sum.tolist(), total_sum.tolist())
+    ]
+
+
+def compute_habit_stats(payload: dict) -> dict:
+    """
+    스냅샷 → 통계
+
+    Returns:
+        {"as_of", "days", "overall", "habits", "weekly", "monthly"}
+
+    Raises:
+        ValueError: 날짜 형식 오류
+    """
+    as_of = snapshot_end_date(payload.get("exported_at"))
+    habits = payload.get("habits") or []
+    n_days = STATS_DAYS + 1
+    start = as_of - timedelta(days=STATS_DAYS)
+    result = {"as_of": as_of.isoformat(), "days": n_days}
+    if not habits:
+        return dict(
+            result,
+            overall={"achieved7": 0, "achieved30": 0, "streak": 0, "best_streak": 0,
+                     "completion_rate7": 0.0, "completion_rate30": 0.0},
+            habits=[], weekly=[], monthly=[],
+        )
+
+    m = build_day_matrix(habits, payload.get("logs") or [], start, n_days)
+    done_active = m.done & m.active
+
+    # 습관별 (삭제되지 않은 습관만)
+    current = np.array([not habit["is_deleted"] for habit in habits], dtype=bool)
+    done = m.done[current]
+    streak = _trailing_runs(done[:, :-1])
+    longest = _longest_runs(done)
+    achieved7 = done[:, -7:].sum(axis=1)
+    achieved30 = done[:, -30:].sum(axis=1)
+    completed = done_active[current].sum(axis=1)
+    active_days = m.active[current].sum(axis=1)
+    habit_stats = [
+        {
+            "habit_id": habit["id"],
+            "title": habit["title"],
+            "achieved7": int(achieved7[i]),
+            "achieved30": int(achieved30[i]),
+            "streak": int(streak[i]),
+            "best_streak": int(longest[i]),
+            "completed_days": int(completed[i]),
+            "active_days": int(active_days[i]),
+            "completion_rate": _rate(completed[i], active_days[i]),
+        }
+        for i, habit in enumerate(h for h, keep in zip(habits, current) if keep)
+    ]
+
+    # 전체: 그날 존재한 습관이 모두 달성한 날
+    all_done = m.active.any(axis=0) & ~(m.active & ~m.done).any(axis=0)
+    day_achieved = done_active.sum(axis=0)
+    day_total = m.active.sum(axis=0)
+    overall = {
+        "achieved7": int(all_done[-7:].sum()),
+        "achieved30": int(all_done[-30:].sum()),
+        "streak": int(_trailing_runs(all_done[None, :-1])[0]),
+        "best_streak": int(_longest_runs(all_done[None, :])[0]),
+        "completion_rate7": _rate(day_achieved[-7:].sum(), day_total[-7:].sum()),
+        "completion_rate30": _rate(day_achieved[-30:].sum(), day_total[-30:].sum()),
+    }
+
+    # 주간(월요일 시작)/월간 곡선
+    dates = np.datetime64(start, "D") + np.arange(n_days)
+    weekday = (dates.astype(np.int64) + 3) % 7  # 1970-01-01은 목요일
+    weeks = _curve(dates - weekday, day_achieved, day_total, "week_start")
+    months = _curve(dates.astype("datetime64[M]"), day_achieved, day_total, "month")
+
+    return dict(result, overall=overall, habits=habit_stats, weekly=weeks, monthly=months)
+
+
+def get_stats_cache_stats() -> dict:
+    """통계 캐시 통계 (헬스 체크용)"""
+    return stats_cache.stats()
@@ -0,0 +1,158 @@
+"""
+히트맵 일별 스냅샷 계산 (서버)
+Flutter HabitDatabaseHandler.computeAndSaveHeatmapSnapshot()과 같은 규칙을 습관 × 날짜 배열로 한 번에 계산
+- 그날 존재한 습관(생성일 <= 날짜, 삭제된 습관은 삭제 시각(updated_at) 날짜 이전까지) 기준 achieved/total
+- 존재한 습관이 없으면 그날 로그가 있는 습관만 사용, 그것도 없으면 스냅샷 없음
+- level: achieved/total 비율을 1~4로 매핑 (0%→0, 1~25%→1, ...)
+- 클라이언트는 created_at/updated_at(UTC)을 기기 로컬 날짜로 바꿔 비교하므로
+  서버는 HEATMAP_UTC_OFFSET_MINUTES 기준 로컬 날짜로 계산
+"""
+
+import os
+from datetime import date, datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+# 로컬 날짜 계산용 UTC 오프셋 (기본 한국 UTC+9)
+HEATMAP_UTC_OFFSET_MINUTES = int(os.getenv('HEATMAP_UTC_OFFSET_MINUTES', '540'))
+# 기준일 이전 계산 일수 (클라이언트 buildPayload와 같은 2년)
+HEATMAP_DAYS = 730
+
+
+def _local_date(timestamp: str, offset: timedelta) -> date:
+    """UTC ISO8601 → 로컬 날짜 (파싱 실패 시 앞 10자)"""
+    try:
+        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return date.fromisoformat(timestamp[:10])
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None) - dt.utcoffset()
+    return (dt + offset).date()
+
+
+def snapshot_end_date(exported_at: Optional[str], utc_offset_minutes: int = HEATMAP_UTC_OFFSET_MINUTES) -> date:
+    """스냅샷 기준일 (exported_at의 로컬 날짜, 없거나 잘못되면 현재)"""
+    offset = timedelta(minutes=utc_offset_minutes)
+    if exported_at:
+        try:
+            return _local_date(exported_at, offset)
+        except ValueError:
+            pass
+    return (datetime.utcnow() + offset).date()
+
+
+class DayMatrix(NamedTuple):
+    """습관 × 날짜 배열 (행: habits 순서, 열: start부터 하루 단위)"""
+    start: date
+    active: np.ndarray  # 그날 존재한 습관 (bool)
+    counts: np.ndarray  # 그날 로그 count (int64, 로그 없으면 0)
+    has_log: np.ndarray  # 그날 로그 있음 (bool)
+    done: np.ndarray  # count >= daily_target (bool)
+
+    def day_strings(self, columns=None) -> List[str]:
+        """열 index → YYYY-MM-DD (columns 생략 시 전체)"""
+        if columns is None:
+            columns = np.arange(self.active.shape[1])
+        return (np.datetime64(self.start, "D") + columns).astype(str).tolist()
+
+
+def build_day_matrix(
+    habits: List[dict],
+    logs: List[dict],
+    start: date,
+    n_days: int,
+    utc_offset_minutes: int = HEATMAP_UTC_OFFSET_MINUTES,
+) -> DayMatrix:
+    """
+    habits/logs 섹션 → 습관 × 날짜 배열
+    - 습관 존재 구간은 wasActiveOnDate와 같은 규칙 (로컬 날짜 기준)
+    - 삭제된 로그, 알 수 없는 습관의 로그, 범위 밖 날짜는 제외
+
+    Raises:
+        ValueError: 로그 date, 습관 created_at/updated_at이 실제 날짜가 아님 (예: 2025-02-30)
+    """
+    offset = timedelta(minutes=utc_offset_minutes)
+
+    # 습관별 존재 구간 [created, ended) (start 기준 일 index)
+    habit_index = {habit["id"]: i for i, habit in enumerate(habits)}
+    target = np.array([habit["daily_target"] for habit in habits], dtype=np.int64)
+    created = np.array(
+        [(_local_date(habit["created_at"], offset) - start).days for habit in habits], dtype=np.int64
+    )
+    ended = np.array(
+        [
+            (_local_date(habit["updated_at"], offset) - start).days if habit["is_deleted"] else n_days
+            for habit in habits
+        ],
+        dtype=np.int64,
+    )
+    day = np.arange(n_days, dtype=np.int64)
+    active = (created[:, None] <= day) & (day < ended[:, None])
+
+    live_logs = [log for log in logs if not log["is_deleted"] and log["habit_id"] in habit_index]
+    counts = np.zeros((len(habits), n_days), dtype=np.int64)
+    has_log = np.zeros((len(habits), n_days), dtype=bool)
+    if live_logs:
+        rows = np.fromiter((habit_index[log["habit_id"]] for log in live_logs), dtype=np.int64, count=len(live_logs))
+        cols = (
+            np.array([log["date"] for log in live_logs], dtype="datetime64[D]") - np.datetime64(start, "D")
+        ).astype(np.int64)
+        values = np.fromiter((log["count"] for log in live_logs), dtype=np.int64, count=len(live_logs))
+        in_range = (cols >= 0) & (cols < n_days)
+        rows, cols, values = rows[in_range], cols[in_range], values[in_range]
+        counts[rows, cols] = values
+        has_log[rows, cols] = True
+
+    return DayMatrix(start, active, counts, has_log, counts >= target[:, None])
+
+
+def compute_heatmap_snapshots(
+    habits: List[dict],
+    logs: List[dict],
+    end_date: date,
+    days: int = HEATMAP_DAYS,
+    utc_offset_minutes: int = HEATMAP_UTC_OFFSET_MINUTES,
+) -> List[dict]:
+    """
+    habits/logs 섹션 → heatmap_snapshots 섹션 (end_date - days ~ end_date, 날짜 오름차순)
+
+    Returns:
+        [{"date", "achieved", "total", "level"}] (total이 0인 날은 제외)
+    """
+    if not habits:
+        return []
+    m = build_day_matrix(habits, logs, end_date - timedelta(days=days), days + 1, utc_offset_minutes)
+    total = m.active.sum(axis=0)
+    achieved = (m.done & m.active).sum(axis=0)
+
+    # 존재한 습관이 없는 날: 로그가 있는 습관 기준
+    fallback = total == 0
+    total = np.where(fallback, m.has_log.sum(axis=0), total)
+    achieved = np.where(fallback, (m.done & m.has_log).sum(axis=0), achieved)
+
+    level = np.where(
+        (total == 0) | (achieved == 0), 0, np.clip(-(-achieved * 4 // np.maximum(total, 1)), 1, 4)
+    )
+    keep = np.nonzero(total > 0)[0]
+    return [
+        {"date": d, "achieved": a, "total": t, "level": lv}
+        for d, a, t, lv in zip(
+            m.day_strings(keep), achieved[keep].tolist(), total[keep].tolist(), level[keep].tolist()
+        )
+    ]
+
+
+def fill_heatmap_snapshots(payload: dict) -> dict:
+    """
+    스냅샷의 heatmap_snapshots를 habits/logs로 다시 계산 (payload는 제자리 수정 후 반환)
+
+    Raises:
+        ValueError: 로그 date, 습관 created_at/updated_at이 실제 날짜가 아님 (예: 2025-02-30)
+    """
+    payload["heatmap_snapshots"] = compute_heatmap_snapshots(
+        payload.get("habits") or [],
+        payload.get("logs") or [],
+        snapshot_end_date(payload.get("exported_at")),
+    )
+    return payload
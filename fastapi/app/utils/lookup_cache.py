@@ -0,0 +1,219 @@
+"""
+조회 결과 캐시 (read-through)
+- 기본: 프로세스 내 LRU + TTL (크기 제한)
+- LOOKUP_CACHE_REDIS_URL 설정 시 Redis 호환 저장소 사용 (워커 여러 개가 무효화를 공유)
+- 키는 "네임스페이스:식별자" 형식, 네임스페이스별 hit/miss 집계
+- 값이 None(조회 결과 없음)이어도 캐시
+"""
+
+import abc
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+from app.utils import canonical_json
+
+try:
+    import redis
+except ImportError:  # 선택 의존성 (LOOKUP_CACHE_REDIS_URL 사용 시에만 필요)
+    redis = None
+
+# 캐시 유지 시간 (0이면 캐시 사용 안 함)
+LOOKUP_CACHE_TTL_SECONDS = float(os.getenv('LOOKUP_CACHE_TTL_SECONDS', '30'))
+# 프로세스 내 캐시 최대 항목 수
+LOOKUP_CACHE_MAX_ENTRIES = int(os.getenv('LOOKUP_CACHE_MAX_ENTRIES', '10000'))
+# 예: redis://localhost:6379/0 (비어 있으면 프로세스 내 캐시)
+LOOKUP_CACHE_REDIS_URL = os.getenv('LOOKUP_CACHE_REDIS_URL', '')
+LOOKUP_CACHE_REDIS_PREFIX = os.getenv('LOOKUP_CACHE_REDIS_PREFIX', 'habitcell:')
+
+
+class _BaseCache(abc.ABC):
+    """hit/miss 집계 + read-through 공통 처리 (저장소 백엔드는 _get/_set/_delete 구현)"""
+
+    backend = ""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._counters = {}
+        # 무효화 횟수: 조회 도중 무효화가 있었으면 (오래된 값일 수 있으므로) 저장 생략
+        self._invalidations = 0
+        self._stale_skips = 0
+
+    def get_or_load(self, key: str, loader: Callable):
+        """캐시에 있으면 반환, 없으면 loader() 결과를 저장 후 반환"""
+        if self.ttl <= 0:
+            return loader()
+        hit, value = self._get(key)
+        self._count(key, "hits" if hit else "misses")
+        if hit:
+            return value
+
+        token = self._invalidations
+        value = loader()
+        if token == self._invalidations:
+            self._set(key, value)
+        else:
+            with self._lock:
+                self._stale_skips += 1
+        return value
+
+    def invalidate(self, *keys: str):
+        """키 삭제 (DB 변경 직후 호출)"""
+        keys = [key for key in keys if key]
+        if not keys:
+            return
+        with self._lock:
+            self._invalidations += 1
+        self._delete(keys)
+        for key in keys:
+            self._count(key, "invalidations")
+
+    def _count(self, key: str, name: str):
+        namespace = key.split(":", 1)[0]
+        with self._lock:
+            counters = self._counters.setdefault(namespace, {"hits": 0, "misses": 0, "invalidations": 0})
+            counters[name] += 1
+
+    def stats(self) -> dict:
+        """네임스페이스별 hit/miss, 적중률"""
+        with self._lock:
+            namespaces = {}
+            for namespace, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                namespaces[namespace] = dict(
+                    counters, hit_ratio=round(counters["hits"] / lookups, 4) if lookups else 0.0
+                )
+            return {
+                "backend": self.backend,
+                "ttl_seconds": self.ttl,
+                "stale_skips": self._stale_skips,
+                "namespaces": namespaces,
+            }
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> Tuple[bool, object]:
+        """(적중 여부, 값)"""
+
+    @abc.abstractmethod
+    def _set(self, key: str, value):
+        """ttl 동안 저장"""
+
+    @abc.abstractmethod
+    def _delete(self, keys):
+        """키 목록 삭제"""
+
+
+class LRUCache(_BaseCache):
+    """프로세스 내 LRU + TTL 캐시 (스레드 안전)"""
+
+    backend = "memory"
+
+    def __init__(self, ttl: float, max_entries: int):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        self._evictions = 0
+        self._expired = 0
+
+    def _get(self, key: str) -> Tuple[bool, object]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expired += 1
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def _set(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        with self._lock:
+            stats.update(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                evictions=self._evictions,
+                expired=self._expired,
+            )
+        return stats
+
+
+class RedisCache(_BaseCache):
+    """
+    Redis 호환 저장소 캐시 (값은 JSON, 만료는 서버 TTL)
+    - 저장소 오류는 캐시 miss로 처리 (DB 조회로 대체)
+    """
+
+    backend = "redis"
+
+    def __init__(self, ttl: float, url: str, prefix: str):
+        super().__init__(ttl)
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._errors = 0
+
+    def _get(self, key: str) -> Tuple[bool, object]:
+        try:
+            data = self._client.get(self.prefix + key)
+        except redis.RedisError:
+            self._error()
+            return False, None
+        if data is None:
+            return False, None
+        return True, canonical_json.loads(data)["v"]
+
+    def _set(self, key: str, value):
+        try:
+            self._client.set(self.prefix + key, canonical_json.dumps({"v": value}), px=int(self.ttl * 1000))
+        except redis.RedisError:
+            self._error()
+
+    def _delete(self, keys):
+        try:
+            self._client.delete(*[self.prefix + key for key in keys])
+        except redis.RedisError:
+            # 무효화 실패 시 TTL 동안 이전 값이 보일 수 있음
+            self._error()
+
+    def _error(self):
+        with self._lock:
+            self._errors += 1
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["errors"] = self._errors
+        return stats
+
+
+def _build_cache() -> _BaseCache:
+    if LOOKUP_CACHE_REDIS_URL:
+        if redis is not None:
+            return RedisCache(LOOKUP_CACHE_TTL_SECONDS, LOOKUP_CACHE_REDIS_URL, LOOKUP_CACHE_REDIS_PREFIX)
+        print("LOOKUP_CACHE_REDIS_URL 설정됨, redis 패키지가 없어 프로세스 내 캐시 사용")
+    return LRUCache(LOOKUP_CACHE_TTL_SECONDS, LOOKUP_CACHE_MAX_ENTRIES)
+
+
+lookup_cache = _build_cache()
+
+
+def get_lookup_cache_stats() -> dict:
+    """캐시 통계 (헬스 체크용)"""
+    return lookup_cache.stats()
@@ -0,0 +1,228 @@
+"""
+백업 payload 압축 코덱
+backups 테이블에 저장하는 스냅샷 JSON의 압축/해제 (gzip, zstd)
+- zstd는 zstandard 패키지가 설치된 경우에만 사용
+- 코덱 이름은 HTTP Content-Encoding 토큰과 동일하게 사용 (그대로 응답 헤더로 전달 가능)
+- StreamDecoder: 요청 본문(Content-Encoding)을 청크 단위로 해제, 해제 크기 상한 적용
+"""
+
+import gzip
+import os
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+
+CODEC_IDENTITY = "identity"
+CODEC_GZIP = "gzip"
+CODEC_ZSTD = "zstd"
+
+GZIP_LEVEL = int(os.getenv('BACKUP_GZIP_LEVEL', '6'))
+ZSTD_LEVEL = int(os.getenv('BACKUP_ZSTD_LEVEL', '3'))
+
+
+def available_codecs() -> list:
+    """현재 환경에서 사용 가능한 코덱 목록"""
+    codecs = [CODEC_IDENTITY, CODEC_GZIP]
+    if zstandard is not None:
+        codecs.append(CODEC_ZSTD)
+    return codecs
+
+
+def _default_codec() -> str:
+    codec = os.getenv('BACKUP_PAYLOAD_CODEC', '').strip().lower()
+    if not codec:
+        return CODEC_ZSTD if zstandard is not None else CODEC_GZIP
+    if codec not in available_codecs():
+        raise ValueError(f"Unsupported BACKUP_PAYLOAD_CODEC: {codec} (available: {available_codecs()})")
+    return codec
+
+
+# 새로 저장하는 백업에 적용할 코덱
+STORAGE_CODEC = _default_codec()
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    """
+    바이트 압축
+
+    Args:
+        data: 원본 바이트 (UTF-8 JSON)
+        codec: identity / gzip / zstd
+
+    Raises:
+        ValueError: 지원하지 않는 코덱
+    """
+    if codec == CODEC_IDENTITY:
+        return data
+    if codec == CODEC_GZIP:
+        # mtime=0: 같은 입력이면 같은 출력 (저장 바이트 비교/캐시에 유리)
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if codec == CODEC_ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unsupported codec: {codec}")
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """
+    바이트 압축 해제
+
+    Raises:
+        ValueError: 지원하지 않는 코덱
+    """
+    if codec == CODEC_IDENTITY:
+        return data
+    if codec == CODEC_GZIP:
+        return gzip.decompress(data)
+    if codec == CODEC_ZSTD and zstandard is not None:
+        # content size가 프레임 헤더에 기록되어 있으므로 한 번에 해제
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unsupported codec: {codec}")
+
+
+def accepts_encoding(accept_encoding: str, codec: str) -> bool:
+    """
+    Accept-Encoding 헤더가 해당 코덱을 허용하는지 확인
+    - q=0으로 명시적으로 거부한 경우는 제외
+    """
+    if codec == CODEC_IDENTITY:
+        return True
+    if not accept_encoding:
+        return False
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        if token.strip().lower() != codec:
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+class PayloadTooLargeError(ValueError):
+    """압축 해제 결과가 허용 크기를 넘을 때"""
+
+
+class _CappedBuffer:
+    """max_size를 넘으면 PayloadTooLargeError를 던지는 출력 버퍼 (zstd stream_writer 대상)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.data = bytearray()
+
+    def write(self, chunk) -> int:
+        if len(self.data) + len(chunk) > self.max_size:
+            raise PayloadTooLargeError(f"decoded payload exceeds {self.max_size} bytes")
+        self.data += chunk
+        return len(chunk)
+
+
+class StreamDecoder:
+    """
+    Content-Encoding 스트리밍 해제기
+    - feed()로 받은 압축 청크는 바로 해제하고 버림 (압축본 전체를 메모리에 모으지 않음)
+    - 해제 결과가 max_size를 넘는 순간 중단 (압축 폭탄 방지)
+
+    사용 예시:
+        decoder = StreamDecoder("gzip", max_size=32 * 1024 * 1024)
+        async for chunk in request.stream():
+            decoder.feed(chunk)
+        body = decoder.finish()
+
+    Raises:
+        ValueError: 지원하지 않는 코덱, 손상된 압축 데이터
+        PayloadTooLargeError: 해제 크기 초과
+    """
+
+    def __init__(self, codec: str, max_size: int):
+        codec = (codec or CODEC_IDENTITY).strip().lower()
+        if codec not in available_codecs():
+            raise ValueError(f"Unsupported Content-Encoding: {codec}")
+        self.codec = codec
+        self._out = _CappedBuffer(max_size)
+        self._gzip = None
+        self._zstd = None
+        if codec == CODEC_GZIP:
+            self._gzip = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        elif codec == CODEC_ZSTD:
+            self._zstd = zstandard.ZstdDecompressor().stream_writer(
+                self._out, write_size=64 * 1024, closefd=False
+            )
+
+    def feed(self, chunk: bytes):
+        if not chunk:
+            return
+        if self._gzip is not None:
+            self._feed_gzip(chunk)
+        elif self._zstd is not None:
+            try:
+                self._zstd.write(chunk)
+            except zstandard.ZstdError as e:
+                raise ValueError(f"invalid zstd data: {e}") from e
+        else:
+            self._out.write(chunk)
+
+    def _feed_gzip(self, data: bytes):
+        try:
+            while data:
+                # 출력 크기를 남은 허용량 + 1로 제한 → 초과 즉시 감지
+                remaining = self._out.max_size - len(self._out.data)
+                self._out.write(self._gzip.decompress(data, remaining + 1))
+                if self._gzip.eof:
+                    # 여러 gzip 멤버가 이어진 경우 다음 멤버부터 계속
+                    data = self._gzip.unused_data
+                    if data:
+                        self._gzip = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+                else:
+                    data = self._gzip.unconsumed_tail
+        except zlib.error as e:
+            raise ValueError(f"invalid gzip data: {e}") from e
+
+    def finish(self) -> bytes:
+        """해제된 전체 본문 반환"""
+        if self._gzip is not None and not self._gzip.eof:
+            raise ValueError("truncated gzip data")
+        if self._zstd is not None:
+            self._zstd.flush()
+        data = bytes(self._out.data)
+        self._out.data = bytearray()
+        return data
+
+
+class StreamEncoder:
+    """
+    스트리밍 압축기 (응답/파일을 조각 단위로 압축해 내보낼 때)
+    - compress()가 돌려준 바이트를 바로 내보내고, 마지막에 flush() 결과를 이어 붙임
+
+    Raises:
+        ValueError: 지원하지 않는 코덱
+    """
+
+    def __init__(self, codec: str):
+        codec = (codec or CODEC_IDENTITY).strip().lower()
+        if codec not in available_codecs():
+            raise ValueError(f"Unsupported codec: {codec}")
+        self.codec = codec
+        self._compressor = None
+        if codec == CODEC_GZIP:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif codec == CODEC_ZSTD:
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self._compressor is None:
+            return chunk
+        return self._compressor.compress(chunk)
+
+    def flush(self) -> bytes:
+        """남은 압축 바이트 (스트림 종료)"""
+        if self._compressor is None:
+            return b""
+        return self._compressor.flush()
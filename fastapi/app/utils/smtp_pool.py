@@ -0,0 +1,261 @@
+"""
+SMTP 커넥션 풀
+메일마다 연결 + STARTTLS + 로그인(수 초)을 새로 하는 대신 로그인된 세션을 재사용
+- 오래 쉰 연결(idle_seconds 초과)은 서버가 이미 끊었을 수 있으므로 폐기 후 새로 연결
+- 재사용한 연결이 보내는 도중 끊겨 있으면 새 연결로 한 번 더 시도
+- 연결당 max_messages통 보낸 뒤 교체 (서버의 세션당 발송 제한 대비)
+"""
+
+import smtplib
+import threading
+import time
+from collections import deque
+
+
+class SMTPPoolTimeoutError(smtplib.SMTPException):
+    """풀이 가득 찬 상태에서 wait_timeout 동안 반납되는 연결이 없을 때"""
+
+
+class SMTPConnectionPool:
+    """
+    스레드 안전한 SMTP 커넥션 풀
+
+    Args:
+        host, port: SMTP 서버
+        user, password: 로그인 정보 (비어 있으면 로그인 생략)
+        max_size: 동시에 열 수 있는 최대 연결 수
+        idle_seconds: 이 시간 이상 쓰지 않은 연결은 폐기 후 새로 연결
+        max_messages: 연결당 최대 발송 수 (초과 시 교체)
+        timeout: 소켓 타임아웃 (초)
+        wait_timeout: 풀이 가득 찼을 때 반납을 기다리는 최대 시간 (초)
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str = "",
+        password: str = "",
+        max_size: int = 2,
+        idle_seconds: float = 60.0,
+        max_messages: int = 100,
+        timeout: float = 10.0,
+        wait_timeout: float = 30.0,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.wait_timeout = wait_timeout
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # [server, last_used, messages]
+        self._size = 0  # 열려 있는 연결 수 (유휴 + 사용 중)
+
+        # 통계
+        self._created = 0
+        self._reused = 0
+        self._closed = 0
+        self._stale = 0  # 재사용하려던 연결이 끊겨 있던 횟수
+        self._sent = 0
+        self._failed = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._connect_time_total = 0.0
+        self._send_time_total = 0.0
+
+    # ----------------------------------------
+    # 내부 연결 생성/종료
+    # ----------------------------------------
+    def _open(self) -> list:
+        started = time.monotonic()
+        server = None
+        try:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            server.starttls()
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            if server is not None:
+                self._close_quietly(server, count=False)
+            self._release_slot()
+            raise
+        with self._cond:
+            self._created += 1
+            self._connect_time_total += time.monotonic() - started
+        return [server, time.monotonic(), 0]
+
+    def _close_quietly(self, server, count: bool = True):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+        if count:
+            with self._cond:
+                self._closed += 1
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _is_stale(self, entry: list) -> bool:
+        return (
+            time.monotonic() - entry[1] > self.idle_seconds
+            or entry[2] >= self.max_messages
+        )
+
+    # ----------------------------------------
+    # 대여/반납
+    # ----------------------------------------
+    def _checkout(self):
+        """
+        쓸 만한 유휴 연결을 꺼내거나 새 연결 슬롯을 예약
+        Returns: [server, last_used, messages] 또는 새로 열어야 하면 None
+        """
+        deadline = None
+        stale = []
+        try:
+            with self._cond:
+                while True:
+                    while self._idle:
+                        entry = self._idle.pop()
+                        if self._is_stale(entry):
+                            # 슬롯은 그대로 새 연결에 사용
+                            stale.append(entry[0])
+                            return None
+                        self._reused += 1
+                        return entry
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None
+
+                    now = time.monotonic()
+                    if deadline is None:
+                        deadline = now + self.wait_timeout
+                        self._waits += 1
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise SMTPPoolTimeoutError(
+                            f"SMTP connection pool exhausted (max_size={self.max_size}, waited {self.wait_timeout}s)"
+                        )
+                    self._cond.wait(remaining)
+        finally:
+            for server in stale:
+                self._close_quietly(server)
+
+    def _checkin(self, entry: list):
+        entry[1] = time.monotonic()
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def _discard(self, entry: list):
+        self._close_quietly(entry[0])
+        self._release_slot()
+
+    def send(self, msg):
+        """
+        메시지 발송 (블로킹, 스레드에서 호출)
+
+        Raises:
+            smtplib.SMTPException, OSError: 연결/발송 실패 (SMTPResponseException이면 서버 응답 코드 포함)
+            SMTPPoolTimeoutError: wait_timeout 내에 연결을 얻지 못했을 때
+        """
+        started = time.monotonic()
+        entry = self._checkout()
+        reused = entry is not None
+        if entry is None:
+            try:
+                entry = self._open()
+            except Exception:
+                self._record(started, ok=False)
+                raise
+        try:
+            try:
+                entry[0].send_message(msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                if not reused:
+                    raise
+                # 쉬는 동안 서버가 끊은 연결 → 새로 연결해 한 번 더
+                with self._cond:
+                    self._stale += 1
+                self._close_quietly(entry[0])
+                try:
+                    entry = self._open()
+                except Exception:
+                    entry = None
+                    raise e
+                entry[0].send_message(msg)
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            # 서버가 거절만 한 경우 세션은 살아 있으므로 초기화 후 반납
+            self._record(started, ok=False)
+            if entry is not None:
+                try:
+                    entry[0].rset()
+                    self._checkin(entry)
+                except Exception:
+                    self._discard(entry)
+            raise
+        except Exception:
+            self._record(started, ok=False)
+            if entry is not None:
+                self._discard(entry)
+            raise
+
+        entry[2] += 1
+        self._record(started, ok=True)
+        self._checkin(entry)
+
+    def _record(self, started: float, ok: bool):
+        with self._cond:
+            if ok:
+                self._sent += 1
+            else:
+                self._failed += 1
+            self._send_time_total += time.monotonic() - started
+
+    # ----------------------------------------
+    # 관리
+    # ----------------------------------------
+    def close_all(self):
+        """유휴 연결 전부 종료 (앱 종료 시 호출)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for server, _, _ in idle:
+            self._close_quietly(server)
+
+    def stats(self) -> dict:
+        """풀 사이징용 통계"""
+        with self._cond:
+            idle = len(self._idle)
+            finished = self._sent + self._failed
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": idle,
+                "in_use": self._size - idle,
+                "created": self._created,
+                "reused": self._reused,
+                "closed": self._closed,
+                "stale": self._stale,
+                "sent": self._sent,
+                "failed": self._failed,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "avg_connect_ms": round(self._connect_time_total / self._created * 1000, 3) if self._created else 0.0,
+                "avg_send_ms": round(self._send_time_total / finished * 1000, 3) if finished else 0.0,
+            }
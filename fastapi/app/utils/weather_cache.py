@@ -0,0 +1,643 @@
+"""
+날씨 예보 캐시 (격자 셀 단위)
+- 위경도를 WEATHER_CACHE_GRID_DEGREES 격자로 맞춰 같은 셀의 사용자는 예보 1개를 공유
+  (업스트림은 셀 중심 좌표로 호출 → 셀 안 어느 좌표로 요청해도 같은 결과)
+- 저장하는 값은 파싱한 8일치 일별 예보 전체 (start_date/target_date는 잘라서 응답)
+- 만료 시각은 업스트림 갱신 주기(WEATHER_CACHE_REFRESH_SECONDS) 경계에 맞춤
+  (받아 온 시점 + 고정 TTL이 아니라 다음 갱신 시각까지, 로컬 자정을 넘기지 않음)
+- single-flight: 같은 셀의 동시 miss는 업스트림 호출 1번을 함께 기다림
+- stale-while-revalidate: 만료 후 WEATHER_CACHE_STALE_SECONDS 동안은 마지막 예보를 바로 응답하고
+  백그라운드에서 갱신 (같은 날짜 안에서만)
+- 미리 갱신(prefetch): 자주 요청되는 상위 셀은 만료 직전에 백그라운드에서 갱신
+- 저장소: 기본은 SQLite 파일(WAL) → 같은 서버의 uvicorn 워커들이 공유하고 재시작 후에도 유지
+  (WEATHER_CACHE_BACKEND=memory면 프로세스 내 LRU)
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# 격자 크기 (도, 0.1 ≈ 위도 11km, 0이면 좌표를 소수 4자리로만 맞춤)
+WEATHER_CACHE_GRID_DEGREES = float(os.getenv('WEATHER_CACHE_GRID_DEGREES', '0.1'))
+# 업스트림(OpenWeatherMap) 예보 갱신 주기와 갱신 후 반영까지의 여유 (초)
+WEATHER_CACHE_REFRESH_SECONDS = int(os.getenv('WEATHER_CACHE_REFRESH_SECONDS', '600'))
+WEATHER_CACHE_REFRESH_OFFSET_SECONDS = int(os.getenv('WEATHER_CACHE_REFRESH_OFFSET_SECONDS', '30'))
+# 캐시 최대 셀 수 (memory: LRU, sqlite: 만료가 빠른 셀부터 정리)
+WEATHER_CACHE_MAX_CELLS = int(os.getenv('WEATHER_CACHE_MAX_CELLS', '10000'))
+# 저장소: sqlite (워커 간 공유, 재시작 후 유지) | memory (프로세스 내)
+WEATHER_CACHE_BACKEND = os.getenv('WEATHER_CACHE_BACKEND', 'sqlite')
+# SQLite 잠금 대기 (밀리초): 읽기는 짧게(대기 초과 시 miss), 쓰기는 다른 워커의 쓰기를 기다림
+WEATHER_CACHE_READ_TIMEOUT_MS = int(os.getenv('WEATHER_CACHE_READ_TIMEOUT_MS', '200'))
+WEATHER_CACHE_WRITE_TIMEOUT_MS = int(os.getenv('WEATHER_CACHE_WRITE_TIMEOUT_MS', '5000'))
+WEATHER_CACHE_PATH = os.getenv(
+    'WEATHER_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'weather_cache.sqlite'),
+)
+# 만료 후 마지막 예보를 응답하며 백그라운드 갱신하는 최대 시간 (초, 0이면 사용 안 함)
+WEATHER_CACHE_STALE_SECONDS = int(os.getenv('WEATHER_CACHE_STALE_SECONDS', '3600'))
+
+# 인기 셀 미리 갱신
+WEATHER_PREFETCH_ENABLED = os.getenv('WEATHER_PREFETCH_ENABLED', '1') == '1'
+WEATHER_PREFETCH_INTERVAL_SECONDS = float(os.getenv('WEATHER_PREFETCH_INTERVAL_SECONDS', '10'))
+WEATHER_PREFETCH_TOP_N = int(os.getenv('WEATHER_PREFETCH_TOP_N', '50'))
+# 만료 몇 초 전부터 갱신할지 (업스트림 갱신 이후여야 새 예보를 받으므로 REFRESH_OFFSET 이하로 제한)
+WEATHER_PREFETCH_LEAD_SECONDS = min(
+    int(os.getenv('WEATHER_PREFETCH_LEAD_SECONDS', '20')), WEATHER_CACHE_REFRESH_OFFSET_SECONDS
+)
+WEATHER_PREFETCH_CONCURRENCY = int(os.getenv('WEATHER_PREFETCH_CONCURRENCY', '4'))
+# 인기 점수 반감기 (초, 최근 요청 위주로 순위 유지, 점수가 _POPULARITY_MIN 미만이면 추적 중단)
+WEATHER_PREFETCH_HALF_LIFE_SECONDS = float(os.getenv('WEATHER_PREFETCH_HALF_LIFE_SECONDS', '1800'))
+_POPULARITY_MIN = 0.05
+
+
+class GridCell(NamedTuple):
+    """격자 셀 (key: 캐시 키, lat/lon: 업스트림 호출에 쓰는 셀 중심 좌표 문자열)"""
+    key: str
+    lat: str
+    lon: str
+
+
+def grid_cell(lat: float, lon: float, grid: float = WEATHER_CACHE_GRID_DEGREES) -> GridCell:
+    """위경도 → 격자 셀"""
+    if grid <= 0:
+        lat_s, lon_s = f"{lat:.4f}", f"{lon:.4f}"
+        return GridCell(f"{lat_s}:{lon_s}", lat_s, lon_s)
+    lat_i, lon_i = round(lat / grid), round(lon / grid)
+    return GridCell(f"{grid:g}:{lat_i}:{lon_i}", f"{lat_i * grid:.4f}", f"{lon_i * grid:.4f}")
+
+
+def refresh_deadline(
+    now: float,
+    period: int = WEATHER_CACHE_REFRESH_SECONDS,
+    offset: int = WEATHER_CACHE_REFRESH_OFFSET_SECONDS,
+) -> float:
+    """
+    now(epoch 초)에 받은 예보의 만료 시각
+    - 다음 업스트림 갱신 경계 + offset, 단 로컬 자정(날짜가 바뀌면 '오늘'이 달라짐)을 넘기지 않음
+    """
+    boundary = (int(now - offset) // period + 1) * period + offset
+    local_now = datetime.fromtimestamp(now)
+    midnight = datetime.combine(local_now.date() + timedelta(days=1), datetime.min.time()).timestamp()
+    return float(min(boundary, midnight))
+
+
+class ForecastEntry(NamedTuple):
+    """캐시 항목 (시각은 epoch 초, prefetched: 미리 갱신으로 받은 항목)"""
+    forecast: List[Dict]
+    fetched_at: float
+    expires_at: float
+    prefetched: bool = False
+
+
+def _same_day(entry: ForecastEntry, now: float) -> bool:
+    """
+    만료 뒤에도 쓸 수 있는 항목인지 (받은 날짜 = 만료 날짜 = 오늘)
+    - 자정으로 만료된 항목은 '오늘'이 바뀌었으므로 stale 응답/미리 갱신 대상이 아님
+    """
+    fetched = datetime.fromtimestamp(entry.fetched_at).date()
+    return fetched == datetime.fromtimestamp(entry.expires_at).date() == date.fromtimestamp(now)
+
+
+class MemoryForecastStore:
+    """
+    프로세스 내 LRU 저장소 (만료된 항목도 밀려날 때까지 보관, 신선도 판단은 ForecastCache)
+    - 저장소 공통: ForecastCache는 aget/aset만 사용 (메모리 접근이라 바로 반환)
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ForecastEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    async def aget(self, key: str) -> Optional[ForecastEntry]:
+        return self.get(key)
+
+    async def aset(self, key: str, entry: ForecastEntry):
+        self.set(key, entry)
+
+    def get(self, key: str) -> Optional[ForecastEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: ForecastEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def close(self):
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self._evictions,
+            }
+
+
+def _encode_forecast(forecast: List[Dict]) -> str:
+    """예보 목록 → JSON (weather_datetime 등 datetime 값은 {"__dt__": ISO 문자열})"""
+    def default(value):
+        if isinstance(value, datetime):
+            return {"__dt__": value.isoformat()}
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+    return json.dumps(forecast, ensure_ascii=False, separators=(",", ":"), default=default)
+
+
+def _decode_forecast(text: str) -> List[Dict]:
+    def hook(obj: dict):
+        if len(obj) == 1 and "__dt__" in obj:
+            return datetime.fromisoformat(obj["__dt__"])
+        return obj
+    return json.loads(text, object_hook=hook)
+
+
+class SQLiteForecastStore:
+    """
+    SQLite 파일 저장소 (WAL 모드)
+    - 같은 파일을 여는 워커들이 캐시를 공유하고, 재시작 후에도 유지
+    - 조회는 기본 키로 셀 1개만 읽고 그 행만 역직렬화
+    - 파일 I/O는 이벤트 루프 밖 전용 스레드에서 실행 (aget/aset)
+      읽기/쓰기는 연결과 스레드를 분리 → 다른 워커와의 쓰기 경합이 조회를 막지 않음
+    - WAL: 읽기는 쓰기를 기다리지 않음 (read_timeout_ms는 체크포인트 등 드문 잠금 대기용으로 짧게),
+      쓰기는 write_timeout_ms 동안 순서대로 재시도
+    - 저장 _PRUNE_EVERY번마다 max_entries를 넘으면 만료가 빠른 셀부터 삭제 (쓰기 스레드에서)
+    """
+
+    backend = "sqlite"
+    _PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int,
+        read_timeout_ms: int = WEATHER_CACHE_READ_TIMEOUT_MS,
+        write_timeout_ms: int = WEATHER_CACHE_WRITE_TIMEOUT_MS,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 각 연결은 자기 전용 스레드(작업자 1개)에서만 사용
+        self._writer = sqlite3.connect(path, timeout=write_timeout_ms / 1000, check_same_thread=False, isolation_level=None)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._writer.execute(
+            "CREATE TABLE IF NOT EXISTS forecast_cache ("
+            " cell_key TEXT PRIMARY KEY,"
+            " forecast TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " prefetched INTEGER NOT NULL DEFAULT 0"
+            ")"
+        )
+        self._writer.execute("CREATE INDEX IF NOT EXISTS idx_expires_at ON forecast_cache (expires_at)")
+        self._reader = sqlite3.connect(path, timeout=read_timeout_ms / 1000, check_same_thread=False, isolation_level=None)
+        self._read_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="weather-cache-read")
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="weather-cache-write")
+
+        self._sets = 0
+        self._evictions = 0
+        self._read_errors = 0
+        self._write_errors = 0
+        # 헬스 체크에서 COUNT(*)를 하지 않도록 정리할 때 센 행 수를 보관
+        (self._size,) = self._writer.execute("SELECT COUNT(*) FROM forecast_cache").fetchone()
+
+    async def aget(self, key: str) -> Optional[ForecastEntry]:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._read_executor, self.get, key)
+        except RuntimeError:
+            # 종료(close) 이후 남은 백그라운드 갱신: 캐시 없이 진행
+            return None
+
+    async def aset(self, key: str, entry: ForecastEntry):
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._write_executor, self.set, key, entry)
+        except RuntimeError:
+            pass
+
+    def get(self, key: str) -> Optional[ForecastEntry]:
+        """조회 (읽기 스레드에서 실행)"""
+        try:
+            row = self._reader.execute(
+                "SELECT forecast, fetched_at, expires_at, prefetched FROM forecast_cache WHERE cell_key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            return ForecastEntry(_decode_forecast(row[0]), row[1], row[2], bool(row[3]))
+        except (sqlite3.Error, ValueError) as e:
+            # 잠금 대기 초과/손상된 행은 miss로 처리 (업스트림에서 다시 받아 덮어씀)
+            self._read_errors += 1
+            print(f"날씨 캐시 조회 실패 ({key}): {e}")
+            return None
+
+    def set(self, key: str, entry: ForecastEntry):
+        """저장 (쓰기 스레드에서 실행)"""
+        text = _encode_forecast(entry.forecast)
+        try:
+            self._writer.execute(
+                "INSERT OR REPLACE INTO forecast_cache (cell_key, forecast, fetched_at, expires_at, prefetched)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, text, entry.fetched_at, entry.expires_at, int(entry.prefetched)),
+            )
+            self._sets += 1
+            if self._sets % self._PRUNE_EVERY == 0:
+                self._prune()
+        except sqlite3.Error as e:
+            self._write_errors += 1
+            print(f"날씨 캐시 저장 실패 ({key}): {e}")
+
+    def _prune(self):
+        (size,) = self._writer.execute("SELECT COUNT(*) FROM forecast_cache").fetchone()
+        overflow = size - self.max_entries
+        if overflow > 0:
+            cursor = self._writer.execute(
+                "DELETE FROM forecast_cache WHERE cell_key IN ("
+                " SELECT cell_key FROM forecast_cache ORDER BY expires_at LIMIT ?)",
+                (overflow,),
+            )
+            self._evictions += cursor.rowcount
+            size -= cursor.rowcount
+        self._size = size
+
+    def close(self):
+        """진행 중인 읽기/쓰기를 마친 뒤 연결 종료"""
+        self._read_executor.shutdown(wait=True)
+        self._write_executor.shutdown(wait=True)
+        self._reader.close()
+        self._writer.close()
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "path": self.path,
+            "size": self._size,  # 마지막 정리 시점 기준 (모든 워커의 행 포함)
+            "max_entries": self.max_entries,
+            "evictions": self._evictions,
+            "read_errors": self._read_errors,
+            "write_errors": self._write_errors,
+        }
+
+
+class ForecastCache:
+    """
+    셀 단위 예보 캐시 + single-flight + stale-while-revalidate
+
+    Args:
+        store: 저장소 (get/set/stats)
+        deadline_fn: 받아 온 시각 → 만료 시각
+        stale_seconds: 만료 후 마지막 예보를 응답할 수 있는 최대 시간 (초)
+    """
+
+    def __init__(
+        self,
+        store,
+        deadline_fn: Callable[[float], float] = refresh_deadline,
+        stale_seconds: int = WEATHER_CACHE_STALE_SECONDS,
+    ):
+        self.store = store
+        self.deadline_fn = deadline_fn
+        self.stale_seconds = stale_seconds
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 저장소에 쓰는 중인 항목 (쓰기가 끝나기 전에도 조회에 사용, 쓰기 대기를 응답이 기다리지 않음)
+        self._pending: Dict[str, ForecastEntry] = {}
+        self._writes: set = set()
+        # 미리 갱신용: 셀별 인기 점수(요청 수, 실행마다 감쇠)와 마지막 loader
+        self._popularity: Dict[str, float] = {}
+        self._loaders: Dict[str, Callable[[], Awaitable[List[Dict]]]] = {}
+        self._decayed_at = time.time()
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._upstream_calls = 0
+        self._upstream_errors = 0
+        self._stale_served = 0
+        self._stale_seconds_total = 0.0
+        self._max_stale_seconds = 0.0
+        self._background_refreshes = 0
+        self._refresh_errors = 0
+        self._prefetches = 0
+        self._prefetch_hits = 0
+
+    async def peek(self, key: str) -> Optional[ForecastEntry]:
+        """만료되지 않은 항목만 반환 (업스트림 호출 없음)"""
+        entry = await self._read(key)
+        if entry is not None and entry.expires_at > time.time():
+            return entry
+        return None
+
+    def _touch(self, key: str, loader=None):
+        self._popularity[key] = self._popularity.get(key, 0.0) + 1.0
+        if loader is not None:
+            self._loaders[key] = loader
+
+    def _count_hit(self, entry: ForecastEntry):
+        self._hits += 1
+        if entry.prefetched:
+            self._prefetch_hits += 1
+
+    async def lookup(self, key: str) -> Optional[List[Dict]]:
+        """만료되지 않은 예보 목록 (적중으로 집계, 없으면 None)"""
+        entry = await self.peek(key)
+        if entry is None:
+            return None
+        self._touch(key)
+        self._count_hit(entry)
+        return entry.forecast
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[List[Dict]]]) -> Tuple[List[Dict], str]:
+        """
+        셀 예보 조회
+
+        Args:
+            loader: miss일 때 업스트림에서 예보를 받아 오는 코루틴 함수
+
+        Returns:
+            (예보 목록, "hit" | "stale" | "miss" | "coalesced")
+            stale: 만료된 마지막 예보 (백그라운드에서 갱신 중)
+
+        Raises:
+            loader가 발생시킨 예외 (같은 셀을 기다리던 요청 모두에 전달, 캐시에는 저장 안 함)
+        """
+        self._touch(key, loader)
+        entry = await self._read(key)
+        now = time.time()
+        if entry is not None:
+            if entry.expires_at > now:
+                self._count_hit(entry)
+                return entry.forecast, "hit"
+            if now - entry.expires_at <= self.stale_seconds and _same_day(entry, now):
+                staleness = now - entry.expires_at
+                self._stale_served += 1
+                self._stale_seconds_total += staleness
+                self._max_stale_seconds = max(self._max_stale_seconds, staleness)
+                if key not in self._inflight:
+                    self._background_refreshes += 1
+                    self._start_load(key, loader, background=True)
+                return entry.forecast, "stale"
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalesced += 1
+            status = "coalesced"
+        else:
+            self._misses += 1
+            status = "miss"
+            task = self._start_load(key, loader)
+        # 먼저 기다리던 요청이 취소돼도 업스트림 호출은 계속 (다른 요청이 기다리는 중)
+        return await asyncio.shield(task), status
+
+    def _start_load(self, key: str, loader, not_before: Optional[float] = None,
+                    prefetched: bool = False, background: bool = False) -> asyncio.Future:
+        task = asyncio.ensure_future(self._load(key, loader, not_before, prefetched))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+        if background:
+            task.add_done_callback(self._background_done)
+        return task
+
+    def _background_done(self, task: asyncio.Future):
+        # 기다리는 요청이 없으므로 예외는 여기서 회수 (다음 요청이 다시 시도)
+        if not task.cancelled() and task.exception() is not None:
+            self._refresh_errors += 1
+
+    async def _load(self, key: str, loader, not_before: Optional[float] = None, prefetched: bool = False) -> List[Dict]:
+        self._upstream_calls += 1
+        try:
+            forecast = await loader()
+        except Exception:
+            self._upstream_errors += 1
+            raise
+        now = time.time()
+        # 미리 갱신은 만료 전에 받지만 이미 업스트림 갱신 이후 예보이므로 다음 주기까지 유효
+        deadline = self.deadline_fn(max(now, not_before or now))
+        entry = ForecastEntry(forecast, now, deadline, prefetched)
+        self._pending[key] = entry
+        write = asyncio.ensure_future(self._persist(key, entry))
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+        return forecast
+
+    async def _persist(self, key: str, entry: ForecastEntry):
+        try:
+            await self.store.aset(key, entry)
+        finally:
+            if self._pending.get(key) is entry:
+                del self._pending[key]
+
+    async def _read(self, key: str) -> Optional[ForecastEntry]:
+        entry = self._pending.get(key)
+        if entry is not None:
+            return entry
+        return await self.store.aget(key)
+
+    async def prefetch(
+        self,
+        top_n: int = WEATHER_PREFETCH_TOP_N,
+        lead_seconds: float = WEATHER_PREFETCH_LEAD_SECONDS,
+        concurrency: int = WEATHER_PREFETCH_CONCURRENCY,
+    ) -> int:
+        """
+        인기 상위 top_n 셀 중 lead_seconds 안에 만료되는(또는 만료돼 stale 응답 중인) 셀을 미리 갱신
+
+        Returns:
+            갱신에 성공한 셀 수
+        """
+        now = time.time()
+        ranked = sorted(self._popularity.items(), key=lambda item: item[1], reverse=True)[:top_n]
+        due = []
+        for key, _ in ranked:
+            entry = await self._read(key)
+            if (
+                entry is not None
+                and key in self._loaders
+                and key not in self._inflight
+                and entry.expires_at - now <= lead_seconds
+                and _same_day(entry, now)
+            ):
+                due.append((key, entry.expires_at))
+
+        # 다음 실행은 최근 요청 위주로 순위를 매기도록 경과 시간만큼 감쇠 (요청이 끊긴 셀은 추적 중단)
+        decay = 0.5 ** ((now - self._decayed_at) / WEATHER_PREFETCH_HALF_LIFE_SECONDS)
+        self._decayed_at = now
+        for key in list(self._popularity):
+            score = self._popularity[key] * decay
+            if score < _POPULARITY_MIN:
+                del self._popularity[key]
+                self._loaders.pop(key, None)
+            else:
+                self._popularity[key] = score
+        # 추적 셀 수는 저장소 크기까지만 (점수 낮은 셀부터 제외)
+        overflow = len(self._popularity) - self.store.max_entries
+        if overflow > 0:
+            for key, _ in sorted(self._popularity.items(), key=lambda item: item[1])[:overflow]:
+                del self._popularity[key]
+                self._loaders.pop(key, None)
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        refreshed = 0
+
+        async def refresh(key: str, expires_at: float):
+            nonlocal refreshed
+            async with semaphore:
+                loader = self._loaders.get(key)
+                if key in self._inflight or loader is None:
+                    return
+                # 저장소를 공유하는 다른 워커가 이미 갱신했으면 건너뜀
+                current = await self._read(key)
+                if current is not None and current.expires_at > expires_at:
+                    return
+                self._prefetches += 1
+                try:
+                    await self._start_load(key, loader, not_before=expires_at, prefetched=True)
+                except Exception:
+                    self._refresh_errors += 1
+                    return
+                refreshed += 1
+
+        await asyncio.gather(*(refresh(key, expires_at) for key, expires_at in due))
+        return refreshed
+
+    async def close(self):
+        """남은 저장소 쓰기를 마친 뒤 저장소 정리 (앱 종료 시 호출)"""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        self.store.close()
+
+    def stats(self) -> dict:
+        """적중률, 업스트림 호출/절약 수, stale 응답, 미리 갱신"""
+        lookups = self._hits + self._misses + self._coalesced + self._stale_served
+        return dict(
+            self.store.stats(),
+            grid_degrees=WEATHER_CACHE_GRID_DEGREES,
+            refresh_seconds=WEATHER_CACHE_REFRESH_SECONDS,
+            stale_seconds=self.stale_seconds,
+            hits=self._hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            inflight=len(self._inflight),
+            pending_writes=len(self._pending),
+            upstream_calls=self._upstream_calls,
+            upstream_errors=self._upstream_errors,
+            # 요청이 직접 기다린 업스트림 호출(miss)을 뺀 나머지는 캐시/합류/stale로 절약한 호출
+            upstream_calls_saved=lookups - self._misses,
+            hit_ratio=round((self._hits + self._coalesced + self._stale_served) / lookups, 4) if lookups else 0.0,
+            stale_served=self._stale_served,
+            avg_stale_seconds=round(self._stale_seconds_total / self._stale_served, 3) if self._stale_served else 0.0,
+            max_stale_seconds=round(self._max_stale_seconds, 3),
+            background_refreshes=self._background_refreshes,
+            refresh_errors=self._refresh_errors,
+            prefetches=self._prefetches,
+            prefetch_hits=self._prefetch_hits,
+            tracked_cells=len(self._popularity),
+        )
+
+
+class ForecastPrefetcher:
+    """
+    인기 셀 미리 갱신 스케줄러
+    - interval초마다 ForecastCache.prefetch() 실행 (만료 직전 셀을 백그라운드에서 갱신)
+    - interval은 lead_seconds보다 짧아야 만료 전에 갱신 기회가 있음
+    """
+
+    def __init__(
+        self,
+        cache: ForecastCache,
+        interval: float = WEATHER_PREFETCH_INTERVAL_SECONDS,
+        top_n: int = WEATHER_PREFETCH_TOP_N,
+        lead_seconds: float = WEATHER_PREFETCH_LEAD_SECONDS,
+        concurrency: int = WEATHER_PREFETCH_CONCURRENCY,
+    ):
+        self.cache = cache
+        self.interval = interval
+        self.top_n = top_n
+        self.lead_seconds = lead_seconds
+        self.concurrency = concurrency
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._refreshed = 0
+        self._last_run_at: Optional[float] = None
+
+    def start(self):
+        """주기 실행 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """앱 종료 시 태스크 취소"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"날씨 미리 갱신 실패: {e}")
+
+    async def run_once(self) -> int:
+        """한 번 실행 (갱신한 셀 수)"""
+        refreshed = await self.cache.prefetch(self.top_n, self.lead_seconds, self.concurrency)
+        self._runs += 1
+        self._refreshed += refreshed
+        self._last_run_at = time.time()
+        return refreshed
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "top_n": self.top_n,
+            "lead_seconds": self.lead_seconds,
+            "runs": self._runs,
+            "refreshed": self._refreshed,
+            "last_run_at": datetime.fromtimestamp(self._last_run_at).isoformat() if self._last_run_at else None,
+        }
+
+
+def _create_store():
+    if WEATHER_CACHE_BACKEND == "sqlite":
+        try:
+            return SQLiteForecastStore(WEATHER_CACHE_PATH, WEATHER_CACHE_MAX_CELLS)
+        except (sqlite3.Error, OSError) as e:
+            # 파일을 만들 수 없는 환경(읽기 전용 등)에서도 서버는 기동
+            print(f"날씨 캐시 파일을 열 수 없어 메모리 캐시 사용 ({WEATHER_CACHE_PATH}): {e}")
+    return MemoryForecastStore(WEATHER_CACHE_MAX_CELLS)
+
+
+forecast_cache = ForecastCache(_create_store())
+forecast_prefetcher = ForecastPrefetcher(forecast_cache)
+
+
+def get_weather_prefetch_stats() -> dict:
+    """미리 갱신 스케줄러 통계 (헬스 체크용)"""
+    return forecast_prefetcher.stats()
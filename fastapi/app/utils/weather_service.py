@@ -6,12 +6,16 @@ OpenWeatherMap API 서비스
 수정일: 2026-01-21 - weather 테이블 제거 마이그레이션
 """
 
+import asyncio
 import os
-import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import time
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+
+import httpx
 from dotenv import load_dotenv
 from .weather_mapping import get_weather_type_korean, get_weather_icon_url  # noqa: E402
+from .weather_cache import ForecastCache, GridCell, forecast_cache, grid_cell
 
 # ============================================
 # OpenWeatherMap API 설정
@@ -39,21 +43,231 @@ OPENWEATHER_BASE_URL = "https://api.openweathermap.org/data/3.0/onecall"
 DEFAULT_LAT = "37.5665"
 DEFAULT_LON = "126.9780"
 
+# ============================================
+# HTTP 클라이언트 설정 (앱 전체에서 공유, keep-alive로 DNS/TLS 핸드셰이크 재사용)
+# ============================================
+WEATHER_HTTP_CONNECT_TIMEOUT = float(os.getenv('WEATHER_HTTP_CONNECT_TIMEOUT', '3'))
+WEATHER_HTTP_TIMEOUT = float(os.getenv('WEATHER_HTTP_TIMEOUT', '10'))  # 읽기/쓰기/풀 대기 (초)
+WEATHER_HTTP_MAX_CONNECTIONS = int(os.getenv('WEATHER_HTTP_MAX_CONNECTIONS', '20'))
+WEATHER_HTTP_KEEPALIVE_SECONDS = float(os.getenv('WEATHER_HTTP_KEEPALIVE_SECONDS', '60'))
+# 동시에 진행하는 OpenWeatherMap 호출 수 상한 (API 호출량 폭주 방지)
+WEATHER_HTTP_MAX_CONCURRENCY = int(os.getenv('WEATHER_HTTP_MAX_CONCURRENCY', '10'))
+
+
+class WeatherHTTPClient:
+    """
+    OpenWeatherMap 호출용 공유 비동기 HTTP 클라이언트
+    - 앱 수명 주기(lifespan)에서 close() (처음 사용할 때 생성)
+    - 세마포어로 동시 호출 수 제한, 호출 지표 수집
+    """
+
+    def __init__(self, max_concurrency: int = WEATHER_HTTP_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._waiting = 0
+        self._wait_time_total = 0.0
+        self._request_time_total = 0.0
+
+    def _ensure(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(WEATHER_HTTP_TIMEOUT, connect=WEATHER_HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=WEATHER_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=WEATHER_HTTP_MAX_CONNECTIONS,
+                    keepalive_expiry=WEATHER_HTTP_KEEPALIVE_SECONDS,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def get_json(self, url: str, params: dict, timeout: Optional[float] = None):
+        """
+        GET 후 JSON 반환
+
+        Args:
+            timeout: 이번 호출의 읽기 타임아웃 (초, None이면 WEATHER_HTTP_TIMEOUT)
+
+        Raises:
+            httpx.HTTPError: 연결 실패, 타임아웃, 4xx/5xx 응답
+        """
+        client = self._ensure()
+        waited = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        started = time.monotonic()
+        self._wait_time_total += started - waited
+        self._in_flight += 1
+        self._requests += 1
+        try:
+            kwargs = {}
+            if timeout is not None:
+                kwargs["timeout"] = httpx.Timeout(timeout, connect=WEATHER_HTTP_CONNECT_TIMEOUT)
+            response = await client.get(url, params=params, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._request_time_total += time.monotonic() - started
+            self._semaphore.release()
+
+    async def close(self):
+        """연결 풀 정리 (앱 종료 시 호출)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        """호출 지표"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "requests": self._requests,
+            "errors": self._errors,
+            "avg_wait_ms": round(self._wait_time_total / self._requests * 1000, 3) if self._requests else 0.0,
+            "avg_request_ms": round(self._request_time_total / self._requests * 1000, 3) if self._requests else 0.0,
+        }
+
+
+weather_http_client = WeatherHTTPClient()
+
+
+def _parse_daily_item(daily_item: Dict) -> Dict:
+    """OneCall daily 항목 하나 → 날씨 데이터 Dict"""
+    # Unix timestamp를 datetime으로 변환
+    dt = datetime.fromtimestamp(daily_item["dt"])
+    # 날짜의 시작 시간 (00:00:00)으로 설정
+    weather_datetime = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    # 날씨 정보 추출
+    weather_info = daily_item["weather"][0] if daily_item.get("weather") else {}
+    weather_main = weather_info.get("main", "Clear")
+    icon_code = weather_info.get("icon", "01d")
+    
+    # 온도 정보 추출
+    temp = daily_item.get("temp", {})
+    
+    # OpenWeatherMap OneCall API 3.0 구조 확인
+    # temp 객체에는 min, max, day, night, eve, morn 필드가 있음
+    weather_low = temp.get("min", None)
+    weather_high = temp.get("max", None)
+    
+    # 값이 없거나 None인 경우 처리
+    if weather_low is None:
+        print(f"⚠️  Warning: temp.min not found in API response. temp keys: {list(temp.keys())}")
+        weather_low = 0.0
+    if weather_high is None:
+        print(f"⚠️  Warning: temp.max not found in API response. temp keys: {list(temp.keys())}")
+        weather_high = 0.0
+    
+    # 온도 값 검증 (한국 기준: -30~50도 범위)
+    weather_low = float(weather_low)
+    weather_high = float(weather_high)
+    
+    if weather_low < -30 or weather_low > 50:
+        print(f"⚠️  Warning: weather_low ({weather_low}°C) is out of normal range for Korea")
+    if weather_high < -30 or weather_high > 50:
+        print(f"⚠️  Warning: weather_high ({weather_high}°C) is out of normal range for Korea")
+    if weather_low > weather_high:
+        print(f"⚠️  Warning: weather_low ({weather_low}°C) is greater than weather_high ({weather_high}°C)")
+        # 최저/최고 온도 교정
+        weather_low, weather_high = weather_high, weather_low
+    
+    return {
+        "dt": daily_item["dt"],
+        "weather_datetime": weather_datetime,
+        "weather_type": get_weather_type_korean(weather_main),
+        "weather_type_en": weather_main,
+        "weather_low": weather_low,
+        "weather_high": weather_high,
+        "icon_code": icon_code,
+        "icon_url": get_weather_icon_url(icon_code)
+    }
+
+
+def validate_forecast_date(value) -> Optional[date]:
+    """
+    조회 날짜 파싱 + 범위 검증 (오늘 ~ 오늘+7일)
+    
+    Args:
+        value: datetime, date, "YYYY-MM-DD" 문자열 또는 None
+        
+    Returns:
+        date 또는 None (value가 None)
+        
+    Raises:
+        ValueError: 날짜 형식 오류, 과거 날짜, 8일 초과
+    """
+    if value is None:
+        return None
+    # datetime이면 date만 추출
+    if isinstance(value, datetime):
+        date_only = value.date()
+    elif isinstance(value, str):
+        # 문자열인 경우 파싱
+        try:
+            date_only = datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError(f"날짜 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 필요): {value}")
+    else:
+        date_only = value
+    
+    today = datetime.now().date()
+    max_date = today + timedelta(days=7)  # 오늘 포함 8일 = 오늘 + 7일
+    if date_only < today:
+        raise ValueError("과거 날짜의 실시간 예보는 조회할 수 없습니다.")
+    if date_only > max_date:
+        raise ValueError(f"예보는 오늘부터 최대 8일까지만 조회 가능합니다. (요청한 날짜: {date_only})")
+    return date_only
+
+
+def slice_forecast(forecast: List[Dict], start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict]:
+    """
+    셀 예보(8일치)에서 [start_date, end_date] 날짜만 (None이면 오늘부터 / 끝까지)
+    - 캐시가 자정 직전에 받은 예보여도 어제 항목은 제외
+    """
+    start_date = start_date or datetime.now().date()
+    return [
+        item for item in forecast
+        if item["weather_datetime"].date() >= start_date
+        and (end_date is None or item["weather_datetime"].date() <= end_date)
+    ]
+
 
 class WeatherService:
     """OpenWeatherMap API를 사용하여 날씨 데이터를 가져오는 서비스"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        http_client: Optional[WeatherHTTPClient] = None,
+        cache: Optional[ForecastCache] = None
+    ):
         """
         WeatherService 초기화
         
         Args:
             api_key: OpenWeatherMap API 키 (None이면 기본 하드코딩된 키 사용)
                      다른 API 키를 사용하고 싶을 때만 지정하세요.
+            http_client: HTTP 클라이언트 (None이면 앱 공유 클라이언트 weather_http_client)
+            cache: 격자 셀 예보 캐시 (None이면 앱 공유 캐시 forecast_cache)
                      
         사용 예시:
             # 기본 API 키 사용 (가장 일반적인 사용법)
             weather_service = WeatherService()
+            forecast = await weather_service.fetch_daily_forecast(lat, lon)
             
             # 다른 API 키 사용 (필요한 경우만)
             weather_service = WeatherService(api_key="your_api_key")
@@ -61,21 +275,103 @@ class WeatherService:
         self.api_key = api_key or OPENWEATHER_API_KEY
         if not self.api_key:
             raise ValueError("OpenWeatherMap API 키가 설정되지 않았습니다. api_key 파라미터를 제공하세요.")
+        self.http_client = http_client or weather_http_client
+        self.cache = cache or forecast_cache
+    
+    async def _fetch_cell_forecast(self, cell: GridCell, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        셀 중심 좌표로 OneCall API를 호출해 8일치 일별 예보 전체를 파싱 (캐시 miss일 때만 호출)
+        
+        Raises:
+            httpx.HTTPError: API 요청 실패 시
+            ValueError: API 응답이 유효하지 않을 때
+        """
+        params = {"lat": cell.lat, "lon": cell.lon, "units": "metric", "exclude": "minutely,alerts", "appid": self.api_key}
+        
+        try:
+            data = await self.http_client.get_json(OPENWEATHER_BASE_URL, params, timeout=timeout)
+            
+            if "daily" not in data or len(data["daily"]) == 0:
+                raise ValueError("API 응답에 'daily' 데이터가 없습니다.")
+            
+            return [_parse_daily_item(daily_item) for daily_item in data["daily"]]
+            
+        except httpx.HTTPError as e:
+            raise httpx.HTTPError(f"OpenWeatherMap API 요청 실패: {str(e)}") from e
+        except (KeyError, ValueError, TypeError) as e:
+            raise ValueError(f"API 응답 파싱 실패: {str(e)}") from e
     
-    def fetch_daily_forecast(
+    async def get_cell_forecast(self, lat, lon, timeout: Optional[float] = None) -> Tuple[GridCell, List[Dict], str]:
+        """
+        좌표가 속한 격자 셀의 8일치 예보 (캐시 경유)
+        
+        Returns:
+            (셀, 예보 목록, 캐시 상태 "hit" | "stale" | "miss" | "coalesced")
+            stale: 만료된 마지막 예보를 바로 응답 (백그라운드에서 갱신 중)
+            예보 목록은 캐시와 공유하므로 수정하지 말 것
+        """
+        cell = grid_cell(float(lat), float(lon))
+        forecast, status = await self.cache.get(cell.key, lambda: self._fetch_cell_forecast(cell, timeout))
+        return cell, forecast, status
+    
+    async def get_cell_forecasts(
+        self,
+        cells: List[GridCell],
+        concurrency: int,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Tuple[object, str]]:
+        """
+        여러 셀의 예보를 한 번에 조회 (배치 엔드포인트용)
+        - 캐시 적중 셀은 바로 채우고, 나머지 셀만 최대 concurrency개씩 동시에 캐시 조회
+          (stale 셀은 업스트림을 기다리지 않고 바로 응답, miss 셀만 업스트림 호출)
+        - 한 셀의 실패가 다른 셀 결과에 영향을 주지 않음
+        
+        Returns:
+            {셀 키: (예보 목록, "hit" | "stale" | "miss" | "coalesced")}
+            실패한 셀은 (예외, "error")
+        """
+        results: Dict[str, Tuple[object, str]] = {}
+        misses: Dict[str, GridCell] = {}
+        for cell in cells:
+            if cell.key in results or cell.key in misses:
+                continue
+            forecast = await self.cache.lookup(cell.key)
+            if forecast is not None:
+                results[cell.key] = (forecast, "hit")
+            else:
+                misses[cell.key] = cell
+        
+        if misses:
+            semaphore = asyncio.Semaphore(max(concurrency, 1))
+            
+            async def load(cell: GridCell):
+                async with semaphore:
+                    try:
+                        results[cell.key] = await self.cache.get(
+                            cell.key, lambda: self._fetch_cell_forecast(cell, timeout)
+                        )
+                    except (httpx.HTTPError, ValueError) as e:
+                        results[cell.key] = (e, "error")
+            
+            await asyncio.gather(*(load(cell) for cell in misses.values()))
+        return results
+    
+    async def fetch_daily_forecast(
         self, 
         lat: str = DEFAULT_LAT, 
         lon: str = DEFAULT_LON,
-        start_date: Optional[datetime] = None
+        start_date: Optional[datetime] = None,
+        timeout: Optional[float] = None
     ) -> List[Dict]:
         """
-        OpenWeatherMap OneCall API에서 일별 예보 가져오기 (DB 저장 없이)
+        OpenWeatherMap OneCall API에서 일별 예보 가져오기 (DB 저장 없이, 격자 셀 캐시 경유)
         
         Args:
             lat: 위도 (기본값: 서울)
             lon: 경도 (기본값: 서울)
             start_date: 시작 날짜 (None이면 오늘 포함 8일치 모두 반환)
                        지정되면 해당 날짜부터 남은 날짜만 반환 (최대 8일)
+            timeout: 이번 호출의 읽기 타임아웃 (초, None이면 WEATHER_HTTP_TIMEOUT)
             
         Returns:
             List[Dict]: 날씨 데이터 리스트
@@ -92,127 +388,34 @@ class WeatherService:
             - icon_url: 아이콘 URL
             
         Raises:
-            requests.RequestException: API 요청 실패 시
+            httpx.HTTPError: API 요청 실패 시
             ValueError: API 응답이 유효하지 않을 때, 날짜 범위 초과 시
             
         예시:
             - start_date=None: 오늘부터 8일치 모두 반환
             - start_date=오늘+3일: 오늘+3일부터 5일치만 반환 (총 8일 중 남은 5일)
         """
-        url = f"{OPENWEATHER_BASE_URL}?lat={lat}&lon={lon}&units=metric&exclude=minutely,alerts&appid={self.api_key}"
-        
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if "daily" not in data or len(data["daily"]) == 0:
-                raise ValueError("API 응답에 'daily' 데이터가 없습니다.")
-            
-            # 날짜 검증
-            today = datetime.now().date()
-            max_date = today + timedelta(days=7)  # 오늘 포함 8일 = 오늘 + 7일
-            
-            start_date_only = None
-            if start_date:
-                # start_date가 datetime이면 date만 추출
-                if isinstance(start_date, datetime):
-                    start_date_only = start_date.date()
-                elif isinstance(start_date, str):
-                    # 문자열인 경우 파싱
-                    try:
-                        start_date_only = datetime.strptime(start_date, "%Y-%m-%d").date()
-                    except ValueError:
-                        raise ValueError(f"날짜 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 필요): {start_date}")
-                else:
-                    start_date_only = start_date
-                
-                if start_date_only < today:
-                    raise ValueError("과거 날짜의 실시간 예보는 조회할 수 없습니다.")
-                
-                if start_date_only > max_date:
-                    raise ValueError(f"예보는 오늘부터 최대 8일까지만 조회 가능합니다. (요청한 날짜: {start_date_only})")
-            
-            result = []
-            
-            for daily_item in data["daily"]:
-                # Unix timestamp를 datetime으로 변환
-                dt = datetime.fromtimestamp(daily_item["dt"])
-                # 날짜의 시작 시간 (00:00:00)으로 설정
-                weather_datetime = dt.replace(hour=0, minute=0, second=0, microsecond=0)
-                weather_date = weather_datetime.date()
-                
-                # 날짜 필터링
-                if start_date_only:
-                    # start_date부터만 포함 (해당 날짜부터 남은 날짜만)
-                    if weather_date < start_date_only:
-                        continue
-                
-                # 날씨 정보 추출
-                weather_info = daily_item["weather"][0] if daily_item.get("weather") else {}
-                weather_main = weather_info.get("main", "Clear")
-                icon_code = weather_info.get("icon", "01d")
-                
-                # 온도 정보 추출
-                temp = daily_item.get("temp", {})
-                
-                # OpenWeatherMap OneCall API 3.0 구조 확인
-                # temp 객체에는 min, max, day, night, eve, morn 필드가 있음
-                weather_low = temp.get("min", None)
-                weather_high = temp.get("max", None)
-                
-                # 값이 없거나 None인 경우 처리
-                if weather_low is None:
-                    print(f"⚠️  Warning: temp.min not found in API response. temp keys: {list(temp.keys())}")
-                    weather_low = 0.0
-                if weather_high is None:
-                    print(f"⚠️  Warning: temp.max not found in API response. temp keys: {list(temp.keys())}")
-                    weather_high = 0.0
-                
-                # 온도 값 검증 (한국 기준: -30~50도 범위)
-                weather_low = float(weather_low)
-                weather_high = float(weather_high)
-                
-                if weather_low < -30 or weather_low > 50:
-                    print(f"⚠️  Warning: weather_low ({weather_low}°C) is out of normal range for Korea")
-                if weather_high < -30 or weather_high > 50:
-                    print(f"⚠️  Warning: weather_high ({weather_high}°C) is out of normal range for Korea")
-                if weather_low > weather_high:
-                    print(f"⚠️  Warning: weather_low ({weather_low}°C) is greater than weather_high ({weather_high}°C)")
-                    # 최저/최고 온도 교정
-                    weather_low, weather_high = weather_high, weather_low
-                
-                result.append({
-                    "dt": daily_item["dt"],
-                    "weather_datetime": weather_datetime,
-                    "weather_type": get_weather_type_korean(weather_main),
-                    "weather_type_en": weather_main,
-                    "weather_low": weather_low,
-                    "weather_high": weather_high,
-                    "icon_code": icon_code,
-                    "icon_url": get_weather_icon_url(icon_code)
-                })
-            
-            return result
-            
-        except requests.RequestException as e:
-            raise requests.RequestException(f"OpenWeatherMap API 요청 실패: {str(e)}") from e
-        except (KeyError, ValueError, TypeError) as e:
-            raise ValueError(f"API 응답 파싱 실패: {str(e)}") from e
+        # 날짜 검증을 먼저 (잘못된 요청은 업스트림을 호출하지 않음)
+        start_date_only = validate_forecast_date(start_date)
+        _, forecast, _ = await self.get_cell_forecast(lat, lon, timeout)
+        return slice_forecast(forecast, start_date_only)
     
-    def fetch_single_day_weather(
+    async def fetch_single_day_weather(
         self,
         lat: str = DEFAULT_LAT,
         lon: str = DEFAULT_LON,
-        target_date: Optional[datetime] = None
+        target_date: Optional[datetime] = None,
+        timeout: Optional[float] = None
     ) -> Dict:
         """
         OpenWeatherMap OneCall API에서 특정 날짜의 날씨 데이터만 가져오기 (DB 저장 없이, 하루치만)
+        (8일치를 받은 셀 캐시에서 하루만 꺼냄)
         
         Args:
             lat: 위도 (기본값: 서울)
             lon: 경도 (기본값: 서울)
             target_date: 조회할 날짜 (None이면 오늘 날짜, 최대 8일까지만 가능)
+            timeout: 이번 호출의 읽기 타임아웃 (초, None이면 WEATHER_HTTP_TIMEOUT)
             
         Returns:
             Dict: 날씨 데이터 (하루치)
@@ -227,31 +430,14 @@ class WeatherService:
             - icon_url: 아이콘 URL
             
         Raises:
-            requests.RequestException: API 요청 실패 시
+            httpx.HTTPError: API 요청 실패 시
             ValueError: API 응답이 유효하지 않을 때, 날짜 범위 초과 시, 해당 날짜 데이터가 없을 때
         """
-        # 날짜 파싱
-        target_date_only = None
-        if target_date:
-            if isinstance(target_date, datetime):
-                target_date_only = target_date.date()
-            elif isinstance(target_date, str):
-                try:
-                    target_date_only = datetime.strptime(target_date, "%Y-%m-%d").date()
-                except ValueError:
-                    raise ValueError(f"날짜 형식이 올바르지 않습니다. (YYYY-MM-DD 형식 필요): {target_date}")
-            else:
-                target_date_only = target_date
-        else:
-            # None이면 오늘 날짜
-            target_date_only = datetime.now().date()
+        # None이면 오늘 날짜
+        target_date_only = validate_forecast_date(target_date) or datetime.now().date()
         
-        # fetch_daily_forecast를 사용하여 해당 날짜부터 가져오기 (하루만 필요)
-        forecast_list = self.fetch_daily_forecast(
-            lat=lat,
-            lon=lon,
-            start_date=target_date_only
-        )
+        _, forecast, _ = await self.get_cell_forecast(lat, lon, timeout)
+        forecast_list = slice_forecast(forecast, target_date_only)
         
         if not forecast_list or len(forecast_list) == 0:
             raise ValueError(f"해당 날짜({target_date_only})의 날씨 데이터를 찾을 수 없습니다.")
@@ -260,6 +446,20 @@ class WeatherService:
         return forecast_list[0]
 
 
+# 라우터에서 공유하는 기본 서비스 (요청마다 생성하지 않음)
+weather_service = WeatherService()
+
+
+def get_weather_http_stats() -> dict:
+    """OpenWeatherMap HTTP 클라이언트 통계 (헬스 체크용)"""
+    return weather_http_client.stats()
+
+
+def get_weather_cache_stats() -> dict:
+    """예보 캐시 통계 (헬스 체크용)"""
+    return forecast_cache.stats()
+
+
 # ============================================================
 # 생성 이력
 # ============================================================
@@ -284,3 +484,28 @@ class WeatherService:
 #   - save_weather_to_db() 메서드 삭제
 #   - fetch_daily_forecast(), fetch_single_day_weather()만 유지
 #   - OpenWeatherMap API 직접 호출만 지원
+#
+# 2026-10-18: 공유 비동기 HTTP 클라이언트 적용
+#   - requests.get(요청마다 새 연결, 이벤트 루프 블로킹) → httpx.AsyncClient 공유 (keep-alive 연결 풀)
+#   - WeatherHTTPClient 추가 (동시 호출 수 제한, 호출 지표), 앱 종료 시 close()
+#   - fetch_daily_forecast(), fetch_single_day_weather()를 async로 변경, 호출별 timeout 인자 추가
+#   - weather_service 공유 인스턴스 추가
+#
+# 2026-10-18: 격자 셀 예보 캐시 + single-flight
+#   - 좌표를 WEATHER_CACHE_GRID_DEGREES 격자로 맞춰 셀 중심 좌표로 호출, 8일치 파싱 결과를 셀 단위로 캐시
+#   - fetch_daily_forecast(), fetch_single_day_weather()는 캐시된 8일치를 잘라서 반환 (하루치도 같은 캐시 사용)
+#   - 날짜 검증을 업스트림 호출 전에 수행 (validate_forecast_date), 일별 항목 파싱은 _parse_daily_item으로 분리
+#   - get_cell_forecast(), slice_forecast() 추가
+#
+# 2026-10-18: 여러 좌표 일괄 조회
+#   - get_cell_forecasts() 추가 (캐시 적중 셀은 바로, miss 셀만 세마포어로 동시 호출)
+#
+# 2026-10-18: stale-while-revalidate + 인기 셀 미리 갱신 (weather_cache)
+#   - 만료된 예보는 같은 날짜 안에서 WEATHER_CACHE_STALE_SECONDS 동안 바로 응답하고 백그라운드 갱신
+#   - 캐시 상태에 "stale" 추가
+#
+# 2026-10-18: 예보 캐시 저장소를 SQLite 파일(WAL)로 변경 (weather_cache)
+#   - 같은 서버의 워커들이 공유하고 재시작 후에도 유지 (WEATHER_CACHE_BACKEND=memory면 기존 프로세스 내 캐시)
+#
+# 2026-10-18: 예보 캐시 저장소 접근을 비동기로 (cache.lookup() await)
+#   - SQLite 파일 I/O를 이벤트 루프 밖 전용 스레드에서 실행 (잠금 대기 중에도 루프가 멈추지 않음)
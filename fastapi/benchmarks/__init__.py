@@ -0,0 +1,3 @@
+"""
+성능 측정 스크립트 (fastapi 디렉터리에서 python -m benchmarks.<이름> 으로 실행)
+"""
@@ -0,0 +1,86 @@
+"""
+백업 다운로드 응답 생성 벤치마크
+2년치 합성 스냅샷으로 두 방식의 응답 생성 시간/메모리 비교
+- parse: json.loads → FastAPI jsonable_encoder → JSONResponse (변경 전)
+- splice: 저장된 payload 바이트를 응답 envelope에 그대로 삽입 (envelope_response)
+
+실행 (fastapi 디렉터리에서):
+    python -m benchmarks.backup_download
+    python -m benchmarks.backup_download --habits 50 --iterations 30
+"""
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+
+def _run_variant(variant: str, habits: int, iterations: int) -> dict:
+    """한 방식만 실행 (RSS 측정을 위해 별도 프로세스에서 호출)"""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app.utils.backup_storage import envelope_response
+    from benchmarks.synthetic_snapshot import build_snapshot
+
+    payload_bytes = json.dumps(build_snapshot(habit_count=habits), ensure_ascii=False).encode("utf-8")
+    checksum = "0" * 64
+    updated_at = "2026-01-01T00:00:00"
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    body_size = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        if variant == "parse":
+            content = {"payload": json.loads(payload_bytes), "checksum": checksum, "payload_updated_at": updated_at}
+            response = JSONResponse(content=jsonable_encoder(content))
+        else:
+            response = envelope_response(payload_bytes, checksum, updated_at)
+        timings.append(time.perf_counter() - started)
+        body_size = len(response.body)
+        del response
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "variant": variant,
+        "payload_bytes": len(payload_bytes),
+        "body_bytes": body_size,
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": sorted(timings)[int(len(timings) * 0.95) - 1] * 1000,
+        # ru_maxrss: Linux는 KB 단위
+        "rss_growth_mb": (peak_rss - baseline_rss) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--variant", choices=["parse", "splice"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(_run_variant(args.variant, args.habits, args.iterations)))
+        return
+
+    results = []
+    for variant in ("parse", "splice"):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.backup_download", "--variant", variant,
+             "--habits", str(args.habits), "--iterations", str(args.iterations)],
+            check=True, capture_output=True, text=True,
+        )
+        results.append(json.loads(out.stdout))
+
+    print(f"payload: {results[0]['payload_bytes'] / 1024:.0f} KB, habits={args.habits}, iterations={args.iterations}")
+    print(f"{'variant':<8} {'median ms':>10} {'p95 ms':>10} {'RSS +MB':>10}")
+    for r in results:
+        print(f"{r['variant']:<8} {r['median_ms']:>10.2f} {r['p95_ms']:>10.2f} {r['rss_growth_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
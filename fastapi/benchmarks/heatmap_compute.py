@@ -0,0 +1,91 @@
+"""
+서버 히트맵 계산 벤치마크
+합성 스냅샷(기본 730일 × 50습관)으로 두 방식의 계산 시간 비교 + 결과 일치 확인
+- loop: 날짜마다 습관/로그를 순회 (Flutter computeAndSaveHeatmapSnapshot을 그대로 옮긴 방식)
+- vectorized: 습관 × 날짜 배열 집계 (app.utils.heatmap.compute_heatmap_snapshots)
+
+실행 (fastapi 디렉터리에서):
+    python -m benchmarks.heatmap_compute
+    python -m benchmarks.heatmap_compute --habits 20 --days 365 --iterations 10
+"""
+
+import argparse
+import statistics
+import time
+from datetime import timedelta
+
+from app.utils.heatmap import HEATMAP_UTC_OFFSET_MINUTES, _local_date, compute_heatmap_snapshots, snapshot_end_date
+from benchmarks.synthetic_snapshot import build_snapshot
+
+
+def compute_loop(habits, logs, end_date, days, utc_offset_minutes=HEATMAP_UTC_OFFSET_MINUTES):
+    """날짜별 순회 (비교 기준)"""
+    offset = timedelta(minutes=utc_offset_minutes)
+    logs_by_date = {}
+    for log in logs:
+        if not log["is_deleted"]:
+            logs_by_date.setdefault(log["date"], []).append(log)
+
+    snapshots = []
+    for d in range(days, -1, -1):
+        day = end_date - timedelta(days=d)
+        date_str = day.isoformat()
+        active = [
+            h for h in habits
+            if _local_date(h["created_at"], offset) <= day
+            and (not h["is_deleted"] or _local_date(h["updated_at"], offset) > day)
+        ]
+        day_logs = logs_by_date.get(date_str, [])
+        if not active:
+            habit_ids = {log["habit_id"] for log in day_logs}
+            active = [h for h in habits if h["id"] in habit_ids]
+            if not active:
+                continue
+        log_by_habit = {log["habit_id"]: log for log in day_logs}
+        achieved = sum(1 for h in active if (log_by_habit.get(h["id"]) or {}).get("count", 0) >= h["daily_target"])
+        total = len(active)
+        level = 0 if achieved == 0 else min(4, max(1, -(-achieved * 4 // total)))
+        snapshots.append({"date": date_str, "achieved": achieved, "total": total, "level": level})
+    return snapshots
+
+
+def _measure(fn, iterations: int) -> dict:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": sorted(timings)[max(int(len(timings) * 0.95) - 1, 0)] * 1000,
+        "result": result,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=50)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    snapshot = build_snapshot(days=args.days, habit_count=args.habits)
+    habits, logs = snapshot["habits"], snapshot["logs"]
+    end_date = snapshot_end_date(snapshot["exported_at"])
+    days = args.days - 1  # 합성 스냅샷의 첫날 ~ 기준일
+
+    results = {
+        "loop": _measure(lambda: compute_loop(habits, logs, end_date, days), args.iterations),
+        "vectorized": _measure(lambda: compute_heatmap_snapshots(habits, logs, end_date, days), args.iterations),
+    }
+
+    print(f"habits={args.habits}, days={args.days}, logs={len(logs)}, iterations={args.iterations}")
+    print(f"{'variant':<11} {'median ms':>10} {'p95 ms':>10}")
+    for variant, r in results.items():
+        print(f"{variant:<11} {r['median_ms']:>10.2f} {r['p95_ms']:>10.2f}")
+    print("results match:", results["loop"]["result"] == results["vectorized"]["result"])
+    print("matches client snapshots:", results["vectorized"]["result"] == snapshot["heatmap_snapshots"])
+
+
+if __name__ == "__main__":
+    main()
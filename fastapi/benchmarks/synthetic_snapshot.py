@@ -0,0 +1,84 @@
+"""
+벤치마크용 합성 백업 스냅샷
+Flutter BackupService.buildPayload()와 같은 구조 (schema_version 1)
+- categories, habits, logs(최근 days일), heatmap_snapshots
+"""
+
+import random
+import uuid
+from datetime import date, timedelta
+
+
+def build_snapshot(days: int = 730, habit_count: int = 20, seed: int = 0, today: date = None) -> dict:
+    """
+    합성 스냅샷 생성
+
+    Args:
+        days: 로그/히트맵 기간 (기본 2년)
+        habit_count: 습관 수
+        seed: 난수 시드 (같은 값이면 같은 스냅샷)
+        today: 기준일 (None이면 오늘)
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    start = today - timedelta(days=days - 1)
+    created_at = f"{start.isoformat()}T00:00:00.000Z"
+
+    def _uuid() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    categories = [
+        {"id": _uuid(), "name": name, "color_value": 0xFF000000 + rng.randrange(0xFFFFFF), "sort_order": i}
+        for i, name in enumerate(["건강", "공부", "생활", "운동"])
+    ]
+    habits = []
+    for i in range(habit_count):
+        habits.append({
+            "id": _uuid(),
+            "title": f"습관 {i + 1}",
+            "daily_target": rng.choice([1, 1, 1, 2, 3, 5]),
+            "sort_order": i,
+            "category_id": rng.choice(categories)["id"],
+            "deadline_reminder_time": rng.choice([None, "21:00", "22:30"]),
+            "is_active": 1,
+            "is_deleted": 0,
+            "is_dirty": 0,
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+
+    logs = []
+    heatmap_snapshots = []
+    for d in range(days):
+        day = (start + timedelta(days=d)).isoformat()
+        achieved = 0
+        for habit in habits:
+            if rng.random() < 0.3:
+                continue  # 기록 없는 날
+            count = rng.randint(0, habit["daily_target"] + 1)
+            completed = count >= habit["daily_target"]
+            achieved += int(completed)
+            logs.append({
+                "id": _uuid(),
+                "habit_id": habit["id"],
+                "date": day,
+                "count": count,
+                "is_completed": int(completed),
+                "is_deleted": 0,
+                "is_dirty": 0,
+                "created_at": f"{day}T09:00:00.000Z",
+                "updated_at": f"{day}T21:00:00.000Z",
+            })
+        total = len(habits)
+        level = 0 if achieved == 0 else min(4, max(1, -(-achieved * 4 // total)))
+        heatmap_snapshots.append({"date": day, "achieved": achieved, "total": total, "level": level})
+
+    return {
+        "schema_version": 1,
+        "device_uuid": _uuid(),
+        "exported_at": f"{today.isoformat()}T12:00:00.000Z",
+        "categories": categories,
+        "habits": habits,
+        "logs": logs,
+        "heatmap_snapshots": heatmap_snapshots,
+    }
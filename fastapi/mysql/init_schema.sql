@@ -15,7 +15,8 @@ CREATE TABLE IF NOT EXISTS devices (
   email VARCHAR(255) DEFAULT NULL,
   email_verified_at DATETIME DEFAULT NULL,
   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  INDEX idx_email_verified (email, email_verified_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- 3. email_verifications: 이메일 6자리 코드 인증
@@ -29,16 +30,106 @@ CREATE TABLE IF NOT EXISTS email_verifications (
   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
   INDEX idx_email (email),
   INDEX idx_device_uuid (device_uuid),
+  INDEX idx_expires (expires_at),
   FOREIGN KEY (device_uuid) REFERENCES devices(device_uuid) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- 4. backups: SQLite 스냅샷 JSON (device당 최신 1개)
+--    payload_blob: payload_codec(gzip/zstd)으로 압축한 JSON
+--    payload_json: 압축 도입 이전 행 호환용 (payload_codec='identity', 신규 행은 NULL)
 CREATE TABLE IF NOT EXISTS backups (
   device_uuid CHAR(36) PRIMARY KEY,
-  payload_json LONGTEXT NOT NULL,
+  payload_json LONGTEXT DEFAULT NULL,
+  payload_blob LONGBLOB DEFAULT NULL,
+  payload_codec VARCHAR(16) NOT NULL DEFAULT 'identity',
   checksum CHAR(64) NOT NULL,
   payload_updated_at DATETIME NOT NULL,
   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
   updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   FOREIGN KEY (device_uuid) REFERENCES devices(device_uuid) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 5. backup_chunks: 버전 이력 청크 (내용 주소 기반, 같은 내용은 한 번만 저장)
+--    chunk_hash: 청크 JSON(키 정렬)의 SHA256, chunk_blob: chunk_codec으로 압축
+CREATE TABLE IF NOT EXISTS backup_chunks (
+  chunk_hash CHAR(64) PRIMARY KEY,
+  chunk_codec VARCHAR(16) NOT NULL,
+  chunk_blob LONGBLOB NOT NULL,
+  raw_size INT NOT NULL,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 6. backup_versions: device별 백업 버전 (최근 BACKUP_VERSION_RETENTION개 보관)
+CREATE TABLE IF NOT EXISTS backup_versions (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  device_uuid CHAR(36) NOT NULL,
+  checksum CHAR(64) NOT NULL,
+  payload_updated_at DATETIME NOT NULL,
+  raw_size INT NOT NULL,
+  stored_size INT NOT NULL,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_device_id (device_uuid, id),
+  FOREIGN KEY (device_uuid) REFERENCES devices(device_uuid) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 7. backup_version_chunks: 버전 manifest (seq 순서로 청크를 이어 붙여 스냅샷 조립)
+CREATE TABLE IF NOT EXISTS backup_version_chunks (
+  version_id BIGINT NOT NULL,
+  seq INT NOT NULL,
+  section VARCHAR(32) NOT NULL,
+  chunk_hash CHAR(64) NOT NULL,
+  PRIMARY KEY (version_id, seq),
+  INDEX idx_chunk_hash (chunk_hash),
+  FOREIGN KEY (version_id) REFERENCES backup_versions(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 8. email_latest_backups: 이메일별 최신 백업 포인터 (복구 조회를 PK 1회 조회로)
+--    백업 업로드/이메일 인증 트랜잭션에서 갱신, 인증됐지만 백업이 없으면 device_uuid NULL
+CREATE TABLE IF NOT EXISTS email_latest_backups (
+  email VARCHAR(255) PRIMARY KEY,
+  device_uuid CHAR(36) DEFAULT NULL,
+  checksum CHAR(64) DEFAULT NULL,
+  payload_updated_at DATETIME DEFAULT NULL,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 9. upload_sessions: 분할 업로드 세션 (commit 전까지 청크만 보관, expires_at 이후 무효)
+CREATE TABLE IF NOT EXISTS upload_sessions (
+  id CHAR(32) PRIMARY KEY,
+  device_uuid CHAR(36) NOT NULL,
+  content_encoding VARCHAR(16) NOT NULL DEFAULT 'identity',
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  expires_at DATETIME NOT NULL,
+  INDEX idx_expires (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 10. upload_session_chunks: 세션별 청크 (index 순서로 이어 붙여 commit)
+CREATE TABLE IF NOT EXISTS upload_session_chunks (
+  session_id CHAR(32) NOT NULL,
+  chunk_index INT NOT NULL,
+  size INT NOT NULL,
+  chunk_sha256 CHAR(64) NOT NULL,
+  data LONGBLOB NOT NULL,
+  PRIMARY KEY (session_id, chunk_index),
+  FOREIGN KEY (session_id) REFERENCES upload_sessions(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 11. email_outbox: 이메일 발송 대기열 (요청 처리 중 저장, 백그라운드 발송기가 SMTP로 발송)
+--     발송 성공 시 삭제, failed 행은 params(인증 코드) 삭제 후 정리 작업이 삭제
+CREATE TABLE IF NOT EXISTS email_outbox (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  kind VARCHAR(32) NOT NULL,
+  to_email VARCHAR(255) NOT NULL,
+  params TEXT DEFAULT NULL,
+  dedupe_key VARCHAR(64) DEFAULT NULL,
+  status VARCHAR(16) NOT NULL DEFAULT 'pending',
+  attempts INT NOT NULL DEFAULT 0,
+  next_attempt_at DATETIME(3) NOT NULL,
+  locked_until DATETIME(3) DEFAULT NULL,
+  claim_token CHAR(32) DEFAULT NULL,
+  last_error VARCHAR(255) DEFAULT NULL,
+  expires_at DATETIME(3) NOT NULL,
+  created_at DATETIME(3) NOT NULL,
+  INDEX idx_status_next (status, next_attempt_at),
+  INDEX idx_dedupe_key (dedupe_key)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
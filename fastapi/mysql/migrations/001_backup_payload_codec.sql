@@ -0,0 +1,8 @@
+-- 001: backups payload 압축 저장 (payload_blob + payload_codec)
+-- 기존 행은 payload_json(LONGTEXT) 그대로 두고 payload_codec='identity'로 읽음
+-- 실행: mysql -u user -p habitcell_db < migrations/001_backup_payload_codec.sql
+
+ALTER TABLE backups
+  MODIFY COLUMN payload_json LONGTEXT DEFAULT NULL,
+  ADD COLUMN payload_blob LONGBLOB DEFAULT NULL AFTER payload_json,
+  ADD COLUMN payload_codec VARCHAR(16) NOT NULL DEFAULT 'identity' AFTER payload_blob;
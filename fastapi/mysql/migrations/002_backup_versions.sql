@@ -0,0 +1,33 @@
+-- 002: 백업 버전 이력 + 내용 주소 기반 청크 저장
+-- 기존 backups 행은 그대로, 버전은 이후 내용이 바뀐 업로드부터 쌓임
+-- 실행: mysql -u user -p habitcell_db < migrations/002_backup_versions.sql
+
+CREATE TABLE IF NOT EXISTS backup_chunks (
+  chunk_hash CHAR(64) PRIMARY KEY,
+  chunk_codec VARCHAR(16) NOT NULL,
+  chunk_blob LONGBLOB NOT NULL,
+  raw_size INT NOT NULL,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS backup_versions (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  device_uuid CHAR(36) NOT NULL,
+  checksum CHAR(64) NOT NULL,
+  payload_updated_at DATETIME NOT NULL,
+  raw_size INT NOT NULL,
+  stored_size INT NOT NULL,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_device_id (device_uuid, id),
+  FOREIGN KEY (device_uuid) REFERENCES devices(device_uuid) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS backup_version_chunks (
+  version_id BIGINT NOT NULL,
+  seq INT NOT NULL,
+  section VARCHAR(32) NOT NULL,
+  chunk_hash CHAR(64) NOT NULL,
+  PRIMARY KEY (version_id, seq),
+  INDEX idx_chunk_hash (chunk_hash),
+  FOREIGN KEY (version_id) REFERENCES backup_versions(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,36 @@
+-- 003: 이메일별 최신 백업 포인터 + devices 이메일 인덱스
+-- 복구 조회(status, backup)를 devices 전체 스캔 + 정렬 대신 PK 1회 조회로
+-- 실행: mysql -u user -p habitcell_db < migrations/003_email_latest_backups.sql
+-- (MySQL 8.0 이상, 서버 배포 전에 실행)
+
+ALTER TABLE devices
+  ADD INDEX idx_email_verified (email, email_verified_at);
+
+CREATE TABLE IF NOT EXISTS email_latest_backups (
+  email VARCHAR(255) PRIMARY KEY,
+  device_uuid CHAR(36) DEFAULT NULL,
+  checksum CHAR(64) DEFAULT NULL,
+  payload_updated_at DATETIME DEFAULT NULL,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 백필: 인증된 이메일마다 최신 백업 1건
+INSERT INTO email_latest_backups (email, device_uuid, checksum, payload_updated_at)
+SELECT email, device_uuid, checksum, payload_updated_at
+FROM (
+  SELECT d.email, b.device_uuid, b.checksum, b.payload_updated_at,
+         ROW_NUMBER() OVER (PARTITION BY d.email ORDER BY b.payload_updated_at DESC) AS rn
+  FROM devices d
+  JOIN backups b ON b.device_uuid = d.device_uuid
+  WHERE d.email IS NOT NULL AND d.email_verified_at IS NOT NULL
+) ranked
+WHERE rn = 1
+ON DUPLICATE KEY UPDATE
+  device_uuid = VALUES(device_uuid),
+  checksum = VALUES(checksum),
+  payload_updated_at = VALUES(payload_updated_at);
+
+-- 인증됐지만 백업이 없는 이메일은 NULL 포인터
+INSERT IGNORE INTO email_latest_backups (email)
+SELECT DISTINCT email FROM devices
+WHERE email IS NOT NULL AND email_verified_at IS NOT NULL;
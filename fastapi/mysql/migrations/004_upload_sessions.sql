@@ -0,0 +1,22 @@
+-- 004: 분할 업로드 세션 (큰 스냅샷을 청크로 나눠 업로드, 끊겨도 이어서 전송)
+-- 실행: mysql -u user -p habitcell_db < migrations/004_upload_sessions.sql
+-- (서버 배포 전에 실행)
+
+CREATE TABLE IF NOT EXISTS upload_sessions (
+  id CHAR(32) PRIMARY KEY,
+  device_uuid CHAR(36) NOT NULL,
+  content_encoding VARCHAR(16) NOT NULL DEFAULT 'identity',
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  expires_at DATETIME NOT NULL,
+  INDEX idx_expires (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS upload_session_chunks (
+  session_id CHAR(32) NOT NULL,
+  chunk_index INT NOT NULL,
+  size INT NOT NULL,
+  chunk_sha256 CHAR(64) NOT NULL,
+  data LONGBLOB NOT NULL,
+  PRIMARY KEY (session_id, chunk_index),
+  FOREIGN KEY (session_id) REFERENCES upload_sessions(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,5 @@
+-- 005: 만료된 인증 코드 정리용 인덱스 (정리 작업이 expires_at 순서로 배치 삭제)
+-- 실행: mysql -u user -p habitcell_db < migrations/005_email_verifications_expires_index.sql
+-- (서버 배포 전에 실행)
+
+ALTER TABLE email_verifications ADD INDEX idx_expires (expires_at);
@@ -0,0 +1,21 @@
+-- 006: 이메일 발송 대기열 (인증 코드 메일을 요청 처리 중 저장만 하고 백그라운드에서 발송)
+-- 실행: mysql -u user -p habitcell_db < migrations/006_email_outbox.sql
+-- (서버 배포 전에 실행)
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  kind VARCHAR(32) NOT NULL,
+  to_email VARCHAR(255) NOT NULL,
+  params TEXT DEFAULT NULL,
+  dedupe_key VARCHAR(64) DEFAULT NULL,
+  status VARCHAR(16) NOT NULL DEFAULT 'pending',
+  attempts INT NOT NULL DEFAULT 0,
+  next_attempt_at DATETIME(3) NOT NULL,
+  locked_until DATETIME(3) DEFAULT NULL,
+  claim_token CHAR(32) DEFAULT NULL,
+  last_error VARCHAR(255) DEFAULT NULL,
+  expires_at DATETIME(3) NOT NULL,
+  created_at DATETIME(3) NOT NULL,
+  INDEX idx_status_next (status, next_attempt_at),
+  INDEX idx_dedupe_key (dedupe_key)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,3 @@
+"""
+단위 테스트 (fastapi 디렉터리에서 python -m pytest 로 실행)
+"""
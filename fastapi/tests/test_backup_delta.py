@@ -0,0 +1,119 @@
+"""
+증분 백업 병합 테스트 - 키 기준 upsert/삭제, base_checksum 불일치 409
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import backups
+from app.utils.backup_delta import apply_delta, merge_section
+
+
+def _ids(rows):
+    return [row["id"] for row in rows]
+
+
+def test_merge_replaces_in_place_and_appends_new_rows():
+    rows = [{"id": "a", "v": 1}, {"id": "b", "v": 1}, {"id": "c", "v": 1}]
+    merged = merge_section(rows, [{"id": "d", "v": 2}, {"id": "b", "v": 2}], [], "id")
+    assert _ids(merged) == ["a", "b", "c", "d"]
+    assert merged[1] == {"id": "b", "v": 2}
+    assert merged[3] == {"id": "d", "v": 2}
+
+
+def test_merge_last_upsert_for_same_key_wins():
+    merged = merge_section([{"id": "a", "v": 1}], [{"id": "a", "v": 2}, {"id": "a", "v": 3}], [], "id")
+    assert merged == [{"id": "a", "v": 3}]
+
+
+def test_merge_delete_wins_over_upsert():
+    rows = [{"id": "a"}, {"id": "b"}]
+    merged = merge_section(rows, [{"id": "b", "v": 2}, {"id": "x"}], ["b", "x"], "id")
+    assert _ids(merged) == ["a"]
+
+
+def test_merge_delete_of_missing_key_is_ignored():
+    rows = [{"id": "a"}, {"id": "b"}]
+    assert _ids(merge_section(rows, [], ["zzz"], "id")) == ["a", "b"]
+
+
+def test_merge_requires_key_on_upserts():
+    with pytest.raises(ValueError):
+        merge_section([], [{"name": "no id"}], [], "id")
+
+
+def test_apply_delta_uses_section_keys_and_skips_empty_sections():
+    payload = {
+        "habits": [{"id": "h1", "title": "old"}],
+        "logs": [{"id": "l1"}],
+        "heatmap_snapshots": [{"date": "2025-01-01", "achieved": 1}],
+    }
+    apply_delta(payload, {
+        "habits": {"upserts": [{"id": "h1", "title": "new"}], "deletes": []},
+        "logs": {"upserts": [], "deletes": []},
+        "heatmap_snapshots": {"upserts": [{"date": "2025-01-02", "achieved": 0}], "deletes": ["2025-01-01"]},
+        "categories": {"upserts": [{"id": "c1"}], "deletes": []},
+    })
+    assert payload["habits"] == [{"id": "h1", "title": "new"}]
+    assert payload["logs"] == [{"id": "l1"}]
+    assert payload["heatmap_snapshots"] == [{"date": "2025-01-02", "achieved": 0}]
+    assert payload["categories"] == [{"id": "c1"}]
+
+
+def test_apply_delta_rejects_unknown_section():
+    with pytest.raises(ValueError):
+        apply_delta({}, {"todos": {"upserts": [{"id": "t"}], "deletes": []}})
+
+
+class _FakeCursor:
+    def __init__(self, row):
+        self._row = row
+
+    def execute(self, sql, params=None):
+        return 1
+
+    def fetchone(self):
+        return self._row
+
+
+class _FakeConnection:
+    def __init__(self, row):
+        self._row = row
+        self.committed = False
+        self.closed = False
+
+    def cursor(self):
+        return _FakeCursor(self._row)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_base_checksum_mismatch_returns_409(monkeypatch):
+    conn = _FakeConnection(("json", '{"habits":[]}', None, "server-checksum"))
+    monkeypatch.setattr(backups, "connect_db", lambda: conn)
+    changes = {"habits": {"upserts": [{"id": "h1"}], "deletes": []}}
+
+    with pytest.raises(HTTPException) as exc_info:
+        backups._apply_backup_delta_db("device-1", "stale-checksum", None, changes, "2025-01-01 00:00:00")
+
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail == {"message": "base_checksum mismatch", "checksum": "server-checksum"}
+    assert not conn.committed
+    assert conn.closed
+
+
+def test_delta_without_stored_backup_returns_404(monkeypatch):
+    conn = _FakeConnection(None)
+    monkeypatch.setattr(backups, "connect_db", lambda: conn)
+
+    with pytest.raises(HTTPException) as exc_info:
+        backups._apply_backup_delta_db("device-1", "any", None, {}, "2025-01-01 00:00:00")
+
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,37 @@
+"""
+백업 그룹 커밋 쓰기 테스트 - executemany가 다중 행 INSERT 한 문장으로 묶이는지
+"""
+
+from pymysql.cursors import RE_INSERT_VALUES
+
+from app.api import backups
+
+
+class _RecordingCursor:
+    def __init__(self):
+        self.many = []
+
+    def executemany(self, sql, rows):
+        self.many.append((sql, list(rows)))
+
+    def execute(self, sql, params=None):
+        return 0
+
+
+def test_write_backups_statements_batch_into_multi_row_insert(monkeypatch):
+    monkeypatch.setattr(backups, "store_version", lambda *args, **kwargs: None)
+    batch = [
+        backups.PreparedBackup(f"device-{i}", b'{"habits":[]}', f"checksum-{i}", "2025-01-01 00:00:00", {"habits": []})
+        for i in range(3)
+    ]
+    cursor = _RecordingCursor()
+
+    backups._write_backups(cursor, batch, {})
+
+    assert len(cursor.many) == 2
+    for sql, rows in cursor.many:
+        # 리터럴 값이 섞이면 pymysql이 행마다 실행하므로 모든 값은 %s로 바인딩
+        assert RE_INSERT_VALUES.match(sql), sql
+        assert len(rows) == 3
+    _, backup_rows = cursor.many[1]
+    assert all(row[0] == f"device-{i}" and row[1] is None for i, row in enumerate(backup_rows))
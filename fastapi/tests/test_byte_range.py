@@ -0,0 +1,100 @@
+"""
+Range 요청 테스트 - parse_byte_range 해석, raw 응답의 206/416/If-Range
+"""
+
+import pytest
+
+from app.utils.backup_storage import (
+    RangeNotSatisfiableError,
+    make_etag,
+    parse_byte_range,
+    raw_payload_response,
+)
+from app.utils.payload_codec import compress
+
+SIZE = 100
+
+
+@pytest.mark.parametrize("header, expected", [
+    # 범위 요청 아님 → 전체 응답
+    (None, None),
+    ("", None),
+    # 일반 범위 (양 끝 포함)
+    ("bytes=0-9", (0, 9)),
+    ("bytes=10-", (10, 99)),
+    ("bytes=90-200", (90, 99)),  # 끝이 크기를 넘으면 잘라냄
+    ("bytes=99-99", (99, 99)),
+    ("  Bytes = 5 - 6 ", (5, 6)),  # 단위 대소문자/공백 허용
+    # 접미 범위 (마지막 N바이트)
+    ("bytes=-10", (90, 99)),
+    ("bytes=-1000", (0, 99)),
+    # 지원하지 않는 형식 → 전체 응답
+    ("bytes=0-4,10-14", None),  # 여러 범위
+    ("bytes=9-3", None),  # 끝 < 시작
+    ("items=0-9", None),
+    ("bytes=5", None),
+    ("bytes=-", None),
+    ("bytes=a-9", None),
+    ("bytes=5-x", None),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=-0", SIZE),
+    ("bytes=100-", SIZE),  # 시작 == 크기
+    ("bytes=150-200", SIZE),
+    ("bytes=0-", 0),  # 빈 본문
+])
+def test_parse_byte_range_not_satisfiable(header, size):
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_byte_range(header, size)
+
+
+BODY = b'{"habits":[' + b",".join(b'{"id":"h%d"}' % i for i in range(50)) + b"]}"
+CHECKSUM = "abc123"
+
+
+def _raw(range_header=None, if_range=None, accept_encoding=None, blob=None, codec="identity"):
+    return raw_payload_response(
+        codec, BODY.decode() if blob is None else None, blob, CHECKSUM, None,
+        accept_encoding, range_header, if_range,
+    )
+
+
+@pytest.mark.parametrize("range_header, if_range, status, content, content_range", [
+    (None, None, 200, BODY, None),
+    ("bytes=0-9", None, 206, BODY[:10], f"bytes 0-9/{len(BODY)}"),
+    ("bytes=-5", None, 206, BODY[-5:], f"bytes {len(BODY) - 5}-{len(BODY) - 1}/{len(BODY)}"),
+    ("bytes=0-9", make_etag(CHECKSUM), 206, BODY[:10], f"bytes 0-9/{len(BODY)}"),
+    # If-Range가 현재 ETag와 다르면 (다른 버전) 전체 응답
+    ("bytes=0-9", '"other"', 200, BODY, None),
+    # 지원하지 않는 범위는 전체 응답
+    ("bytes=0-1,5-6", None, 200, BODY, None),
+    ("bytes=9-3", None, 200, BODY, None),
+    # 범위를 벗어나면 416 + 전체 크기
+    (f"bytes={len(BODY)}-", None, 416, b"", f"bytes */{len(BODY)}"),
+    ("bytes=-0", None, 416, b"", f"bytes */{len(BODY)}"),
+])
+def test_raw_payload_range_responses(range_header, if_range, status, content, content_range):
+    response = _raw(range_header, if_range)
+    assert response.status_code == status
+    assert response.body == content
+    assert response.headers.get("Content-Range") == content_range
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers["ETag"] == make_etag(CHECKSUM)
+
+
+def test_raw_payload_range_over_compressed_bytes():
+    blob = compress(BODY, "gzip")
+    response = _raw("bytes=0-9", make_etag(CHECKSUM, "gzip"), accept_encoding="gzip", blob=blob, codec="gzip")
+    assert response.status_code == 206
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.body == blob[:10]
+    assert response.headers["Content-Range"] == f"bytes 0-9/{len(blob)}"
+
+    # 압축 표현 ETag가 아닌 If-Range(비압축 표현)면 전체 압축 바이트
+    response = _raw("bytes=0-9", make_etag(CHECKSUM), accept_encoding="gzip", blob=blob, codec="gzip")
+    assert response.status_code == 200
+    assert response.body == blob
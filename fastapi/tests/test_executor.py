@@ -0,0 +1,77 @@
+"""
+DB 실행기 테스트 - 대기열 슬롯 반환
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.database.executor import DBExecutor, DBQueueFullError
+
+
+@pytest.mark.asyncio
+async def test_cancelled_while_queued_returns_slot():
+    executor = DBExecutor(max_workers=1, max_queue=5)
+    release = threading.Event()
+    try:
+        # 워커 1개를 막아 두고 두 번째 작업은 대기열에 남김
+        blocking = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(executor.run(lambda: "never"))
+        await asyncio.sleep(0.05)
+        assert executor.stats()["queued"] == 1
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        release.set()
+        await blocking
+        stats = executor.stats()
+        assert stats["queued"] == 0
+        assert stats["active"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_repeated_cancellation_does_not_fill_queue():
+    executor = DBExecutor(max_workers=1, max_queue=2)
+    release = threading.Event()
+    try:
+        blocking = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        for _ in range(5):
+            queued = asyncio.ensure_future(executor.run(lambda: None))
+            await asyncio.sleep(0)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+        release.set()
+        await blocking
+        assert await executor.run(lambda: "ok") == "ok"
+        assert executor.stats()["queued"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_full_rejects():
+    executor = DBExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        blocking = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(executor.run(lambda: None))
+        await asyncio.sleep(0.05)
+        with pytest.raises(DBQueueFullError):
+            await executor.run(lambda: None)
+        assert executor.stats()["rejected"] == 1
+        release.set()
+        await asyncio.gather(blocking, queued)
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,37 @@
+"""
+조회 캐시 테스트 - 백엔드 구현 누락 검출, read-through
+"""
+
+import pytest
+
+from app.utils.lookup_cache import LRUCache, _BaseCache
+
+
+def test_backend_missing_method_fails_on_creation():
+    class IncompleteCache(_BaseCache):
+        def _get(self, key):
+            return False, None
+
+        def _set(self, key, value):
+            pass
+
+    with pytest.raises(TypeError):
+        IncompleteCache(ttl=30)
+
+
+def test_lru_cache_read_through_and_invalidate():
+    cache = LRUCache(ttl=30, max_entries=10)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None  # 조회 결과 없음도 캐시
+
+    assert cache.get_or_load("device:a", loader) is None
+    assert cache.get_or_load("device:a", loader) is None
+    assert len(calls) == 1
+
+    cache.invalidate("device:a")
+    cache.get_or_load("device:a", loader)
+    assert len(calls) == 2
+    assert cache.stats()["namespaces"]["device"] == {"hits": 1, "misses": 2, "invalidations": 1, "hit_ratio": 0.3333}
@@ -0,0 +1,59 @@
+"""
+정리 작업 실행기 테스트 - 배치 반복/종료 조건, 이어 조회 위치 전달
+"""
+
+import pytest
+
+from app.database.maintenance import MaintenanceScheduler
+
+
+def _scheduler(jobs, max_batches=10):
+    return MaintenanceScheduler(
+        jobs, interval=60, initial_delay=0, batch_size=2, batch_pause_ms=0, max_batches=max_batches,
+    )
+
+
+@pytest.mark.asyncio
+async def test_simple_job_repeats_until_no_more_rows():
+    remaining = [5]
+    calls = []
+
+    def purge(batch_size):
+        calls.append(batch_size)
+        deleted = min(batch_size, remaining[0])
+        remaining[0] -= deleted
+        return deleted, deleted == batch_size
+
+    report = await _scheduler([("simple", purge, False)]).run_once()
+
+    assert calls == [2, 2, 2]
+    assert report["jobs"]["simple"]["rows"] == 5
+    assert report["jobs"]["simple"]["batches"] == 3
+    assert report["jobs"]["simple"]["error"] is None
+
+
+@pytest.mark.asyncio
+async def test_keyset_job_receives_previous_position():
+    keys = ["a", "b", "c", "d", "e"]
+    seen_after = []
+
+    def purge(batch_size, after):
+        seen_after.append(after)
+        batch = [k for k in keys if k > (after or "")][:batch_size]
+        return len(batch), (batch[-1] if len(batch) == batch_size else None)
+
+    report = await _scheduler([("keyset", purge, True)]).run_once()
+
+    assert seen_after == [None, "b", "d"]
+    assert report["jobs"]["keyset"]["rows"] == 5
+
+
+@pytest.mark.asyncio
+async def test_max_batches_limits_one_run():
+    def purge(batch_size):
+        return batch_size, True
+
+    report = await _scheduler([("endless", purge, False)], max_batches=3).run_once()
+
+    assert report["jobs"]["endless"]["batches"] == 3
+    assert report["jobs"]["endless"]["rows"] == 6
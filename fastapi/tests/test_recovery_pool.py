@@ -0,0 +1,75 @@
+"""
+복구 API 연결 사용 테스트 - 풀 크기 1에서도 요청 하나가 연결 두 개를 동시에 쥐지 않는지
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.api import recovery
+from app.database import pool as pool_module
+from app.database.pool import ConnectionPool
+from app.utils import backup_lookup
+from app.utils.lookup_cache import LRUCache
+
+EMAIL = "user@example.com"
+CHECKSUM = "c" * 64
+PAYLOAD = '{"habits":[]}'
+
+
+class _FakeCursor:
+    def __init__(self):
+        self._row = None
+
+    def execute(self, sql, args=None):
+        if "FROM devices WHERE device_uuid" in sql:
+            self._row = (EMAIL, datetime(2025, 1, 1))
+        elif "FROM email_latest_backups" in sql:
+            self._row = ("device-a", CHECKSUM, datetime(2025, 1, 2))
+        elif "FROM backups" in sql:
+            self._row = ("identity", PAYLOAD, None, CHECKSUM, datetime(2025, 1, 2))
+        else:
+            self._row = None
+        return 1
+
+    def fetchone(self):
+        return self._row
+
+
+class _FakeConnection:
+    def cursor(self):
+        return _FakeCursor()
+
+    def rollback(self):
+        pass
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def single_connection_pool(monkeypatch):
+    monkeypatch.setattr(pool_module.pymysql, "connect", lambda **kwargs: _FakeConnection())
+    pool = ConnectionPool({}, min_size=0, max_size=1, wait_timeout=0.2)
+    monkeypatch.setattr(recovery, "connect_db", pool.acquire)
+    monkeypatch.setattr(backup_lookup, "connect_db", pool.acquire)
+    # 캐시 miss 경로 (조회마다 연결을 빌림)
+    monkeypatch.setattr(backup_lookup, "lookup_cache", LRUCache(ttl=0, max_entries=10))
+    return pool
+
+
+@pytest.mark.parametrize("handler, args", [
+    (recovery._get_backup_by_checksum_db, ("device-b", CHECKSUM, None, None, None, None)),
+    (recovery._get_backup_by_email_db, ("device-b", True, None, None, None, None)),
+])
+def test_raw_download_with_single_connection_pool(single_connection_pool, handler, args):
+    response = handler(*args)
+
+    assert response.status_code == 200
+    assert response.body == PAYLOAD.encode()
+    stats = single_connection_pool.stats()
+    assert stats["timeouts"] == 0
+    assert stats["in_use"] == 0
@@ -0,0 +1,71 @@
+"""
+날씨 예보 캐시 테스트 - SQLite 저장소 (이벤트 루프 밖 I/O, 다른 워커의 쓰기 잠금)
+"""
+
+import asyncio
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+
+from app.utils.weather_cache import ForecastCache, ForecastEntry, SQLiteForecastStore
+
+FORECAST = [
+    {"dt": 1, "weather_datetime": datetime(2026, 1, 1), "weather_type": "맑음", "weather_low": -1.5, "weather_high": 3.0},
+]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_roundtrip_shared_between_connections(tmp_path):
+    path = str(tmp_path / "weather.sqlite")
+    store = SQLiteForecastStore(path, max_entries=10)
+    other = SQLiteForecastStore(path, max_entries=10)  # 같은 파일을 여는 다른 워커
+    try:
+        await store.aset("0.1:1:2", ForecastEntry(FORECAST, 10.0, 20.0, True))
+        entry = await other.aget("0.1:1:2")
+        assert entry == ForecastEntry(FORECAST, 10.0, 20.0, True)
+        assert isinstance(entry.forecast[0]["weather_datetime"], datetime)
+        assert await other.aget("0.1:9:9") is None
+    finally:
+        store.close()
+        other.close()
+
+
+@pytest.mark.asyncio
+async def test_write_lock_held_by_other_worker_does_not_block_loop_or_response(tmp_path):
+    path = str(tmp_path / "weather.sqlite")
+    cache = ForecastCache(SQLiteForecastStore(path, max_entries=10), deadline_fn=lambda now: now + 60)
+    blocker = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    blocker.execute("BEGIN IMMEDIATE")
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return FORECAST
+
+    try:
+        started = time.perf_counter()
+        forecast, status = await cache.get("0.1:1:2", loader)
+        assert (forecast, status) == (FORECAST, "miss")
+        # 저장이 잠금을 기다리는 동안에도 응답과 다음 조회는 바로
+        assert time.perf_counter() - started < 0.5
+        forecast, status = await cache.get("0.1:1:2", loader)
+        assert status == "hit"
+        assert len(calls) == 1
+
+        ticks = 0
+        while cache.stats()["pending_writes"] and ticks < 20:
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert ticks == 20  # 잠금이 풀리기 전에는 쓰는 중, 그동안 루프는 계속 동작
+    finally:
+        blocker.execute("COMMIT")
+        blocker.close()
+        await cache.close()
+
+    reopened = SQLiteForecastStore(path, max_entries=10)
+    try:
+        assert (await reopened.aget("0.1:1:2")).forecast == FORECAST
+    finally:
+        reopened.close()